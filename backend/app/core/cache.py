@@ -0,0 +1,131 @@
+"""
+Per-user response cache for read-heavy dashboard endpoints
+Entries are keyed by endpoint + user + the user's data version. Every write
+(new echo, activity, preference change) bumps the version, so stale entries are
+never read again and simply age out of the LRU.
+
+Tiers:
+- LocalTier: in-process LRU, always on
+- Redis-compatible tier: shared across workers when CACHE_REDIS_URL is set
+  ("memory://" gives an in-process stand-in with the same interface)
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class LocalTier:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class InMemoryRedis:
+    """Minimal async stand-in for the redis.asyncio calls the cache uses"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], Any]] = {}
+
+    async def get(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def set(self, key: str, value, ex: Optional[int] = None):
+        self._data[key] = (time.monotonic() + ex if ex else None, value)
+
+    async def incr(self, key: str) -> int:
+        _, value = self._data.get(key, (None, 0))
+        value = int(value) + 1
+        self._data[key] = (None, value)
+        return value
+
+
+def build_remote_tier(url: str):
+    if not url:
+        return None
+    if url == "memory://":
+        return InMemoryRedis()
+    import redis.asyncio as redis  # optional dependency, only needed for a real Redis URL
+    return redis.from_url(url, decode_responses=True)
+
+
+class ResponseCache:
+    def __init__(self, local: LocalTier, remote=None, ttl_seconds: float = 300):
+        self.local = local
+        self.remote = remote
+        self.ttl_seconds = ttl_seconds
+        self._versions: Dict[str, int] = {}
+
+    async def user_version(self, user_id: str) -> int:
+        if self.remote is not None:
+            return int(await self.remote.get(f"cache:version:{user_id}") or 0)
+        return self._versions.get(user_id, 0)
+
+    async def invalidate_user(self, user_id: str):
+        """Call after any write that changes what the user's dashboards show"""
+        if self.remote is not None:
+            await self.remote.incr(f"cache:version:{user_id}")
+        else:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        metrics.inc("cache.invalidations")
+
+    async def get_or_compute(self, endpoint: str, user_id: str, compute: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        key = f"cache:{endpoint}:{user_id}:v{await self.user_version(user_id)}"
+        ttl = ttl or self.ttl_seconds
+
+        value = self.local.get(key)
+        if value is not None:
+            metrics.inc("cache.hit.local")
+            return value
+
+        if self.remote is not None:
+            raw = await self.remote.get(key)
+            if raw is not None:
+                metrics.inc("cache.hit.remote")
+                value = json.loads(raw)
+                self.local.set(key, value, ttl)
+                return value
+
+        metrics.inc("cache.miss")
+        value = await compute()
+        self.local.set(key, value, ttl)
+        if self.remote is not None:
+            await self.remote.set(key, json.dumps(value, default=str), ex=int(ttl))
+        return value
+
+
+response_cache = ResponseCache(
+    local=LocalTier(settings.cache_max_entries),
+    remote=build_remote_tier(settings.cache_redis_url),
+    ttl_seconds=settings.cache_ttl_seconds
+)
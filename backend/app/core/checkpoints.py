@@ -0,0 +1,31 @@
+"""
+Batch job checkpoints
+A job stores the last key it finished after every batch (in the same
+transaction as the batch's writes), so a crashed or restarted run resumes
+right after it instead of starting over.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import dialect_insert
+from app.models.job_checkpoint import JobCheckpoint
+
+
+async def load_checkpoint(db: AsyncSession, name: str) -> Optional[str]:
+    result = await db.execute(select(JobCheckpoint.cursor).where(JobCheckpoint.name == name))
+    return result.scalar_one_or_none()
+
+
+async def save_checkpoint(db: AsyncSession, name: str, cursor: Optional[str], completed: bool = False):
+    """Record progress (caller commits); completed=True clears the cursor for the next pass"""
+    values = {"cursor": None if completed else cursor, "updated_at": datetime.utcnow()}
+    if completed:
+        values["last_completed_at"] = datetime.utcnow()
+    await db.execute(
+        dialect_insert(db, JobCheckpoint)
+        .values(name=name, **values)
+        .on_conflict_do_update(index_elements=["name"], set_=values)
+    )
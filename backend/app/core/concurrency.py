@@ -0,0 +1,125 @@
+"""
+Structured fan-out inside a single request
+Independent LLM generations and DB reads run concurrently, so an endpoint
+takes about as long as its slowest branch instead of the sum of all of them.
+
+- every branch can have its own timeout
+- a branch with a fallback turns its failure/timeout into a partial result;
+  a branch without one cancels the others and re-raises
+- if the client disconnects, all branches are cancelled
+
+spawn() is for the opposite case: work that should finish after the response.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional, Set, TypeVar
+
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+DISCONNECT_POLL_SECONDS = 0.25
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+@dataclass
+class Branch:
+    run: Callable[[], Awaitable[Any]]
+    timeout: Optional[float] = None
+    fallback: Optional[Callable[[BaseException], Any]] = None  # called with the error
+
+
+def in_session(read: Callable[[AsyncSession], Awaitable[T]]) -> Callable[[], Awaitable[T]]:
+    """Run a read on its own session - one AsyncSession can't execute queries concurrently"""
+    async def run() -> T:
+        async with async_session() as db:
+            return await read(db)
+    return run
+
+
+def fetch_all(query) -> Callable[[], Awaitable[list]]:
+    """Branch.run loading every ORM row of a select on its own session"""
+    async def read(db: AsyncSession) -> list:
+        return list((await db.execute(query)).scalars().all())
+    return in_session(read)
+
+
+def fetch_rows(query) -> Callable[[], Awaitable[list]]:
+    """Branch.run loading the column rows of a select on its own session"""
+    async def read(db: AsyncSession) -> list:
+        return list((await db.execute(query)).all())
+    return in_session(read)
+
+
+def fetch_one(query) -> Callable[[], Awaitable[Any]]:
+    """Branch.run loading one ORM row (or None) on its own session"""
+    async def read(db: AsyncSession) -> Any:
+        return (await db.execute(query)).scalar_one_or_none()
+    return in_session(read)
+
+
+async def _guarded(branch: Branch) -> Any:
+    try:
+        async with asyncio.timeout(branch.timeout):
+            return await branch.run()
+    except Exception as e:
+        if branch.fallback is None:
+            raise
+        metrics.inc("fanout.fallbacks")
+        return branch.fallback(e)
+
+
+async def _wait_for_disconnect(request: Request):
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+# Strong references so background tasks are not garbage collected mid-run
+_background: Set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine[Any, Any, T]) -> "asyncio.Task[T]":
+    """Run a coroutine in the background, outliving the request that started it"""
+    task = asyncio.create_task(coro)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    return task
+
+
+async def drain_background():
+    """Wait for spawned tasks to finish (on shutdown)"""
+    await asyncio.gather(*_background, return_exceptions=True)
+
+
+async def fan_out(*branches: Branch, request: Optional[Request] = None) -> List[Any]:
+    """Run branches concurrently; results come back in branch order"""
+    tasks = [asyncio.ensure_future(_guarded(branch)) for branch in branches]
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request)) if request is not None else None
+    try:
+        pending = set(tasks)
+        while pending:
+            done, _ = await asyncio.wait(
+                pending | ({watcher} if watcher else set()),
+                return_when=asyncio.FIRST_COMPLETED
+            )
+            if watcher in done:
+                if watcher.exception() is None:
+                    metrics.inc("fanout.client_disconnects")
+                    raise ClientDisconnected("Client disconnected")
+                watcher = None  # can't tell; keep going without the watcher
+            for task in done & pending:
+                pending.discard(task)
+                task.result()  # re-raise a branch failure that had no fallback
+        return [task.result() for task in tasks]
+    finally:
+        leftovers = [task for task in tasks + [watcher] if task is not None and not task.done()]
+        for task in leftovers:
+            task.cancel()
+        await asyncio.gather(*leftovers, return_exceptions=True)
@@ -9,6 +9,63 @@ class Settings(BaseSettings):
     secret_key: str = ""
     qdrant_api_key: str = ""
 
+    # Database engine (pool settings apply to Postgres; SQLite uses the pragmas)
+    db_echo: bool = False  # log every SQL statement
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced
+    db_statement_cache_size: int = 500  # asyncpg prepared statements per connection
+    sqlite_busy_timeout_ms: int = 5000
+    db_read_timeout_seconds: float = 10.0  # per read when a request fans out
+
+    # LLM client
+    llm_backend: str = "gemini"  # "gemini" or "fake" (load tests)
+    llm_model: str = "gemini-2.0-flash"
+    llm_max_concurrency: int = 8
+    llm_timeout_seconds: float = 30.0
+    llm_fake_latency_seconds: float = 0.2
+    llm_cache_ttl_seconds: int = 7 * 24 * 3600  # deterministic prompts only
+    llm_cache_max_entries: int = 10000
+    llm_cache_hit_flush_seconds: float = 30.0  # hit counts/LRU times are buffered in memory this long
+    llm_cache_hit_flush_keys: int = 500  # ...or until this many entries have unflushed hits
+    llm_cache_evict_every_stores: int = 100  # expiry/LRU trimming runs on every Nth stored completion
+
+    # Response cache for dashboard endpoints
+    cache_ttl_seconds: float = 300.0
+    cache_max_entries: int = 2048
+    cache_redis_url: str = ""  # "redis://..." to share across workers, "memory://" for a local stand-in
+
+    # Recent-mood windows kept in memory per active user (latest mood, weekly trend)
+    mood_state_max_users: int = 10000
+    mood_state_window_size: int = 200  # echoes per user
+
+    # Garden Whisperer background scan (0 disables the in-process scheduler)
+    whisperer_scan_interval_seconds: int = 0
+    whisperer_scan_batch_size: int = 200
+    whisperer_scan_concurrency: int = 4  # parallel nudge generations
+    whisperer_nudge_max_age_seconds: int = 6 * 3600  # older rows are recomputed on request
+
+    # Seed embeddings and vector search (empty QDRANT_URL = in-process NumPy index only)
+    embedding_backend: str = "hashing"  # "hashing" (built in) or "sentence-transformers"
+    embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    embedding_dim: int = 384  # hashing backend only; models define their own
+    qdrant_collection: str = "seeds"
+    qdrant_timeout_seconds: int = 2
+
+    # Passive sensor ingestion
+    sensor_max_batch_samples: int = 5000  # per POST /api/sensors
+    sensor_queue_max_samples: int = 200000  # unwritten samples before requests get 429
+    sensor_flush_samples: int = 20000  # samples per write transaction
+    sensor_retry_after_seconds: int = 5
+
+    # Password hashing (bcrypt runs in worker threads, off the event loop)
+    password_hash_workers: int = 4
+    login_max_concurrency: int = 8  # register/login requests hashing at once
+    login_max_waiting: int = 64  # queued beyond that; further requests get 429
+    login_retry_after_seconds: int = 2
+
     class Config:
         env_file = ".env"
 
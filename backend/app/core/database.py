@@ -1,13 +1,88 @@
+import time
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from app.core.config import settings
+from app.core.metrics import metrics
 
-engine = create_async_engine(settings.database_url, echo=True)
+def _async_database_url(url: str) -> str:
+    """Accept plain postgres URLs (e.g. from docker-compose) and route them to asyncpg"""
+    for prefix in ("postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+def _engine_options(url: str) -> dict:
+    options = {"echo": settings.db_echo}
+    if url.startswith("sqlite"):
+        return options
+    options.update(
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle
+    )
+    if "+asyncpg" in url:
+        options["connect_args"] = {"prepared_statement_cache_size": settings.db_statement_cache_size}
+    return options
+
+database_url = _async_database_url(settings.database_url)
+engine = create_async_engine(database_url, **_engine_options(database_url))
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+if engine.dialect.name == "sqlite":
+    # WAL lets readers proceed during a write; NORMAL sync is safe with WAL and much cheaper
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}")
+        cursor.close()
+
+# Pool saturation gauges, refreshed whenever a connection changes hands
+def _record_pool_usage(*args):
+    pool = engine.sync_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+    checked_out = pool.checkedout()
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    metrics.set_gauge("db.pool.checked_out", checked_out)
+    metrics.set_gauge("db.pool.saturation", round(checked_out / capacity, 3) if capacity else 0)
+
+event.listen(engine.sync_engine.pool, "checkout", _record_pool_usage)
+event.listen(engine.sync_engine.pool, "checkin", _record_pool_usage)
+
+# Time every statement so DB latency can be read apart from LLM latency
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_started_at = time.perf_counter()
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    metrics.observe("db.query", time.perf_counter() - context._query_started_at)
+
 async def get_db():
+    async with async_session() as session:
+        # Check out eagerly so pool wait time is measured on its own
+        with metrics.timer("db.pool_checkout"):
+            await session.connection()
+        yield session
+
+async def get_lazy_db():
+    """Session that only checks out a connection once a query runs, for
+    endpoints usually answered from memory"""
     async with async_session() as session:
         yield session
 
+def dialect_insert(db: AsyncSession, model):
+    """INSERT that supports on_conflict_* for the active backend (SQLite or Postgres)"""
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
 async def create_tables():
     from app.models import Base
     from app.models.echo import Echo
@@ -16,5 +91,12 @@ async def create_tables():
         BreathingSession, JournalEntry, GratitudeEntry, 
         GroundingSession, ActivityStreak
     )
+    from app.models.rollup import DailyUserRollup
+    from app.models.llm_cache import LLMCacheEntry
+    from app.models.emotion_fusion import EmotionFusion
+    from app.models.whisperer_nudge import WhispererNudge
+    from app.models.job_checkpoint import JobCheckpoint
+    from app.models.dawn import DawnPrediction, ShieldStory
+    from app.models.sensor import SensorSample, SensorRollup
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Dawn Weave prediction storage
+The day-of-week analysis is stored per user and reused until the week rolls
+over or the user posts a new echo (create_echo marks it stale). Shield stories
+are stored per (user, weekday, ISO week) so each is generated at most once.
+
+The stale flag alone can be lost: an analysis that read the echoes just before
+a new one was saved may upsert its row (is_stale=False) after create_echo
+marked the old one. Each row therefore records the newest echo it saw, and
+load_prediction only serves it while that is still the user's newest echo.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import dialect_insert
+from app.core.metrics import metrics
+from app.core.mood_state import mood_state
+from app.models.dawn import DawnPrediction, ShieldStory
+
+PATTERN_WINDOW_DAYS = 60  # echoes the day-of-week analysis reads
+
+
+def next_week_start(now: datetime) -> datetime:
+    """Monday 00:00 of the following week"""
+    monday = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+    return monday + timedelta(days=7)
+
+
+def iso_week(value: datetime) -> str:
+    year, week, _ = value.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+async def load_prediction(db: AsyncSession, user_id: str) -> Optional[DawnPrediction]:
+    """The user's prediction if it is still valid"""
+    result = await db.execute(
+        select(DawnPrediction).where(
+            DawnPrediction.user_id == user_id,
+            DawnPrediction.is_stale == False,  # noqa: E712
+            DawnPrediction.valid_until > datetime.utcnow()
+        )
+    )
+    stored = result.scalar_one_or_none()
+    if stored is not None and not await prediction_is_current(db, stored):
+        metrics.inc("dawn.prediction.superseded")
+        return None
+    return stored
+
+
+async def prediction_is_current(db: AsyncSession, stored: DawnPrediction) -> bool:
+    """The stored analysis already saw the user's newest echo of the pattern window"""
+    latest = (await mood_state.window(db, stored.user_id)).latest()
+    window_start = datetime.utcnow() - timedelta(days=PATTERN_WINDOW_DAYS)
+    newest = latest.echo_id if latest is not None and latest.created_at >= window_start else None
+    return stored.last_echo_id == newest
+
+
+async def save_prediction(db: AsyncSession, user_id: str, echo_count: int, pattern_analysis: Optional[Dict],
+                          last_echo_id: Optional[int]):
+    """Upsert the user's prediction (caller commits)"""
+    now = datetime.utcnow()
+    values = {
+        "echo_count": echo_count,
+        "pattern_analysis": pattern_analysis,
+        "is_stale": False,
+        "last_echo_id": last_echo_id,
+        "valid_until": next_week_start(now),
+        "computed_at": now
+    }
+    await db.execute(
+        dialect_insert(db, DawnPrediction)
+        .values(user_id=user_id, **values)
+        .on_conflict_do_update(index_elements=["user_id"], set_=values)
+    )
+
+
+async def mark_prediction_stale(db: AsyncSession, user_id: str):
+    """Called on every new echo (caller commits)"""
+    await db.execute(
+        update(DawnPrediction).where(DawnPrediction.user_id == user_id).values(is_stale=True)
+    )
+
+
+async def load_shield_stories(db: AsyncSession, user_id: str, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict]:
+    """Stored stories for the given (day, week) keys"""
+    if not keys:
+        return {}
+    result = await db.execute(
+        select(ShieldStory.day, ShieldStory.week, ShieldStory.story)
+        .where(ShieldStory.user_id == user_id, tuple_(ShieldStory.day, ShieldStory.week).in_(keys))
+    )
+    return {(day, week): story for day, week, story in result.all()}
+
+
+async def save_shield_story(db: AsyncSession, user_id: str, day: str, week: str, story: Dict):
+    """Insert once; a concurrent request that generated the same story loses quietly (caller commits)"""
+    await db.execute(
+        dialect_insert(db, ShieldStory)
+        .values(user_id=user_id, day=day, week=week, story=story)
+        .on_conflict_do_nothing(index_elements=["user_id", "day", "week"])
+    )
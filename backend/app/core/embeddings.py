@@ -0,0 +1,92 @@
+"""
+Local text embeddings (CPU only)
+Backends share one interface: embed(texts) -> float32 array of shape
+(len(texts), dim) with L2-normalised rows, so a dot product is cosine similarity.
+
+- HashingEmbedder: built in, no model download. Words, word pairs and
+  character trigrams are hashed into a fixed number of signed buckets, so
+  texts sharing vocabulary and spelling land close together.
+- SentenceTransformerEmbedder: semantic embeddings from a sentence-transformers
+  model (optional dependency, EMBEDDING_BACKEND=sentence-transformers).
+
+Embedding is CPU-bound, so async callers go through embed_texts(), which runs
+it in a worker thread.
+"""
+import asyncio
+import hashlib
+import re
+from typing import List, Protocol
+
+import numpy as np
+
+from app.core.config import settings
+
+TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+class Embedder(Protocol):
+    dim: int
+
+    def embed(self, texts: List[str]) -> np.ndarray: ...
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = TOKEN_RE.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+        return features
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                # Stable across processes, unlike hash()
+                digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                sign = 1.0 if digest >> 63 else -1.0
+                weight = 0.5 if feature[0] == "c" else 1.0
+                vectors[row, digest % self.dim] += sign * weight
+        return normalize_rows(vectors)
+
+
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer  # optional dependency
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = self.model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+        return vectors.astype(np.float32)
+
+
+def build_embedder() -> Embedder:
+    if settings.embedding_backend == "sentence-transformers":
+        return SentenceTransformerEmbedder(settings.embedding_model)
+    return HashingEmbedder(settings.embedding_dim)
+
+
+_embedder = None
+
+
+def get_embedder() -> Embedder:
+    """Built on first use - a real model takes seconds to load"""
+    global _embedder
+    if _embedder is None:
+        _embedder = build_embedder()
+    return _embedder
+
+
+async def embed_texts(texts: List[str]) -> np.ndarray:
+    return await asyncio.to_thread(get_embedder().embed, texts)
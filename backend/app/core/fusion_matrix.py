@@ -0,0 +1,64 @@
+"""
+Precomputed emotion-fusion matrix
+The alchemy palette is fixed, so every unordered pair x mood-trend variant can be
+generated offline (python -m app.jobs.fusion_matrix) and served from memory.
+The table is small (a few hundred rows); it is loaded whole and reloaded
+periodically so a running warm-up job becomes visible without a restart.
+"""
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import dialect_insert
+from app.models.emotion_fusion import EmotionFusion
+
+NO_TREND = "none"
+MOOD_TRENDS = ("positive", "challenging", "balanced")
+TREND_VARIANTS = (NO_TREND,) + MOOD_TRENDS
+
+
+def matrix_key(emotion1: str, emotion2: str, mood_trend: Optional[str]) -> Tuple[str, str, str]:
+    emotion_a, emotion_b = sorted((emotion1, emotion2))
+    return emotion_a, emotion_b, mood_trend or NO_TREND
+
+
+class FusionMatrix:
+    def __init__(self, reload_seconds: float = 300):
+        self.reload_seconds = reload_seconds
+        self._fusions: Dict[Tuple[str, str, str], Dict] = {}
+        self._loaded_at: Optional[float] = None
+
+    async def load(self, db: AsyncSession):
+        result = await db.execute(select(EmotionFusion))
+        self._fusions = {
+            (row.emotion_a, row.emotion_b, row.mood_trend): row.fusion
+            for row in result.scalars().all()
+        }
+        self._loaded_at = time.monotonic()
+
+    async def get(self, db: AsyncSession, emotion1: str, emotion2: str, mood_trend: Optional[str]) -> Optional[Dict]:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.reload_seconds:
+            await self.load(db)
+        return self._fusions.get(matrix_key(emotion1, emotion2, mood_trend))
+
+    async def existing_keys(self, db: AsyncSession) -> set:
+        result = await db.execute(select(EmotionFusion.emotion_a, EmotionFusion.emotion_b, EmotionFusion.mood_trend))
+        return {tuple(row) for row in result.all()}
+
+    async def store(self, db: AsyncSession, emotion1: str, emotion2: str, mood_trend: Optional[str], fusion: Dict, model: str):
+        """Upsert one fusion (caller commits)"""
+        emotion_a, emotion_b, trend = key = matrix_key(emotion1, emotion2, mood_trend)
+        await db.execute(
+            dialect_insert(db, EmotionFusion)
+            .values(emotion_a=emotion_a, emotion_b=emotion_b, mood_trend=trend, fusion=fusion, model=model)
+            .on_conflict_do_update(
+                index_elements=["emotion_a", "emotion_b", "mood_trend"],
+                set_={"fusion": fusion, "model": model}
+            )
+        )
+        self._fusions[key] = fusion
+
+
+fusion_matrix = FusionMatrix()
@@ -0,0 +1,60 @@
+"""
+Garden snapshot for the soundscape generator
+The user's most recent echoes and their per-seed_type plant counts come back
+from one UNION ALL round trip on the shared async engine, so the query runs
+unchanged on SQLite and Postgres.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from sqlalchemy import select, func, literal, cast, null, union_all, Integer, Float, DateTime, JSON
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.echo import Echo
+
+
+@dataclass
+class GardenSnapshot:
+    echoes: List[Dict] = field(default_factory=list)  # newest first
+    plants_by_type: Dict[str, int] = field(default_factory=dict)
+
+
+async def load_garden_snapshot(db: AsyncSession, user_id: str, recent_limit: int) -> GardenSnapshot:
+    """Recent echoes (mood, tags, seed type) plus plant counts per seed_type"""
+    recent = (
+        select(Echo.id, Echo.mood_score, Echo.emotion_tags, Echo.seed_type, Echo.created_at)
+        .where(Echo.user_id == user_id)
+        .order_by(Echo.created_at.desc())
+        .limit(recent_limit)
+        .subquery()
+    )
+    # Branches need a LIMIT inside a subquery on SQLite; the NULL casts keep
+    # the column types aligned for Postgres and the JSON result processor
+    query = union_all(
+        select(
+            literal("echo").label("kind"), recent.c.id, recent.c.mood_score, recent.c.emotion_tags,
+            recent.c.seed_type, recent.c.created_at, cast(null(), Integer).label("plant_count")
+        ),
+        select(
+            literal("plants"), cast(null(), Integer), cast(null(), Float), cast(null(), JSON),
+            Echo.seed_type, cast(null(), DateTime(timezone=True)), func.count()
+        )
+        .where(Echo.user_id == user_id)
+        .group_by(Echo.seed_type)
+    )
+
+    snapshot = GardenSnapshot()
+    for row in (await db.execute(query)).all():
+        if row.kind == "plants":
+            snapshot.plants_by_type[row.seed_type] = row.plant_count
+        else:
+            snapshot.echoes.append({
+                "id": row.id,
+                "mood_score": row.mood_score or 0.0,
+                "emotion_tags": row.emotion_tags or [],
+                "seed_type": row.seed_type,
+                "created_at": row.created_at
+            })
+    # The outer UNION does not promise to keep the subquery's order
+    snapshot.echoes.sort(key=lambda echo: echo["created_at"], reverse=True)
+    return snapshot
@@ -0,0 +1,52 @@
+"""
+Precompiled multi-keyword matcher
+Tokenizes the text once and resolves every keyword from every category with
+hash lookups, matching whole words only ("mad" no longer fires inside "made").
+"""
+import string
+from typing import Dict, Hashable, Iterable, List, Set
+
+# Common inflections so "thank" still matches "thanks" and "hope" matches "hopeful"
+WORD_SUFFIXES = ("", "s", "es", "d", "ed", "ing", "ful", "ly", "ness")
+
+_PUNCTUATION = string.punctuation + "‘’“”–—…"
+_TO_SPACES = str.maketrans(_PUNCTUATION, " " * len(_PUNCTUATION))
+
+
+class KeywordMatcher:
+    def __init__(self, categories: Dict[Hashable, Iterable[str]]):
+        # Every accepted surface form ("thank", "thanks", "thankful", ...) -> categories
+        self._word_forms: Dict[str, Set[Hashable]] = {}
+        self._phrase_forms: Dict[str, Set[Hashable]] = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                words = keyword.lower().split()
+                for suffix in WORD_SUFFIXES:
+                    form = " ".join(words) + suffix
+                    table = self._word_forms if len(words) == 1 else self._phrase_forms
+                    table.setdefault(form, set()).add(category)
+
+    def find(self, text: str) -> Set[Hashable]:
+        """Categories with at least one whole-word keyword hit in the text"""
+        tokens = text.lower().translate(_TO_SPACES).split()
+        token_set = set(tokens)
+        hits = set()
+        for form in self._word_forms.keys() & token_set:
+            hits |= self._word_forms[form]
+
+        # Phrases are rare; only rebuild the token stream when their first word is present
+        padded = None
+        for form, phrase_categories in self._phrase_forms.items():
+            if form.split(" ", 1)[0] in token_set:
+                padded = padded or f" {' '.join(tokens)} "
+                if f" {form} " in padded:
+                    hits |= phrase_categories
+        return hits
+
+    def find_many(self, texts: List[str]) -> List[Set[Hashable]]:
+        """Score a batch of texts, scanning each distinct text only once"""
+        seen: Dict[str, Set[Hashable]] = {}
+        for text in texts:
+            if text not in seen:
+                seen[text] = self.find(text)
+        return [set(seen[text]) for text in texts]
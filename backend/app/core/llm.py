@@ -0,0 +1,160 @@
+"""
+Shared async LLM client
+Every router calls Gemini through here so a slow completion never blocks the event loop.
+Concurrency is bounded, each call has a timeout, and the backend can be swapped
+for a local fake during load tests (LLM_BACKEND=fake).
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Optional, Protocol
+
+import google.generativeai as genai
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+class LLMBackend(Protocol):
+    async def generate(self, prompt: str, model: str) -> str: ...
+
+    def stream(self, prompt: str, model: str) -> AsyncIterator[str]: ...
+
+
+class GeminiBackend:
+    def __init__(self, api_key: str):
+        genai.configure(api_key=api_key)
+        self._models: Dict[str, genai.GenerativeModel] = {}
+
+    def _get_model(self, name: str) -> genai.GenerativeModel:
+        if name not in self._models:
+            self._models[name] = genai.GenerativeModel(name)
+        return self._models[name]
+
+    async def generate(self, prompt: str, model: str) -> str:
+        response = await self._get_model(model).generate_content_async(prompt)
+        return response.text
+
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        response = await self._get_model(model).generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+
+class FakeBackend:
+    """Answers locally after a fixed delay - lets load tests run without Gemini"""
+
+    def __init__(self, latency_seconds: float = 0.2, response: str = ""):
+        self.latency_seconds = latency_seconds
+        self.response = response or "Thank you for sharing this with me. Your feelings matter. 🌿"
+
+    async def generate(self, prompt: str, model: str) -> str:
+        await asyncio.sleep(self.latency_seconds)
+        return self.response
+
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        # Same total latency as generate(), spread across word-sized chunks
+        words = self.response.split(" ")
+        for i, word in enumerate(words):
+            await asyncio.sleep(self.latency_seconds / len(words))
+            yield word if i == 0 else " " + word
+
+
+class LLMClient:
+    def __init__(self, backend: LLMBackend, model: str, max_concurrency: int, timeout_seconds: float):
+        self.backend = backend
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def set_backend(self, backend: LLMBackend):
+        self.backend = backend
+
+    async def generate(self, prompt: str, model: Optional[str] = None, timeout: Optional[float] = None) -> str:
+        """
+        Run one completion. The timeout covers both waiting for a free slot and
+        the call itself; errors propagate so callers keep their own fallbacks.
+        """
+        try:
+            return await asyncio.wait_for(
+                self._generate(prompt, model or self.model),
+                timeout or self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            metrics.inc("llm.timeouts")
+            raise
+
+    async def stream(self, prompt: str, model: Optional[str] = None, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Yield the completion as it is generated. The slot is held until the
+        stream ends; the timeout applies to the wait for each chunk, so a long
+        answer that keeps arriving is never cut off.
+        """
+        timeout = timeout or self.timeout_seconds
+        queued_at = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            metrics.inc("llm.timeouts")
+            raise
+        metrics.observe("llm.queue_wait", time.perf_counter() - queued_at)
+        metrics.add_gauge("llm.in_flight", 1)
+        start = time.perf_counter()
+        chunks = self.backend.stream(prompt, model or self.model)
+        try:
+            first = True
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(anext(chunks), timeout)
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    metrics.inc("llm.timeouts")
+                    raise
+                if first:
+                    metrics.observe("llm.stream.first_chunk", time.perf_counter() - start)
+                    first = False
+                yield chunk
+            metrics.inc("llm.success")
+        except GeneratorExit:
+            # Consumer stopped early (e.g. client went away) - not a backend error
+            raise
+        except BaseException:
+            metrics.inc("llm.errors")
+            raise
+        finally:
+            await chunks.aclose()
+            self._semaphore.release()
+            metrics.add_gauge("llm.in_flight", -1)
+            metrics.observe("llm.generate", time.perf_counter() - start)
+
+    async def _generate(self, prompt: str, model: str) -> str:
+        queued_at = time.perf_counter()
+        async with self._semaphore:
+            metrics.observe("llm.queue_wait", time.perf_counter() - queued_at)
+            metrics.add_gauge("llm.in_flight", 1)
+            start = time.perf_counter()
+            try:
+                text = await self.backend.generate(prompt, model)
+                metrics.inc("llm.success")
+                return text
+            except BaseException:
+                metrics.inc("llm.errors")
+                raise
+            finally:
+                metrics.add_gauge("llm.in_flight", -1)
+                metrics.observe("llm.generate", time.perf_counter() - start)
+
+
+def build_backend() -> LLMBackend:
+    if settings.llm_backend == "fake":
+        return FakeBackend(settings.llm_fake_latency_seconds)
+    return GeminiBackend(settings.gemini_api_key)
+
+
+llm = LLMClient(
+    backend=build_backend(),
+    model=settings.llm_model,
+    max_concurrency=settings.llm_max_concurrency,
+    timeout_seconds=settings.llm_timeout_seconds
+)
@@ -0,0 +1,224 @@
+"""
+Persistent LLM result cache
+For prompts that are fully determined by a small input (emotion pairs, garden
+state, top emotions) the completion is stored in llm_cache, keyed by model +
+a hash of the whitespace-normalized prompt. Entries expire after a TTL and the
+table is trimmed to a maximum size, least recently used first. Trimming runs
+every few stores rather than on each one, so the table may briefly exceed the
+limit by that many entries.
+
+Hits are served by a plain SELECT. Their counts and last-hit times collect in
+memory and go out in one batched UPDATE: every hit_flush_seconds from the
+flusher the app starts on startup, as soon as enough keys are waiting, on
+shutdown, and right before a trim so it ranks entries by their latest use.
+Hits still buffered when a worker dies are lost, and a trim does not see hits
+buffered by other workers.
+
+Concurrent identical misses are coalesced: one caller talks to the model and
+the others await its result.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import select, update, delete, func, bindparam
+
+from app.core.concurrency import spawn
+from app.core.config import settings
+from app.core.database import async_session, dialect_insert
+from app.core.llm import LLMClient, llm
+from app.core.metrics import metrics
+from app.models.llm_cache import LLMCacheEntry
+
+_INLINE_WHITESPACE = re.compile(r"[ \t]+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse incidental whitespace so re-indented prompts share an entry"""
+    lines = (_INLINE_WHITESPACE.sub(" ", line).strip() for line in prompt.strip().splitlines())
+    return "\n".join(lines)
+
+
+def cache_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+def parse_json_response(text: str) -> Any:
+    """Parse a JSON completion, tolerating ```json fences around it"""
+    text = text.strip()
+    if "```json" in text:
+        text = text.split("```json")[1].split("```")[0].strip()
+    elif "```" in text:
+        text = text.split("```")[1].split("```")[0].strip()
+    return json.loads(text)
+
+
+class LLMResultCache:
+    def __init__(self, client: LLMClient, ttl_seconds: int, max_entries: int,
+                 hit_flush_seconds: float, hit_flush_keys: int, evict_every_stores: int):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.evict_every_stores = evict_every_stores
+        self._stores = 0
+        self.hit_flush_seconds = hit_flush_seconds
+        self.hit_flush_keys = hit_flush_keys
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._hits: Dict[str, Tuple[int, datetime]] = {}  # cache_key -> (unflushed hits, last hit)
+        self._last_flush = time.monotonic()
+        self._flushing: Optional[asyncio.Task] = None
+
+    async def generate(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """
+        Cached llm.generate. `validate` runs on fresh completions before they are
+        stored; if it raises, nothing is cached and the error reaches the caller.
+        """
+        model = model or self.client.model
+        key = cache_key(model, prompt)
+
+        cached = await self._lookup(key)
+        if cached is not None:
+            metrics.inc("llm_cache.hit")
+            self._record_hit(key)
+            return cached
+
+        # Join an identical in-flight miss instead of calling the model again
+        while key in self._inflight:
+            inflight = self._inflight[key]
+            try:
+                text = await asyncio.shield(inflight)
+                metrics.inc("llm_cache.coalesced")
+                return text
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The caller doing the work went away; take over
+
+        metrics.inc("llm_cache.miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            text = await self.client.generate(prompt, model)
+            if validate is not None:
+                validate(text)
+            await self._store(key, model, text, ttl_seconds or self.ttl_seconds)
+            future.set_result(text)
+            return text
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # waiters may not exist; mark as retrieved
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def generate_json(self, prompt: str, model: Optional[str] = None, ttl_seconds: Optional[int] = None) -> Any:
+        """Cached completion parsed as JSON; unparseable completions are never stored"""
+        text = await self.generate(prompt, model, ttl_seconds, validate=parse_json_response)
+        return parse_json_response(text)
+
+    async def _lookup(self, key: str) -> Optional[str]:
+        now = datetime.utcnow()
+        async with async_session() as db:
+            result = await db.execute(
+                select(LLMCacheEntry.id, LLMCacheEntry.response)
+                .where(LLMCacheEntry.cache_key == key, LLMCacheEntry.expires_at > now)
+            )
+            row = result.first()
+            return row.response if row is not None else None
+
+    def _record_hit(self, key: str):
+        hits, _ = self._hits.get(key, (0, None))
+        self._hits[key] = (hits + 1, datetime.utcnow())
+        due = (len(self._hits) >= self.hit_flush_keys
+               or time.monotonic() - self._last_flush >= self.hit_flush_seconds)
+        if due and (self._flushing is None or self._flushing.done()):
+            self._flushing = spawn(self.flush_hits())
+
+    async def run_flusher(self):
+        """Flush buffered hits every hit_flush_seconds; started by the API on startup"""
+        while True:
+            await asyncio.sleep(self.hit_flush_seconds)
+            if self._hits and time.monotonic() - self._last_flush >= self.hit_flush_seconds:
+                await self.flush_hits()
+
+    async def flush_hits(self):
+        """Write buffered hit counts and last-hit times in one executemany UPDATE"""
+        self._last_flush = time.monotonic()
+        hits, self._hits = self._hits, {}
+        if not hits:
+            return
+        table = LLMCacheEntry.__table__
+        try:
+            async with async_session() as db:
+                await db.execute(
+                    update(table)
+                    .where(table.c.cache_key == bindparam("hit_key"))
+                    .values(hit_count=func.coalesce(table.c.hit_count, 0) + bindparam("hits"),
+                            last_hit_at=bindparam("hit_at"), last_used_at=bindparam("hit_at")),
+                    [{"hit_key": key, "hits": count, "hit_at": at} for key, (count, at) in hits.items()]
+                )
+                await db.commit()
+            metrics.inc("llm_cache.hit_flushes")
+        except Exception as e:
+            # Hit counts only steer eviction; losing one batch is fine
+            print(f"LLM cache hit flush failed: {e}")
+            metrics.inc("llm_cache.hit_flush_errors")
+
+    async def _store(self, key: str, model: str, text: str, ttl_seconds: int):
+        now = datetime.utcnow()
+        values = {"model": model, "response": text, "created_at": now,
+                  "expires_at": now + timedelta(seconds=ttl_seconds), "last_hit_at": None, "hit_count": 0,
+                  "last_used_at": now}
+        self._stores += 1
+        evict = self._stores % self.evict_every_stores == 0
+        if evict:
+            await self.flush_hits()  # before the insert: SQLite allows one writer at a time
+        async with async_session() as db:
+            await db.execute(
+                dialect_insert(db, LLMCacheEntry)
+                .values(cache_key=key, **values)
+                .on_conflict_do_update(index_elements=["cache_key"], set_=values)
+            )
+            if evict:
+                await self._evict(db, now)
+            await db.commit()
+
+    async def _evict(self, db, now: datetime):
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        expired = await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.expires_at <= now))
+        evicted = expired.rowcount or 0
+
+        # Everything past the newest max_entries, walked from the last_used_at index
+        beyond_limit = (
+            select(LLMCacheEntry.id)
+            .order_by(LLMCacheEntry.last_used_at.desc())
+            .offset(self.max_entries)
+        )
+        trimmed = await db.execute(delete(LLMCacheEntry).where(LLMCacheEntry.id.in_(beyond_limit)))
+        evicted += trimmed.rowcount or 0
+
+        if evicted:
+            metrics.inc("llm_cache.evicted", evicted)
+
+
+llm_cache = LLMResultCache(
+    client=llm,
+    ttl_seconds=settings.llm_cache_ttl_seconds,
+    max_entries=settings.llm_cache_max_entries,
+    hit_flush_seconds=settings.llm_cache_hit_flush_seconds,
+    hit_flush_keys=settings.llm_cache_hit_flush_keys,
+    evict_every_stores=settings.llm_cache_evict_every_stores
+)
@@ -0,0 +1,80 @@
+"""
+In-process metrics registry
+Counters, gauges and latency histograms exposed through /api/metrics
+"""
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict
+
+
+class LatencyHistogram:
+    """Keeps the most recent samples so percentiles reflect current behaviour"""
+
+    def __init__(self, max_samples: int = 2048):
+        self.samples = deque(maxlen=max_samples)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+            "max_ms": round(self.max * 1000, 2)
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, float] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+
+    def inc(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def add_gauge(self, name: str, delta: float):
+        self.gauges[name] = self.gauges.get(name, 0) + delta
+
+    def observe(self, name: str, seconds: float):
+        if name not in self.histograms:
+            self.histograms[name] = LatencyHistogram()
+        self.histograms[name].observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict:
+        return {
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "latency": {name: hist.snapshot() for name, hist in self.histograms.items()}
+        }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,128 @@
+"""
+Columnar mood statistics
+Dashboards, predictions and prompts all summarise a user's mood scores: mean,
+variance, range, per-weekday groups, the newest few against the oldest few.
+MoodSeries holds the scores (and their timestamps) as NumPy arrays so each of
+those is a vectorised reduction instead of another loop over ORM objects.
+
+Echoes without a mood score are left out, matching the SQL aggregates used by
+the rollups and the whisperer scan.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday
+_EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+
+def naive_utc(value: datetime) -> datetime:
+    """SQLite hands back naive UTC, Postgres aware datetimes; compare as naive UTC"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def epoch_seconds(value: datetime) -> float:
+    """UTC seconds since the epoch; several times cheaper per value than np.datetime64 parsing"""
+    value = naive_utc(value)
+    return ((value.toordinal() - _EPOCH_ORDINAL) * 86400 + value.hour * 3600 + value.minute * 60
+            + value.second + value.microsecond / 1e6)
+
+
+@dataclass
+class MoodStats:
+    count: int
+    mean: float
+    variance: float  # population variance
+    min: float
+    max: float
+    mean_abs: float  # average intensity regardless of sign
+
+    @property
+    def range(self) -> float:
+        return self.max - self.min
+
+
+EMPTY_STATS = MoodStats(count=0, mean=0.0, variance=0.0, min=0.0, max=0.0, mean_abs=0.0)
+
+
+@dataclass
+class MoodSeries:
+    """Mood scores in the caller's order (usually newest first), with optional timestamps"""
+    scores: np.ndarray  # float64
+    timestamps: Optional[np.ndarray] = None  # float64 UTC seconds since the epoch
+
+    @classmethod
+    def from_columns(cls, scores: Iterable[Optional[float]], timestamps: Optional[Iterable[datetime]] = None) -> "MoodSeries":
+        scores = np.array(list(scores), dtype=np.float64)  # None -> nan
+        keep = ~np.isnan(scores)
+        if timestamps is None:
+            return cls(scores[keep])
+        stamps = np.fromiter((epoch_seconds(value) for value in timestamps), dtype=np.float64, count=len(scores))
+        return cls(scores[keep], stamps[keep])
+
+    @classmethod
+    def from_echoes(cls, echoes: Sequence) -> "MoodSeries":
+        """From Echo rows (ORM objects or selected columns) with mood_score and created_at"""
+        return cls.from_columns((echo.mood_score for echo in echoes), (echo.created_at for echo in echoes))
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def stats(self) -> MoodStats:
+        if not len(self.scores):
+            return EMPTY_STATS
+        mean = self.scores.mean()
+        return MoodStats(
+            count=len(self.scores),
+            mean=float(mean),
+            variance=float(np.mean((self.scores - mean) ** 2)),
+            min=float(self.scores.min()),
+            max=float(self.scores.max()),
+            mean_abs=float(np.abs(self.scores).mean())
+        )
+
+    def slice_mean(self, start: int = 0, stop: Optional[int] = None) -> Optional[float]:
+        """Mean of scores[start:stop] (negative indices count from the end), None if that is empty"""
+        window = self.scores[start:stop]
+        return float(window.mean()) if len(window) else None
+
+    def count_below(self, threshold: float) -> int:
+        return int(np.count_nonzero(self.scores < threshold))
+
+    def endpoints(self) -> Optional[Tuple[float, float]]:
+        """(earliest, latest) score by timestamp, whatever order the series is in"""
+        if not len(self.scores):
+            return None
+        return float(self.scores[np.argmin(self.timestamps)]), float(self.scores[np.argmax(self.timestamps)])
+
+    def weekday_stats(self) -> Dict[str, MoodStats]:
+        """Stats per weekday name (Monday first) for weekdays that have scores"""
+        days = np.floor_divide(self.timestamps, 86400).astype(np.int64)
+        weekday = (days + _EPOCH_WEEKDAY) % 7
+        counts = np.bincount(weekday, minlength=7)
+        sums = np.bincount(weekday, weights=self.scores, minlength=7)
+        squares = np.bincount(weekday, weights=self.scores ** 2, minlength=7)
+        abs_sums = np.bincount(weekday, weights=np.abs(self.scores), minlength=7)
+        mins = np.full(7, np.inf)
+        maxs = np.full(7, -np.inf)
+        np.minimum.at(mins, weekday, self.scores)
+        np.maximum.at(maxs, weekday, self.scores)
+
+        result = {}
+        for day in np.flatnonzero(counts):
+            count = int(counts[day])
+            mean = sums[day] / count
+            result[WEEKDAYS[day]] = MoodStats(
+                count=count,
+                mean=float(mean),
+                variance=float(max(squares[day] / count - mean ** 2, 0.0)),
+                min=float(mins[day]),
+                max=float(maxs[day]),
+                mean_abs=float(abs_sums[day] / count)
+            )
+        return result
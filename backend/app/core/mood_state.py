@@ -0,0 +1,112 @@
+"""
+In-memory mood windows
+Each active user's most recent echoes (id, mood score, emotion tags, time) are
+kept in a bounded ring buffer so "latest mood" and "this week's trend" reads
+skip the echoes table. Windows are loaded from the database on first access,
+appended to by save_echo, and evicted least recently used.
+
+Freshness follows the response cache's per-user data version: a window is only
+served while its version matches, so with a shared cache tier an echo written
+through another worker makes this worker reload the window on its next read.
+"""
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.mood_series import naive_utc
+from app.models.echo import Echo
+
+
+@dataclass(slots=True)
+class MoodPoint:
+    echo_id: int
+    mood_score: Optional[float]
+    emotion_tags: List[str]
+    created_at: datetime
+
+
+@dataclass
+class MoodWindow:
+    points: Deque[MoodPoint]  # oldest first
+    version: int
+    # Older echoes may exist before this point in time; None = full history held
+    complete_after: Optional[datetime] = None
+
+    def latest(self) -> Optional[MoodPoint]:
+        return self.points[-1] if self.points else None
+
+    def since(self, start: datetime) -> Optional[List[MoodPoint]]:
+        """Points at or after `start`, or None if the window no longer reaches back that far"""
+        if self.complete_after is not None and start <= self.complete_after:
+            return None
+        return [point for point in self.points if point.created_at >= start]
+
+    def append(self, point: MoodPoint):
+        if len(self.points) == self.points.maxlen:
+            self.complete_after = self.points[0].created_at
+        self.points.append(point)
+
+
+class MoodState:
+    def __init__(self, max_users: int, window_size: int):
+        self.max_users = max_users
+        self.window_size = window_size
+        self._windows: "OrderedDict[str, MoodWindow]" = OrderedDict()
+
+    async def window(self, db: AsyncSession, user_id: str) -> MoodWindow:
+        """The user's window, loading it if it is missing or out of date"""
+        version = await response_cache.user_version(user_id)
+        window = self._windows.get(user_id)
+        if window is not None and window.version == version:
+            self._windows.move_to_end(user_id)
+            metrics.inc("mood_state.hit")
+            return window
+
+        metrics.inc("mood_state.load")
+        result = await db.execute(
+            Echo.select_moods()
+            .where(Echo.user_id == user_id)
+            .order_by(Echo.created_at.desc(), Echo.id.desc())
+            .limit(self.window_size)
+        )
+        rows = result.all()
+        points = deque(
+            (MoodPoint(row.id, row.mood_score, row.emotion_tags or [], naive_utc(row.created_at)) for row in reversed(rows)),
+            maxlen=self.window_size
+        )
+        window = MoodWindow(points, version, points[0].created_at if len(rows) == self.window_size else None)
+        self._windows[user_id] = window
+        self._windows.move_to_end(user_id)
+        while len(self._windows) > self.max_users:
+            self._windows.popitem(last=False)
+        return window
+
+    async def record(self, user_id: str, echo_id: int, mood_score: Optional[float], emotion_tags: List[str], created_at: datetime):
+        """Append a committed echo; call right after response_cache.invalidate_user"""
+        version = await response_cache.user_version(user_id)
+        window = self._windows.get(user_id)
+        if window is None:
+            return  # loaded on first read
+        if window.version != version - 1:
+            # Other writes landed since the window was loaded; reload it on the next read
+            del self._windows[user_id]
+            return
+        latest = window.latest()
+        if latest is not None and latest.echo_id >= echo_id:
+            # Loaded between the commit and the version bump, so the echo is already in it
+            window.version = version
+            return
+        window.append(MoodPoint(echo_id, mood_score, list(emotion_tags or []), naive_utc(created_at)))
+        window.version = version
+
+    def clear(self):
+        self._windows.clear()
+
+
+mood_state = MoodState(settings.mood_state_max_users, settings.mood_state_window_size)
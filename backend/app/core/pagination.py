@@ -0,0 +1,92 @@
+"""
+Keyset pagination for history endpoints
+Pages are ordered newest first by (timestamp, id) and the cursor is an opaque
+token for the last row served, so fetching page N costs the same as page 1:
+the next page starts with an index seek instead of an OFFSET scan.
+
+Rows without a timestamp are left out. The app always sets one (server
+default), and a NULL has no place in the (timestamp, id) order that a cursor
+could point at: SQLite sorts NULLs last when descending, Postgres first.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import String, and_, or_, literal, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MAX_PAGE_SIZE = 100
+
+
+@dataclass
+class Page:
+    items: List[Any]
+    next_cursor: Optional[str]  # None on the last page
+
+
+def encode_cursor(time_value: Any, row_id: int) -> str:
+    if isinstance(time_value, datetime):
+        time_value = time_value.isoformat()
+    raw = json.dumps([time_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        time_value, row_id = json.loads(raw)
+        if not isinstance(time_value, str) or not isinstance(row_id, int):
+            raise ValueError(cursor)
+        return time_value, row_id
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _time_bound(db: AsyncSession, time_value: str):
+    if db.bind.dialect.name == "postgresql":
+        return datetime.fromisoformat(time_value)
+    # SQLite keeps timestamps as text in more than one format; compare against
+    # the stored text itself, which is exactly what ORDER BY sorts on
+    return type_coerce(literal(time_value), String)
+
+
+async def paginate(
+    db: AsyncSession,
+    query,
+    time_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Page:
+    """
+    Run `query` (a select of one ORM entity, already filtered) for one page,
+    newest first. Pass the returned next_cursor back to get the following page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = query.where(time_column.isnot(None))
+    if cursor:
+        time_value, last_id = decode_cursor(cursor)
+        bound = _time_bound(db, time_value)
+        query = query.where(
+            time_column <= bound,  # lets the (user_id, time) index bound the scan
+            or_(time_column < bound, and_(time_column == bound, id_column < last_id))
+        )
+
+    result = await db.execute(
+        query
+        .add_columns(type_coerce(time_column, String).label("cursor_time"))
+        .order_by(time_column.desc(), id_column.desc())
+        .limit(limit + 1)
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.cursor_time, getattr(last[0], id_column.key))
+    return Page(items=[row[0] for row in rows], next_cursor=next_cursor)
@@ -0,0 +1,88 @@
+"""
+Password hashing off the event loop
+bcrypt costs 100-300 ms of CPU per hash/verify. Done inline in an async
+handler, that time stalls every other request on the worker, so hashing runs
+in a small dedicated thread pool (bcrypt releases the GIL while it works).
+
+Auth requests also pass an admission gate: a fixed number hash at once, a
+bounded number wait their turn, and the rest get 429 + Retry-After, so a
+login storm queues politely instead of piling up.
+
+Hashes are standard $2b$ bcrypt strings (the format passlib wrote before), made
+with the bcrypt package directly. bcrypt only reads the first 72 bytes of a
+password; passlib cut longer ones silently, current bcrypt raises instead, so
+they are cut here to keep older hashes verifying.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import bcrypt
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="password-hash")
+
+
+def _password_bytes(password: str) -> bytes:
+    return password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+
+
+def _hash(password: str) -> str:
+    return bcrypt.hashpw(_password_bytes(password), bcrypt.gensalt()).decode("ascii")
+
+
+def _verify(password: str, password_hash: str) -> bool:
+    try:
+        return bcrypt.checkpw(_password_bytes(password), password_hash.encode("ascii"))
+    except ValueError:  # not a bcrypt hash
+        return False
+
+
+async def hash_password(password: str) -> str:
+    with metrics.timer("auth.hash"):
+        return await asyncio.get_running_loop().run_in_executor(_executor, _hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    with metrics.timer("auth.verify"):
+        return await asyncio.get_running_loop().run_in_executor(_executor, _verify, password, password_hash)
+
+
+class AuthAdmission:
+    def __init__(self, max_concurrency: int, max_waiting: int, retry_after_seconds: int):
+        self.max_waiting = max_waiting
+        self.retry_after_seconds = retry_after_seconds
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._semaphore.locked() and self.waiting >= self.max_waiting:
+            metrics.inc("auth.rejected")
+            raise HTTPException(
+                status_code=429,
+                detail="Too many sign-in attempts right now, retry shortly",
+                headers={"Retry-After": str(self.retry_after_seconds)}
+            )
+        self.waiting += 1
+        try:
+            with metrics.timer("auth.admission_wait"):
+                await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+
+auth_admission = AuthAdmission(
+    settings.login_max_concurrency,
+    settings.login_max_waiting,
+    settings.login_retry_after_seconds
+)
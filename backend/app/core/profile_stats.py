@@ -0,0 +1,138 @@
+"""
+UserProfile counters without read-modify-write
+Echoes and gratitude entries bump the profile with single UPDATE statements
+that do the arithmetic in SQL, so concurrent submissions from several devices
+can't overwrite each other's increments. Achievements are derived from the
+counters afterwards, off the request path.
+"""
+from typing import Dict, List
+
+from sqlalchemy import update, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.concurrency import spawn
+from app.core.database import async_session, dialect_insert
+from app.core.metrics import metrics
+from app.models.user_profile import UserProfile
+
+# achievement -> (counter, threshold)
+ACHIEVEMENTS = {
+    "first_bloom": ("total_echoes", 1),
+    "week_warrior": ("total_echoes", 7),
+    "gratitude_guru": ("gratitude_count", 5),
+}
+
+
+def wellness_score(mood_average: float, current_streak: int) -> int:
+    """Wellness score (0-100 scale)"""
+    return max(0, min(100, 50 + int(mood_average * 30) + (current_streak or 0) * 2))
+
+
+async def record_echo_stats(db: AsyncSession, user_id: str, mood_score: float, seed_type: str) -> Dict:
+    """
+    Count one echo in the user's profile, creating it on the first echo (caller
+    commits). Returns the updated counters.
+    """
+    # Profiles created outside this path (consent, register) may hold NULL counters
+    total = func.coalesce(UserProfile.total_echoes, 0)
+    returning = (UserProfile.total_echoes, UserProfile.current_streak, UserProfile.mood_average, UserProfile.wellness_score)
+    increment = (
+        update(UserProfile)
+        .where(UserProfile.user_id == user_id)
+        .values(
+            total_echoes=total + 1,
+            monthly_reflections=func.coalesce(UserProfile.monthly_reflections, 0) + 1,
+            gratitude_count=func.coalesce(UserProfile.gratitude_count, 0) + (1 if seed_type == "gratitude" else 0),
+            # Running average; the right-hand side sees the pre-update values
+            mood_average=(func.coalesce(UserProfile.mood_average, 0.0) * total + mood_score) / (total + 1)
+        )
+        .returning(*returning)
+    )
+
+    row = (await db.execute(increment)).first()
+    if row is None:
+        created = await db.execute(
+            dialect_insert(db, UserProfile)
+            .values(
+                user_id=user_id,
+                total_echoes=1,
+                current_streak=1,
+                longest_streak=1,
+                mood_average=mood_score,
+                wellness_score=50 + int(mood_score * 20)
+            )
+            .on_conflict_do_nothing(index_elements=["user_id"])
+            .returning(*returning)
+        )
+        row = created.first()
+        if row is not None:
+            return dict(row._mapping)
+        # Another request created it first
+        row = (await db.execute(increment)).first()
+
+    stats = dict(row._mapping)
+    stats["wellness_score"] = wellness_score(stats["mood_average"], stats["current_streak"])
+    # The row stays locked until commit, so this can't interleave with another increment
+    await db.execute(
+        update(UserProfile)
+        .where(UserProfile.user_id == user_id)
+        .values(wellness_score=stats["wellness_score"])
+    )
+    return stats
+
+
+async def count_echoes(db: AsyncSession, user_id: str) -> int:
+    """All-time echo count from the maintained profile counter"""
+    result = await db.execute(
+        select(UserProfile.total_echoes).where(UserProfile.user_id == user_id)
+    )
+    return result.scalar() or 0
+
+
+async def add_gratitude(db: AsyncSession, user_id: str, count: int):
+    """Add to the profile's gratitude count if the user has a profile (caller commits)"""
+    await db.execute(
+        update(UserProfile)
+        .where(UserProfile.user_id == user_id)
+        .values(gratitude_count=func.coalesce(UserProfile.gratitude_count, 0) + count)
+    )
+
+
+async def award_achievements(user_id: str) -> List[str]:
+    """Add any achievements the stored counters have earned; returns the new ones"""
+    async with async_session() as db:
+        result = await db.execute(
+            select(UserProfile)
+            .where(UserProfile.user_id == user_id)
+            .with_for_update()
+        )
+        profile = result.scalar_one_or_none()
+        if profile is None:
+            return []
+
+        achievements = list(profile.achievements or [])
+        earned = [
+            name for name, (counter, threshold) in ACHIEVEMENTS.items()
+            if name not in achievements and (getattr(profile, counter) or 0) >= threshold
+        ]
+        if earned:
+            profile.achievements = achievements + earned
+            await db.commit()
+            await response_cache.invalidate_user(user_id)
+            metrics.inc("profile.achievements_awarded", len(earned))
+        return earned
+
+
+async def _award_achievements_in_background(user_id: str):
+    # Nobody awaits the spawned task, so a failure has to be reported here
+    try:
+        await award_achievements(user_id)
+    except Exception as e:
+        print(f"Achievement check failed for {user_id}: {e}")
+        metrics.inc("profile.achievement_errors")
+
+
+def schedule_achievements(user_id: str):
+    """Evaluate achievements after the caller's commit, without holding up the response"""
+    spawn(_award_achievements_in_background(user_id))
@@ -0,0 +1,185 @@
+"""
+Daily user rollups
+Write-path maintenance of daily_user_rollups plus the full recomputation used
+by the backfill job and the consistency checker (app.jobs.rollups).
+"""
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import dialect_insert
+from app.models.echo import Echo
+from app.models.activity import BreathingSession, JournalEntry, GratitudeEntry, GroundingSession
+from app.models.rollup import DailyUserRollup
+
+# activity name -> (model, rollup counter column)
+ACTIVITY_COUNTERS = {
+    "breathing": (BreathingSession, "breathing_count"),
+    "journal": (JournalEntry, "journal_count"),
+    "gratitude": (GratitudeEntry, "gratitude_count"),
+    "grounding": (GroundingSession, "grounding_count"),
+}
+
+ROLLUP_FIELDS = [
+    "mood_sum", "mood_count", "mood_min", "mood_max", "emotion_counts",
+    "breathing_count", "journal_count", "gratitude_count", "grounding_count"
+]
+
+
+def _as_day(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+async def _locked_rollup(db: AsyncSession, user_id: str, day: date) -> DailyUserRollup:
+    """Fetch the (user, day) row for update, creating it first if needed"""
+    await db.execute(
+        dialect_insert(db, DailyUserRollup)
+        .values(user_id=user_id, day=day, mood_sum=0.0, mood_count=0, emotion_counts={},
+                breathing_count=0, journal_count=0, gratitude_count=0, grounding_count=0)
+        .on_conflict_do_nothing(index_elements=["user_id", "day"])
+    )
+    result = await db.execute(
+        select(DailyUserRollup)
+        .where(DailyUserRollup.user_id == user_id, DailyUserRollup.day == day)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+
+async def record_echo(db: AsyncSession, user_id: str, created_at, mood_score: Optional[float], emotion_tags: Optional[List[str]]):
+    """Fold one new echo into its day's rollup (caller commits)"""
+    rollup = await _locked_rollup(db, user_id, _as_day(created_at))
+    if mood_score is not None:
+        rollup.mood_sum = (rollup.mood_sum or 0.0) + mood_score
+        rollup.mood_count = (rollup.mood_count or 0) + 1
+        rollup.mood_min = mood_score if rollup.mood_min is None else min(rollup.mood_min, mood_score)
+        rollup.mood_max = mood_score if rollup.mood_max is None else max(rollup.mood_max, mood_score)
+    if emotion_tags:
+        emotion_counts = dict(rollup.emotion_counts or {})
+        for emotion in emotion_tags:
+            emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
+        rollup.emotion_counts = emotion_counts
+
+
+async def record_activity(db: AsyncSession, user_id: str, activity: str, completed_at):
+    """Count one completed activity in its day's rollup (caller commits)"""
+    _, column = ACTIVITY_COUNTERS[activity]
+    rollup = await _locked_rollup(db, user_id, _as_day(completed_at))
+    setattr(rollup, column, (getattr(rollup, column) or 0) + 1)
+
+
+async def count_activities(db: AsyncSession, user_id: str, activity: str) -> int:
+    """All-time count of one activity from the maintained daily counters"""
+    _, column = ACTIVITY_COUNTERS[activity]
+    result = await db.execute(
+        select(func.coalesce(func.sum(getattr(DailyUserRollup, column)), 0))
+        .where(DailyUserRollup.user_id == user_id)
+    )
+    return int(result.scalar())
+
+
+async def get_rollups(db: AsyncSession, user_id: str, since: date) -> List[DailyUserRollup]:
+    result = await db.execute(
+        select(DailyUserRollup)
+        .where(DailyUserRollup.user_id == user_id, DailyUserRollup.day >= since)
+        .order_by(DailyUserRollup.day)
+    )
+    return list(result.scalars().all())
+
+
+def _empty_rollup() -> Dict:
+    return {
+        "mood_sum": 0.0, "mood_count": 0, "mood_min": None, "mood_max": None, "emotion_counts": {},
+        "breathing_count": 0, "journal_count": 0, "gratitude_count": 0, "grounding_count": 0
+    }
+
+
+async def recompute_rollups(db: AsyncSession, user_id: Optional[str] = None) -> Dict[Tuple[str, date], Dict]:
+    """Rebuild rollup values from the raw tables with grouped SQL"""
+    rollups: Dict[Tuple[str, date], Dict] = {}
+
+    def bucket(uid, day_value) -> Dict:
+        return rollups.setdefault((uid, _as_day(day_value)), _empty_rollup())
+
+    day = func.date(Echo.created_at)
+    mood_query = (
+        select(Echo.user_id, day, func.sum(Echo.mood_score), func.count(Echo.mood_score),
+               func.min(Echo.mood_score), func.max(Echo.mood_score))
+        .group_by(Echo.user_id, day)
+    )
+    if user_id:
+        mood_query = mood_query.where(Echo.user_id == user_id)
+    for uid, day_value, mood_sum, mood_count, mood_min, mood_max in (await db.execute(mood_query)).all():
+        values = bucket(uid, day_value)
+        values.update(mood_sum=mood_sum or 0.0, mood_count=mood_count, mood_min=mood_min, mood_max=mood_max)
+
+    # Emotion histograms need the JSON tags, streamed in write order
+    tags_query = select(Echo.user_id, Echo.created_at, Echo.emotion_tags).order_by(Echo.created_at, Echo.id)
+    if user_id:
+        tags_query = tags_query.where(Echo.user_id == user_id)
+    for uid, created_at, emotion_tags in (await db.execute(tags_query)).all():
+        if emotion_tags:
+            emotion_counts = bucket(uid, created_at)["emotion_counts"]
+            for emotion in emotion_tags:
+                emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
+
+    for model, column in ACTIVITY_COUNTERS.values():
+        activity_day = func.date(model.completed_at)
+        activity_query = select(model.user_id, activity_day, func.count()).group_by(model.user_id, activity_day)
+        if user_id:
+            activity_query = activity_query.where(model.user_id == user_id)
+        for uid, day_value, count in (await db.execute(activity_query)).all():
+            bucket(uid, day_value)[column] = count
+
+    return rollups
+
+
+async def backfill_rollups(db: AsyncSession, user_id: Optional[str] = None) -> int:
+    """Replace stored rollups with a full recomputation; returns rows written"""
+    rollups = await recompute_rollups(db, user_id)
+    clear = delete(DailyUserRollup)
+    if user_id:
+        clear = clear.where(DailyUserRollup.user_id == user_id)
+    await db.execute(clear)
+    db.add_all(
+        DailyUserRollup(user_id=uid, day=day, **values)
+        for (uid, day), values in rollups.items()
+    )
+    await db.commit()
+    return len(rollups)
+
+
+async def check_rollups(db: AsyncSession, user_id: Optional[str] = None, tolerance: float = 1e-6) -> List[Dict]:
+    """Compare stored rollups with a full recomputation; returns the mismatches"""
+    expected = await recompute_rollups(db, user_id)
+    stored_query = select(DailyUserRollup)
+    if user_id:
+        stored_query = stored_query.where(DailyUserRollup.user_id == user_id)
+    stored = {
+        (row.user_id, _as_day(row.day)): {field: getattr(row, field) for field in ROLLUP_FIELDS}
+        for row in (await db.execute(stored_query)).scalars().all()
+    }
+
+    def same(field, a, b) -> bool:
+        if field == "emotion_counts":
+            return {k: v for k, v in (a or {}).items() if v} == {k: v for k, v in (b or {}).items() if v}
+        if isinstance(a, float) or isinstance(b, float):
+            return a is not None and b is not None and abs(a - b) <= tolerance
+        return (a or 0) == (b or 0)
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        want = expected.get(key, _empty_rollup())
+        have = stored.get(key, _empty_rollup())
+        diff = {field: {"expected": want[field], "stored": have[field]}
+                for field in ROLLUP_FIELDS if not same(field, want[field], have[field])}
+        if diff:
+            mismatches.append({"user_id": key[0], "day": key[1].isoformat(), "fields": diff})
+    return mismatches
@@ -0,0 +1,148 @@
+"""
+Passive sensor ingestion
+POST /api/sensors validates a batch and hands it to an in-process write queue,
+answering before anything touches the database. A single writer drains the
+queue and coalesces waiting batches into one transaction: raw samples go in
+with one executemany INSERT (no ORM objects) and the minute and hour rollups
+are merged with upserts.
+
+The queue is bounded by unwritten samples. When a batch doesn't fit, the
+endpoint answers 429 with Retry-After so devices hold on to it and resend.
+"""
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session, dialect_insert
+from app.core.metrics import metrics
+from app.models.sensor import SensorSample, SensorRollup
+
+SENSOR_METRICS = ("heart_rate", "steps", "sleep", "screen_time")
+RESOLUTIONS = ("minute", "hour")
+WRITE_ATTEMPTS = 3
+
+Row = Tuple[str, str, datetime, float]  # (user_id, metric, recorded_at UTC, value)
+
+
+def bucket_start(recorded_at: datetime, resolution: str) -> datetime:
+    if resolution == "hour":
+        return recorded_at.replace(minute=0, second=0, microsecond=0)
+    return recorded_at.replace(second=0, microsecond=0)
+
+
+def aggregate(rows: List[Row]) -> Dict[Tuple[str, str, str, datetime], List[float]]:
+    """(user, metric, resolution, bucket) -> [count, sum, min, max]"""
+    buckets: Dict[Tuple[str, str, str, datetime], List[float]] = {}
+    for user_id, metric, recorded_at, value in rows:
+        for resolution in RESOLUTIONS:
+            key = (user_id, metric, resolution, bucket_start(recorded_at, resolution))
+            stats = buckets.get(key)
+            if stats is None:
+                buckets[key] = [1, value, value, value]
+            else:
+                stats[0] += 1
+                stats[1] += value
+                stats[2] = min(stats[2], value)
+                stats[3] = max(stats[3], value)
+    return buckets
+
+
+async def write_samples(db: AsyncSession, rows: List[Row]):
+    """Insert raw samples and merge their rollups (caller commits)"""
+    await db.execute(
+        insert(SensorSample),
+        [
+            {"user_id": user_id, "day": recorded_at.date(), "metric": metric, "recorded_at": recorded_at, "value": value}
+            for user_id, metric, recorded_at, value in rows
+        ]
+    )
+
+    upsert = dialect_insert(db, SensorRollup)
+    smaller, larger = (func.least, func.greatest) if db.bind.dialect.name == "postgresql" else (func.min, func.max)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=["user_id", "metric", "resolution", "bucket_start"],
+        set_={
+            "sample_count": SensorRollup.sample_count + upsert.excluded.sample_count,
+            "value_sum": SensorRollup.value_sum + upsert.excluded.value_sum,
+            "value_min": smaller(SensorRollup.value_min, upsert.excluded.value_min),
+            "value_max": larger(SensorRollup.value_max, upsert.excluded.value_max),
+        }
+    )
+    await db.execute(
+        upsert,
+        [
+            {"user_id": user_id, "metric": metric, "resolution": resolution, "bucket_start": start,
+             "sample_count": count, "value_sum": total, "value_min": low, "value_max": high}
+            for (user_id, metric, resolution, start), (count, total, low, high) in aggregate(rows).items()
+        ]
+    )
+
+
+class SensorIngestQueue:
+    def __init__(self, max_pending_samples: int, flush_samples: int):
+        self.max_pending_samples = max_pending_samples
+        self.flush_samples = flush_samples
+        self.pending = 0  # accepted but not yet written
+        self._queue: "asyncio.Queue[List[Row]]" = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    def submit(self, rows: List[Row]) -> bool:
+        """Queue a batch; False means the queue is full and the client should retry later"""
+        if self.pending + len(rows) > self.max_pending_samples:
+            metrics.inc("sensors.rejected_batches")
+            return False
+        self.pending += len(rows)
+        self._queue.put_nowait(rows)
+        metrics.inc("sensors.accepted_samples", len(rows))
+        metrics.set_gauge("sensors.pending_samples", self.pending)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return True
+
+    async def _run(self):
+        while True:
+            batches = [await self._queue.get()]
+            size = len(batches[0])
+            while size < self.flush_samples and not self._queue.empty():
+                batches.append(self._queue.get_nowait())
+                size += len(batches[-1])
+            try:
+                await self._flush([row for batch in batches for row in batch])
+            finally:
+                self.pending -= size
+                metrics.set_gauge("sensors.pending_samples", self.pending)
+                for _ in batches:
+                    self._queue.task_done()
+
+    async def _flush(self, rows: List[Row]):
+        for attempt in range(WRITE_ATTEMPTS):
+            try:
+                with metrics.timer("sensors.flush"):
+                    async with async_session() as db:
+                        await write_samples(db, rows)
+                        await db.commit()
+                metrics.inc("sensors.written_samples", len(rows))
+                return
+            except Exception as e:
+                print(f"Sensor write failed (attempt {attempt + 1}): {e}")
+                if attempt + 1 < WRITE_ATTEMPTS:
+                    await asyncio.sleep(2 ** attempt)
+        metrics.inc("sensors.dropped_samples", len(rows))
+
+    async def drain(self, timeout: float = 30):
+        """Write out everything accepted so far, then stop the writer (on shutdown)"""
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        finally:
+            self._worker.cancel()
+            self._worker = None
+
+
+sensor_ingest = SensorIngestQueue(settings.sensor_queue_max_samples, settings.sensor_flush_samples)
@@ -0,0 +1,96 @@
+"""
+Bucketed soundscape generation
+The soundscape prompt only depends on a handful of garden metrics, so they are
+snapped to coarse buckets (mood in 0.1 steps, density bands, ...) before the
+prompt is built. Gardens in the same bucket produce the same prompt and share
+one llm_cache entry across all users; personalize() then nudges the shared
+config with a small jitter seeded by the user so the sound is still theirs.
+"""
+import copy
+import hashlib
+import random
+from typing import Any, Dict
+
+# Upper bounds of the garden density bands (plant counts)
+DENSITY_BANDS = (4, 14, 39, 99)
+MAX_DIVERSITY = 5  # reflection, gratitude, concern, joy, growth
+# Only the leading emotions, as a set; the third one multiplies the buckets
+# several times over while barely changing the generated sound
+BUCKET_EMOTIONS = 2
+
+# layer -> (min Hz, max Hz, max |detune|), matching the ranges in the prompt
+OSCILLATOR_LIMITS = {
+    "base_drone": (40, 200, 10),
+    "harmonic_pad": (200, 600, 5),
+    "high_shimmer": (800, 2000, 3),
+}
+FILTER_LIMITS = (500, 3000)
+
+FREQUENCY_JITTER = 0.03  # +-3%
+GAIN_JITTER = 0.05
+DETUNE_JITTER = 2.0  # cents
+
+
+def _step(value: float, step: float) -> float:
+    return round(round(value / step) * step, 2) + 0.0  # no -0.0, it would be a separate bucket
+
+
+def density_band(plant_count: int) -> str:
+    lower = 0
+    for upper in DENSITY_BANDS:
+        if plant_count <= upper:
+            return f"{lower}-{upper}"
+        lower = upper + 1
+    return f"{lower}+"
+
+
+def quantize_garden_state(garden_state: Dict[str, Any]) -> Dict[str, Any]:
+    """The garden metrics the prompt sees, snapped to shared buckets"""
+    return {
+        "overall_mood": _step(garden_state["overall_mood"], 0.1),
+        "mood_variance": _step(min(garden_state["mood_variance"], 1.0), 0.1),
+        "dominant_emotions": sorted(e.lower() for e in garden_state["dominant_emotions"][:BUCKET_EMOTIONS]),
+        "garden_density": density_band(garden_state["garden_density"]),
+        "plant_diversity": min(garden_state["plant_diversity"], MAX_DIVERSITY),
+        "emotional_intensity": _step(garden_state["emotional_intensity"], 0.2),
+    }
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def personalize(audio_config: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    """
+    Copy of a shared config with per-user jitter on the oscillators and filter.
+    The jitter is seeded by the user id, so one user always hears the same
+    variation of a bucket.
+    """
+    config = copy.deepcopy(audio_config)
+    seed = int.from_bytes(hashlib.blake2b(user_id.encode("utf-8"), digest_size=8).digest(), "big")
+    rng = random.Random(seed)
+
+    for layer, (low, high, max_detune) in OSCILLATOR_LIMITS.items():
+        params = config.get(layer)
+        if not isinstance(params, dict):
+            continue
+        # Draw every value even when skipped so layers don't shift each other's jitter
+        frequency_factor = 1 + rng.uniform(-FREQUENCY_JITTER, FREQUENCY_JITTER)
+        gain_factor = 1 + rng.uniform(-GAIN_JITTER, GAIN_JITTER)
+        detune_offset = rng.uniform(-DETUNE_JITTER, DETUNE_JITTER)
+        if _is_number(params.get("frequency")) and params["frequency"] > 0:  # 0 = layer disabled
+            params["frequency"] = round(_clamp(params["frequency"] * frequency_factor, low, high), 1)
+        if _is_number(params.get("gain")):
+            params["gain"] = round(params["gain"] * gain_factor, 3)
+        if _is_number(params.get("detune")):
+            params["detune"] = round(_clamp(params["detune"] + detune_offset, -max_detune, max_detune), 1)
+
+    filter_factor = 1 + rng.uniform(-FREQUENCY_JITTER, FREQUENCY_JITTER)
+    audio_filter = config.get("filter")
+    if isinstance(audio_filter, dict) and _is_number(audio_filter.get("frequency")):
+        audio_filter["frequency"] = round(_clamp(audio_filter["frequency"] * filter_factor, *FILTER_LIMITS))
+    return config
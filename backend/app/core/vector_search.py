@@ -0,0 +1,135 @@
+"""
+Seed vector search
+Qdrant is the primary index (async client). When it is not configured or not
+reachable, searches fall back to an exact NumPy brute-force index built from
+the embeddings stored on the seeds table, so search keeps working without it.
+Stored vectors whose length differs from the current embedder's (legacy rows,
+a changed model or EMBEDDING_DIM) are left out until they are re-embedded.
+After a Qdrant failure it is skipped for a while instead of paying a
+connection timeout on every request.
+
+QDRANT_URL=":memory:" runs Qdrant's in-process local mode (tests, benchmarks).
+"""
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.embeddings import get_embedder
+from app.core.metrics import metrics
+from app.models.seed import Seed
+
+Hit = Tuple[int, float]  # (seed id, cosine similarity)
+
+
+def stack_embeddings(rows: Sequence[Tuple[int, np.ndarray]], dim: int) -> Tuple[List[int], np.ndarray, int]:
+    """(ids, matrix, skipped) for (id, embedding) rows, dropping vectors that are not `dim` long"""
+    kept = [(seed_id, embedding) for seed_id, embedding in rows if len(embedding) == dim]
+    vectors = np.stack([embedding for _, embedding in kept]) if kept else np.empty((0, dim), dtype=np.float32)
+    return [seed_id for seed_id, _ in kept], vectors, len(rows) - len(kept)
+
+
+class NumpyIndex:
+    """Exact cosine search over an in-memory matrix of normalised vectors"""
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.vectors = np.empty((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def replace(self, ids: Sequence[int], vectors: np.ndarray):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.vectors = np.asarray(vectors, dtype=np.float32).reshape(len(self.ids), -1)
+
+    def search(self, vector: np.ndarray, limit: int) -> List[Hit]:
+        if not len(self.ids) or limit <= 0:
+            return []
+        scores = self.vectors @ vector.astype(np.float32)
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(self.ids[i]), float(scores[i])) for i in top]
+
+
+class QdrantIndex:
+    def __init__(self, url: str, api_key: str, collection: str, timeout: int):
+        from qdrant_client import AsyncQdrantClient
+        if url == ":memory:":
+            self.client = AsyncQdrantClient(location=":memory:")
+        else:
+            self.client = AsyncQdrantClient(url=url, api_key=api_key or None, timeout=timeout)
+        self.collection = collection
+
+    async def ensure_collection(self, dim: int):
+        from qdrant_client import models
+        if not await self.client.collection_exists(self.collection):
+            await self.client.create_collection(
+                self.collection,
+                vectors_config=models.VectorParams(size=dim, distance=models.Distance.COSINE)
+            )
+
+    async def upsert(self, ids: Sequence[int], vectors: np.ndarray, batch_size: int = 256):
+        from qdrant_client import models
+        for start in range(0, len(ids), batch_size):
+            await self.client.upsert(
+                self.collection,
+                points=models.Batch(
+                    ids=[int(i) for i in ids[start:start + batch_size]],
+                    vectors=vectors[start:start + batch_size].tolist()
+                ),
+                wait=True
+            )
+
+    async def search(self, vector: np.ndarray, limit: int) -> List[Hit]:
+        response = await self.client.query_points(self.collection, query=vector.tolist(), limit=limit)
+        return [(int(point.id), float(point.score)) for point in response.points]
+
+
+class SeedSearch:
+    def __init__(self, qdrant: Optional[QdrantIndex], reload_seconds: float = 300, retry_seconds: float = 30):
+        self.qdrant = qdrant
+        self.fallback = NumpyIndex()
+        self.reload_seconds = reload_seconds
+        self.retry_seconds = retry_seconds
+        self._loaded_at: Optional[float] = None
+        self._qdrant_down_until = 0.0
+
+    async def load_fallback(self, db: AsyncSession):
+        result = await db.execute(select(Seed.id, Seed.embedding).where(Seed.embedding.isnot(None)))
+        ids, vectors, skipped = stack_embeddings(result.all(), get_embedder().dim)
+        if skipped:
+            print(f"Skipped {skipped} seed embeddings of the wrong dimension - run seed_embeddings embed")
+            metrics.inc("seeds.search.dim_mismatch", skipped)
+        self.fallback.replace(ids, vectors)
+        self._loaded_at = time.monotonic()
+
+    async def search(self, db: AsyncSession, vector: np.ndarray, limit: int) -> Tuple[List[Hit], str]:
+        """Top seeds for a query vector, plus which index answered ("qdrant" or "numpy")"""
+        if self.qdrant is not None and time.monotonic() >= self._qdrant_down_until:
+            try:
+                hits = await self.qdrant.search(vector, limit)
+                metrics.inc("seeds.search.qdrant")
+                return hits, "qdrant"
+            except Exception as e:
+                print(f"Qdrant search failed, using in-memory index: {e}")
+                metrics.inc("seeds.search.qdrant_errors")
+                self._qdrant_down_until = time.monotonic() + self.retry_seconds
+
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.reload_seconds:
+            await self.load_fallback(db)
+        metrics.inc("seeds.search.numpy")
+        return self.fallback.search(vector, limit), "numpy"
+
+
+def build_qdrant_index() -> Optional[QdrantIndex]:
+    if not settings.qdrant_url:
+        return None
+    return QdrantIndex(settings.qdrant_url, settings.qdrant_api_key, settings.qdrant_collection, settings.qdrant_timeout_seconds)
+
+
+seed_search = SeedSearch(build_qdrant_index())
@@ -0,0 +1,398 @@
+"""
+Performance benchmarks
+    python -m app.jobs.benchmarks login [--count 40]
+    python -m app.jobs.benchmarks matcher [--repeat 5]
+    python -m app.jobs.benchmarks activity-stats [--rows 8000] [--repeat 5]
+    python -m app.jobs.benchmarks garden-snapshot [--count 100]
+    python -m app.jobs.benchmarks echo-projection [--rows 3000] [--repeat 30]
+
+login: event-loop lag while `count` logins verify their password at once,
+hashing inline on the loop (how /login used to do it) vs through the worker
+pool and admission gate that /login uses now.
+
+matcher: analyze_mood on a short echo, a 5 KB text and a 1000-echo batch,
+the per-keyword substring loop it replaced vs the tokenized KeywordMatcher
+(best of `repeat` runs).
+
+activity-stats: /api/activities/stats/{user_id} over `rows` activities, the
+eight count() round trips it used to make vs the single UNION ALL query.
+
+garden-snapshot: the soundscape's recent echoes + plant counts for 50 users
+with 400 echoes each: blocking sqlite3 cursors (the pre-async endpoint's
+queries), two async queries, and the single UNION ALL load_garden_snapshot
+runs. Per-call latency, then event-loop lag with `count` snapshots at once.
+
+echo-projection: a user's newest echoes (5 to 1000) as whole Echo rows vs the
+Echo.select_moods() projection the analysis paths use, with ~8 KB of content
+and ~4 KB of response per echo. Best of `repeat` runs and peak traced memory.
+
+Benchmarks that need data seed a throwaway SQLite file with the app's tables;
+the configured DATABASE_URL is never touched.
+"""
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+import timeit
+import tracemalloc
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Awaitable, Callable, List
+
+from fastapi import HTTPException
+from sqlalchemy import desc, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.garden_snapshot import load_garden_snapshot
+from app.core.passwords import _verify, auth_admission, hash_password, verify_password
+from app.models import Base
+from app.models.activity import BreathingSession, JournalEntry, GratitudeEntry, GroundingSession
+from app.models.echo import Echo
+from app.routers.activities import build_activity_stats
+from app.routers.echo import EMOTION_KEYWORDS, SEED_TYPES, analyze_mood, analyze_moods
+
+
+async def measure_loop_lag(work: Callable[[], Awaitable]) -> tuple:
+    """(result of work, loop lag samples in seconds) with a 10 ms ticker running alongside"""
+    lags: List[float] = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    task = asyncio.create_task(ticker())
+    try:
+        result = await work()
+    finally:
+        done.set()
+        await task
+    return result, lags or [0.0]
+
+
+def lag_summary(lags: List[float]) -> str:
+    return f"loop lag p50 {statistics.median(lags) * 1000:7.1f}ms  max {max(lags) * 1000:7.1f}ms  ({len(lags)} ticks)"
+
+
+def best_of(work: Callable[[], object], number: int, repeat: int) -> float:
+    """Fastest seconds per call over `repeat` runs of `number` calls"""
+    return min(timeit.repeat(work, number=number, repeat=repeat)) / number
+
+
+async def best_of_async(work: Callable[[], Awaitable], number: int, repeat: int) -> float:
+    """best_of for coroutines"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await work()
+        runs.append(time.perf_counter() - start)
+    return min(runs) / number
+
+
+@dataclass
+class ScratchDatabase:
+    session: async_sessionmaker
+    path: str  # the SQLite file, for benchmarks that open it directly
+    queries: int = 0  # statements executed so far
+
+
+@asynccontextmanager
+async def scratch_database() -> AsyncIterator[ScratchDatabase]:
+    """All app tables on a temporary SQLite file, removed afterwards"""
+    directory = tempfile.mkdtemp(prefix="echobloom-bench-")
+    path = f"{directory}/bench.db"
+    scratch_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    scratch = ScratchDatabase(async_sessionmaker(scratch_engine, class_=AsyncSession, expire_on_commit=False), path)
+
+    def count_query(*args):
+        scratch.queries += 1
+
+    event.listen(scratch_engine.sync_engine, "before_cursor_execute", count_query)
+    try:
+        async with scratch_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield scratch
+    finally:
+        await scratch_engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+async def login_benchmark(count: int) -> int:
+    password = "correct horse battery staple"
+    password_hash = await hash_password(password)
+
+    async def inline_login() -> int:
+        await asyncio.sleep(0)  # requests interleave as they would arriving from the network
+        return 200 if _verify(password, password_hash) else 400
+
+    async def pooled_login() -> int:
+        await asyncio.sleep(0)
+        try:
+            async with auth_admission.slot():
+                return 200 if await verify_password(password, password_hash) else 400
+        except HTTPException as e:
+            return e.status_code
+
+    print(f"{count} concurrent logins")
+    for name, login in [("inline", inline_login), ("pool", pooled_login)]:
+        start = time.perf_counter()
+        statuses, lags = await measure_loop_lag(lambda: asyncio.gather(*(login() for _ in range(count))))
+        seconds = time.perf_counter() - start
+        codes = {code: statuses.count(code) for code in sorted(set(statuses))}
+        print(f"  {name:6}  {seconds:6.2f}s  {lag_summary(lags)}  statuses {codes}")
+    return 0
+
+
+def substring_mood(text: str) -> tuple:
+    """analyze_mood before KeywordMatcher: every keyword scanned as a substring"""
+    text_lower = text.lower()
+    detected_emotions = []
+    mood_score = 0.0
+    for emotion, keywords in EMOTION_KEYWORDS.items():
+        if any(keyword in text_lower for keyword in keywords):
+            detected_emotions.append(emotion)
+            if emotion in ["joy", "calm", "hope", "gratitude"]:
+                mood_score += 0.3
+            elif emotion in ["anxiety", "depression", "anger", "loneliness"]:
+                mood_score -= 0.25
+    seed_type = "reflection"
+    for stype, keywords in SEED_TYPES.items():
+        if any(keyword in text_lower for keyword in keywords):
+            seed_type = stype
+            break
+    mood_score = max(-1.0, min(1.0, mood_score))
+    if not detected_emotions:
+        detected_emotions = ["neutral"]
+        mood_score = 0.0
+    return mood_score, detected_emotions[:3], seed_type
+
+
+def matcher_benchmark(repeat: int) -> int:
+    short = "Today I made a cake and felt a bit anxious but also grateful for my friends."
+    rng = random.Random(1)
+    words = "the a day work friend walk coffee rain think thanks hopeful madness made calm some more".split()
+    long = " ".join(rng.choice(words) for _ in range(1000))[:5120]
+    batch = [short] * 1000
+
+    print("analyze_mood: substring loop -> KeywordMatcher")
+    for name, text, number in [("short echo", short, 20000), ("5 KB text", long, 500)]:
+        before = best_of(lambda: substring_mood(text), number, repeat)
+        after = best_of(lambda: analyze_mood(text), number, repeat)
+        print(f"  {name:16} {before * 1e6:8.1f}us -> {after * 1e6:8.1f}us")
+    before = best_of(lambda: [substring_mood(text) for text in batch], 20, repeat)
+    after = best_of(lambda: analyze_moods(batch), 20, repeat)
+    print(f"  {'1000-echo batch':16} {before * 1e3:8.1f}ms -> {after * 1e3:8.1f}ms")
+    return 0
+
+
+async def count_query_activity_stats(user_id: str, db: AsyncSession) -> dict:
+    """build_activity_stats before the UNION ALL: one count() per table and window"""
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    counts = {}
+    for name, model in [("breathing", BreathingSession), ("journal", JournalEntry),
+                        ("gratitude", GratitudeEntry), ("grounding", GroundingSession)]:
+        total = await db.execute(select(func.count()).select_from(model).where(model.user_id == user_id))
+        week = await db.execute(
+            select(func.count()).select_from(model).where(model.user_id == user_id, model.completed_at >= week_ago)
+        )
+        counts[name] = (total.scalar() or 0, week.scalar() or 0)
+    return {
+        "total_activities": sum(total for total, _ in counts.values()),
+        "breathing_sessions": counts["breathing"][0],
+        "journal_entries": counts["journal"][0],
+        "gratitude_entries": counts["gratitude"][0],
+        "grounding_sessions": counts["grounding"][0],
+        "this_week_count": sum(week for _, week in counts.values())
+    }
+
+
+async def activity_stats_benchmark(rows: int, repeat: int) -> int:
+    async with scratch_database() as scratch:
+        rng = random.Random(3)
+        now = datetime.utcnow()
+        async with scratch.session() as db:
+            for model in (BreathingSession, JournalEntry, GratitudeEntry, GroundingSession):
+                for _ in range(rows // 4):
+                    extra = {"category": "emotions"} if model is JournalEntry else {}
+                    db.add(model(user_id=rng.choice(["user-a", "user-b", "user-c", "user-d"]),
+                                 completed_at=now - timedelta(days=rng.uniform(0, 60)), **extra))
+            await db.commit()
+
+        print(f"activity stats over {rows} activities (SQLite)")
+        results = []
+        async with scratch.session() as db:
+            for name, stats in [("8 queries", count_query_activity_stats), ("UNION ALL", build_activity_stats)]:
+                before = scratch.queries
+                results.append(await stats("user-a", db))
+                queries = scratch.queries - before
+                seconds = await best_of_async(lambda: stats("user-a", db), 50, repeat)
+                print(f"  {name:10} {queries} queries/call  {seconds * 1000:6.2f}ms")
+    if results[0] != results[1]:
+        print(f"  results differ: {results[0]} vs {results[1]}")
+        return 1
+    return 0
+
+
+def blocking_garden_snapshot(path: str, user_id: str, recent_limit: int) -> tuple:
+    """The soundscape endpoint's queries before load_garden_snapshot: sqlite3 cursors on the loop thread"""
+    connection = sqlite3.connect(path)
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            "SELECT id, content, mood_score, emotion_tags, seed_type, created_at FROM echoes "
+            "WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+            (user_id, recent_limit)
+        )
+        echoes = [
+            {"id": row[0], "mood_score": row[2] or 0.0, "emotion_tags": json.loads(row[3]) if row[3] else [],
+             "seed_type": row[4]}
+            for row in cursor.fetchall()
+        ]
+        cursor.execute("SELECT seed_type, COUNT(*) FROM echoes WHERE user_id = ? GROUP BY seed_type", (user_id,))
+        return echoes, dict(cursor.fetchall())
+    finally:
+        connection.close()
+
+
+async def two_query_garden_snapshot(db: AsyncSession, user_id: str, recent_limit: int) -> tuple:
+    recent = await db.execute(
+        select(Echo.id, Echo.mood_score, Echo.emotion_tags, Echo.seed_type, Echo.created_at)
+        .where(Echo.user_id == user_id)
+        .order_by(Echo.created_at.desc())
+        .limit(recent_limit)
+    )
+    plants = await db.execute(
+        select(Echo.seed_type, func.count()).where(Echo.user_id == user_id).group_by(Echo.seed_type)
+    )
+    return recent.all(), dict(plants.all())
+
+
+def latency_summary(samples: List[float]) -> str:
+    ordered = sorted(samples)
+    return f"p50 {statistics.median(ordered) * 1000:6.2f}ms  p99 {ordered[int(len(ordered) * 0.99)] * 1000:6.2f}ms"
+
+
+async def garden_snapshot_benchmark(count: int) -> int:
+    users, per_user, recent_limit = 50, 400, 5
+    async with scratch_database() as scratch:
+        rng = random.Random(21)
+        now = datetime.utcnow()
+        async with scratch.session() as db:
+            for user in range(users):
+                db.add_all(
+                    Echo(user_id=f"user-{user}", content="x" * 200, ai_response="y" * 200,
+                         mood_score=rng.uniform(-1, 1), emotion_tags=rng.sample(["joy", "calm", "anxiety", "hope", "sadness"], 2),
+                         seed_type=rng.choice(["joy", "gratitude", "concern", "reflection"]),
+                         created_at=now - timedelta(minutes=i))
+                    for i in range(per_user)
+                )
+            await db.commit()
+
+        async def blocking(user_id: str):
+            return blocking_garden_snapshot(scratch.path, user_id, recent_limit)
+
+        async def two_queries(user_id: str):
+            async with scratch.session() as db:
+                return await two_query_garden_snapshot(db, user_id, recent_limit)
+
+        async def union_all(user_id: str):
+            async with scratch.session() as db:
+                return await load_garden_snapshot(db, user_id, recent_limit)
+
+        variants = [("sqlite3 (blocking)", blocking), ("2 async queries", two_queries), ("UNION ALL", union_all)]
+        print(f"garden snapshot, {users} users x {per_user} echoes (SQLite)")
+        for name, snapshot in variants:
+            samples = []
+            for i in range(500):
+                start = time.perf_counter()
+                await snapshot(f"user-{i % users}")
+                samples.append(time.perf_counter() - start)
+            print(f"  {name:18} {latency_summary(samples)}")
+
+        print(f"{count} snapshots at once")
+        for name, snapshot in variants[::2]:
+            burst = lambda: asyncio.gather(*(snapshot(f"user-{i % users}") for i in range(count)))
+            await burst()  # the first burst also opens the pool's connections
+            _, lags = await measure_loop_lag(burst)
+            print(f"  {name:18} {lag_summary(lags)}")
+    return 0
+
+
+async def echo_projection_benchmark(rows: int, repeat: int) -> int:
+    async with scratch_database() as scratch:
+        rng = random.Random(3)
+        now = datetime.utcnow()
+        async with scratch.session() as db:
+            db.add_all(
+                Echo(user_id="user-a", content="reflection " * 700, ai_response="response " * 450,
+                     mood_score=rng.uniform(-1, 1), emotion_tags=["Joy", "Calm"], seed_type="joy",
+                     created_at=now - timedelta(minutes=8 * i))
+                for i in range(rows)
+            )
+            await db.commit()
+
+        async def entities(limit: int):
+            async with scratch.session() as db:
+                result = await db.execute(
+                    select(Echo).where(Echo.user_id == "user-a").order_by(desc(Echo.created_at)).limit(limit)
+                )
+                return [(echo.mood_score, echo.emotion_tags) for echo in result.scalars().all()]
+
+        async def projection(limit: int):
+            async with scratch.session() as db:
+                result = await db.execute(
+                    Echo.select_moods().where(Echo.user_id == "user-a").order_by(desc(Echo.created_at)).limit(limit)
+                )
+                return [(echo.mood_score, echo.emotion_tags) for echo in Echo.moods(result)]
+
+        print(f"newest echoes of a user with {rows} (~12 KB text each, SQLite): whole rows -> mood projection")
+        for limit in (5, 10, 15, 30, 1000):
+            figures = []
+            for load in (entities, projection):
+                await load(limit)
+                seconds = await best_of_async(lambda: load(limit), 1, repeat)
+                tracemalloc.start()
+                try:
+                    await load(limit)
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                figures.append(f"{seconds * 1000:6.2f}ms {peak / 1024:8.1f} KiB")
+            print(f"  limit {limit:4}  {figures[0]}  ->  {figures[1]}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Performance benchmarks")
+    parser.add_argument("command", choices=["login", "matcher", "activity-stats", "garden-snapshot", "echo-projection"])
+    parser.add_argument("--count", type=int, default=None,
+                        help="Concurrent logins (login, default 40) or snapshots (garden-snapshot, default 100)")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="Seeded activities (activity-stats, default 8000) or echoes (echo-projection, default 3000)")
+    parser.add_argument("--repeat", type=int, default=None,
+                        help="Timing runs; the best is reported (default 5, echo-projection 30)")
+    args = parser.parse_args()
+    if args.command == "login":
+        code = asyncio.run(login_benchmark(args.count or 40))
+    elif args.command == "matcher":
+        code = matcher_benchmark(args.repeat or 5)
+    elif args.command == "activity-stats":
+        code = asyncio.run(activity_stats_benchmark(args.rows or 8000, args.repeat or 5))
+    elif args.command == "garden-snapshot":
+        code = asyncio.run(garden_snapshot_benchmark(args.count or 100))
+    else:
+        code = asyncio.run(echo_projection_benchmark(args.rows or 3000, args.repeat or 30))
+    raise SystemExit(code)
+
+
+if __name__ == "__main__":
+    main()
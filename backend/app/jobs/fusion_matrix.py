@@ -0,0 +1,91 @@
+"""
+Emotion-fusion matrix warm-up
+    python -m app.jobs.fusion_matrix [--rate 1.0] [--concurrency 2] [--limit N] [--force]
+
+Generates a fusion for every unordered palette pair x mood-trend variant and
+stores it in emotion_fusions. Each fusion is committed as soon as it is
+generated, so an interrupted run resumes where it stopped. --rate caps model
+calls per second. Generations bypass llm_cache: every fusion is a fresh model
+call (so --force really regenerates) and is stored only in emotion_fusions.
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+from app.core.database import async_session, create_tables
+from app.core.fusion_matrix import TREND_VARIANTS, NO_TREND, fusion_matrix, matrix_key
+from app.core.llm import llm
+from app.routers.alchemy import EMOTION_PALETTE, generate_emotion_fusion
+
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all workers"""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            delay = self._next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_at = max(self._next_at, time.monotonic()) + self.interval
+
+
+def all_keys():
+    names = [emotion["name"] for emotion in EMOTION_PALETTE]
+    for emotion1, emotion2 in itertools.combinations(names, 2):
+        for trend in TREND_VARIANTS:
+            yield matrix_key(emotion1, emotion2, trend)
+
+
+async def run(rate: float, concurrency: int, limit: int = None, force: bool = False) -> int:
+    await create_tables()
+    async with async_session() as db:
+        done = set() if force else await fusion_matrix.existing_keys(db)
+    pending = [key for key in all_keys() if key not in done]
+    if limit:
+        pending = pending[:limit]
+    print(f"{len(done)} fusions stored, {len(pending)} to generate")
+
+    limiter = RateLimiter(rate)
+    queue: asyncio.Queue = asyncio.Queue()
+    for key in pending:
+        queue.put_nowait(key)
+    failures = []
+
+    async def worker():
+        while not queue.empty():
+            emotion_a, emotion_b, trend = queue.get_nowait()
+            await limiter.wait()
+            context = None if trend == NO_TREND else {"mood_trend": trend, "common_emotions": []}
+            result = await generate_emotion_fusion(emotion_a, emotion_b, context, use_cache=False)
+            if not result["success"]:
+                failures.append((emotion_a, emotion_b, trend))
+                print(f"  failed {emotion_a} + {emotion_b} ({trend}): {result.get('error')}")
+                continue
+            async with async_session() as db:
+                await fusion_matrix.store(db, emotion_a, emotion_b, trend, result["fusion"], llm.model)
+                await db.commit()
+            print(f"  stored {emotion_a} + {emotion_b} ({trend})")
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    print(f"Generated {len(pending) - len(failures)} fusions, {len(failures)} failed (re-run to retry)")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate the alchemy emotion-fusion matrix")
+    parser.add_argument("--rate", type=float, default=1.0, help="Max model calls per second")
+    parser.add_argument("--concurrency", type=int, default=2, help="Parallel model calls")
+    parser.add_argument("--limit", type=int, default=None, help="Generate at most N fusions this run")
+    parser.add_argument("--force", action="store_true", help="Regenerate fusions that already exist")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.rate, args.concurrency, args.limit, args.force)))
+
+
+if __name__ == "__main__":
+    main()
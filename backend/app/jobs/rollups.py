@@ -0,0 +1,38 @@
+"""
+Daily rollup maintenance
+    python -m app.jobs.rollups backfill [--user-id ID]   # rebuild from raw echoes/activities
+    python -m app.jobs.rollups check [--user-id ID]      # compare stored rollups with a recomputation
+"""
+import argparse
+import asyncio
+import json
+
+from app.core.database import async_session, create_tables
+from app.core.rollups import backfill_rollups, check_rollups
+
+
+async def run(command: str, user_id: str = None) -> int:
+    await create_tables()
+    async with async_session() as db:
+        if command == "backfill":
+            written = await backfill_rollups(db, user_id)
+            print(f"Backfilled {written} daily rollups")
+            return 0
+
+        mismatches = await check_rollups(db, user_id)
+        for mismatch in mismatches:
+            print(json.dumps(mismatch, default=str))
+        print(f"{len(mismatches)} inconsistent daily rollups")
+        return 1 if mismatches else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain daily_user_rollups")
+    parser.add_argument("command", choices=["backfill", "check"])
+    parser.add_argument("--user-id", default=None, help="Limit to one user")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.command, args.user_id)))
+
+
+if __name__ == "__main__":
+    main()
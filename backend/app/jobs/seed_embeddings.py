@@ -0,0 +1,199 @@
+"""
+Seed embedding pipeline
+    python -m app.jobs.seed_embeddings embed [--batch-size 256] [--force]
+    python -m app.jobs.seed_embeddings sync [--batch-size 256]
+    python -m app.jobs.seed_embeddings benchmark [--queries 200] [--k 10]
+    python -m app.jobs.seed_embeddings storage-benchmark [--count 20000]
+
+embed: embeds seeds in id order, a batch at a time, stores the vectors on the
+seeds table and bulk-upserts them into Qdrant (when QDRANT_URL is set). Each
+batch is checkpointed, so an interrupted run resumes after the last batch.
+Without --force only seeds with no embedding, or one whose length differs from
+the current embedder's, are embedded.
+sync: re-uploads every stored embedding to Qdrant (e.g. after it was down).
+benchmark: recall@k of Qdrant against exact NumPy search, plus latencies.
+storage-benchmark: bytes per row and decode throughput of JSON text vs the
+binary Vector formats.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List
+
+import numpy as np
+from sqlalchemy import func, or_, select, update
+
+from app.core.checkpoints import load_checkpoint, save_checkpoint
+from app.core.database import async_session, create_tables
+from app.core.embeddings import embed_texts, get_embedder
+from app.core.vector_search import NumpyIndex, seed_search, stack_embeddings
+from app.models.seed import Seed
+from app.models.types import DTYPES, decode_vector, encode_vector
+
+CHECKPOINT = "seed_embeddings"
+
+
+async def embed(batch_size: int, force: bool = False) -> int:
+    await create_tables()
+    dim = get_embedder().dim
+    stored_bytes = dim * DTYPES["float32"].itemsize  # Seed.embedding is Vector() float32
+    qdrant = seed_search.qdrant
+    if qdrant is not None:
+        await qdrant.ensure_collection(dim)
+
+    async with async_session() as db:
+        last_id = int(await load_checkpoint(db, CHECKPOINT) or 0)
+    if last_id:
+        print(f"Resuming after seed {last_id}")
+
+    embedded = 0
+    while True:
+        async with async_session() as db:
+            query = select(Seed.id, Seed.content).where(Seed.id > last_id).order_by(Seed.id).limit(batch_size)
+            if not force:
+                query = query.where(or_(Seed.embedding.is_(None), func.length(Seed.embedding) != stored_bytes))
+            batch = (await db.execute(query)).all()
+            if not batch:
+                await save_checkpoint(db, CHECKPOINT, None, completed=True)
+                await db.commit()
+                break
+
+            ids = [seed_id for seed_id, _ in batch]
+            vectors = await embed_texts([content or "" for _, content in batch])
+            await db.execute(
+                update(Seed),
+                [{"id": seed_id, "embedding": vector} for seed_id, vector in zip(ids, vectors)]
+            )
+            if qdrant is not None:
+                await qdrant.upsert(ids, vectors, batch_size)
+            last_id = ids[-1]
+            await save_checkpoint(db, CHECKPOINT, str(last_id))
+            await db.commit()
+
+        embedded += len(ids)
+        print(f"  embedded {embedded} seeds (through id {last_id})")
+
+    print(f"Embedded {embedded} seeds")
+    return 0
+
+
+async def load_stored(db) -> tuple:
+    rows = (await db.execute(
+        select(Seed.id, Seed.embedding).where(Seed.embedding.isnot(None)).order_by(Seed.id)
+    )).all()
+    ids, vectors, skipped = stack_embeddings(rows, get_embedder().dim)
+    if skipped:
+        print(f"Skipping {skipped} embeddings of the wrong dimension - run `embed` to refresh them")
+    return ids, vectors
+
+
+async def sync(batch_size: int) -> int:
+    qdrant = seed_search.qdrant
+    if qdrant is None:
+        print("QDRANT_URL is not set")
+        return 1
+    async with async_session() as db:
+        ids, vectors = await load_stored(db)
+    if ids:
+        await qdrant.ensure_collection(vectors.shape[1])
+        await qdrant.upsert(ids, vectors, batch_size)
+    print(f"Uploaded {len(ids)} embeddings to Qdrant")
+    return 0
+
+
+def percentile_ms(samples: List[float], pct: float) -> float:
+    return round(float(np.percentile(samples, pct)) * 1000, 2)
+
+
+async def benchmark(queries: int, k: int) -> int:
+    async with async_session() as db:
+        ids, vectors = await load_stored(db)
+        contents = [content for (content,) in (await db.execute(select(Seed.content).where(Seed.embedding.isnot(None)))).all()]
+    if not ids:
+        print("No embedded seeds - run `embed` first")
+        return 1
+
+    exact = NumpyIndex()
+    exact.replace(ids, vectors)
+    # Queries are seed texts with words dropped, so the exact answer is non-trivial
+    rng = random.Random(0)
+    texts = []
+    for content in rng.choices(contents, k=queries):
+        words = (content or "").split()
+        texts.append(" ".join(word for word in words if rng.random() > 0.3) or content or "")
+
+    embed_times, numpy_times, qdrant_times, recalls = [], [], [], []
+    qdrant = seed_search.qdrant
+    for text in texts:
+        start = time.perf_counter()
+        vector = (await embed_texts([text]))[0]
+        embed_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        expected = {seed_id for seed_id, _ in exact.search(vector, k)}
+        numpy_times.append(time.perf_counter() - start)
+
+        if qdrant is not None:
+            start = time.perf_counter()
+            found = {seed_id for seed_id, _ in await qdrant.search(vector, k)}
+            qdrant_times.append(time.perf_counter() - start)
+            recalls.append(len(found & expected) / max(1, len(expected)))
+
+    print(f"{len(ids)} seeds, dim {vectors.shape[1]}, {queries} queries, k={k}")
+    print(f"  embed   p50 {percentile_ms(embed_times, 50)}ms  p95 {percentile_ms(embed_times, 95)}ms")
+    print(f"  numpy   p50 {percentile_ms(numpy_times, 50)}ms  p95 {percentile_ms(numpy_times, 95)}ms  (exact)")
+    if qdrant is not None:
+        print(f"  qdrant  p50 {percentile_ms(qdrant_times, 50)}ms  p95 {percentile_ms(qdrant_times, 95)}ms  "
+              f"recall@{k} {sum(recalls) / len(recalls):.3f}")
+    return 0
+
+
+def storage_benchmark(count: int) -> int:
+    dim = get_embedder().dim
+    vectors = np.random.default_rng(0).standard_normal((count, dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    json_rows = [json.dumps(vector.tolist()) for vector in vectors]
+    start = time.perf_counter()
+    for row in json_rows:
+        np.asarray(json.loads(row), dtype=np.float32)
+    json_seconds = time.perf_counter() - start
+    json_bytes = sum(len(row) for row in json_rows) / count
+    print(f"{count} vectors, dim {dim}")
+    print(f"  json     {json_bytes:8.0f} B/row  {count / json_seconds:12,.0f} rows/s")
+
+    for dtype in DTYPES:
+        rows = [encode_vector(vector, dtype) for vector in vectors]
+        start = time.perf_counter()
+        decoded = [decode_vector(row, dtype) for row in rows]
+        seconds = time.perf_counter() - start
+        error = float(np.abs(np.stack(decoded).astype(np.float32) - vectors).max())
+        print(f"  {dtype:8} {len(rows[0]):8} B/row  {count / seconds:12,.0f} rows/s  "
+              f"max abs error {error:.2e}  ({json_seconds / seconds:.0f}x faster than json)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Embed seeds and maintain the vector index")
+    parser.add_argument("command", choices=["embed", "sync", "benchmark", "storage-benchmark"])
+    parser.add_argument("--batch-size", type=int, default=256, help="Seeds per embedding batch / Qdrant upsert")
+    parser.add_argument("--force", action="store_true", help="Re-embed seeds that already have an embedding")
+    parser.add_argument("--queries", type=int, default=200, help="Benchmark queries")
+    parser.add_argument("--k", type=int, default=10, help="Benchmark result size")
+    parser.add_argument("--count", type=int, default=20000, help="Vectors for storage-benchmark")
+    args = parser.parse_args()
+    if args.command == "embed":
+        code = asyncio.run(embed(args.batch_size, args.force))
+    elif args.command == "sync":
+        code = asyncio.run(sync(args.batch_size))
+    elif args.command == "storage-benchmark":
+        code = storage_benchmark(args.count)
+    else:
+        code = asyncio.run(benchmark(args.queries, args.k))
+    raise SystemExit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Garden Whisperer background scan
+    python -m app.jobs.whisperer_scan [--batch-size 200] [--concurrency 4]   # one full pass
+
+Walks every user with an echo in the last 7 days in user_id order, batch by
+batch, and refreshes whisperer_nudges. The last user_id of each batch is
+checkpointed in the same transaction as the batch, so after a crash the next
+pass resumes right after it. The API runs the same pass on a timer when
+WHISPERER_SCAN_INTERVAL_SECONDS > 0 (enable it on one worker only).
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from app.core.checkpoints import load_checkpoint, save_checkpoint
+from app.core.config import settings
+from app.core.database import async_session, create_tables
+from app.core.metrics import metrics
+from app.models.echo import Echo
+from app.routers.whisperer import refresh_whisperer_nudges
+
+CHECKPOINT = "whisperer_scan"
+
+
+async def active_user_batch(db, after: Optional[str], batch_size: int) -> List[str]:
+    """Next batch of users with recent echoes, in user_id order"""
+    query = (
+        select(Echo.user_id)
+        .where(Echo.created_at >= datetime.utcnow() - timedelta(days=7))
+        .group_by(Echo.user_id)
+        .order_by(Echo.user_id)
+        .limit(batch_size)
+    )
+    if after is not None:
+        query = query.where(Echo.user_id > after)
+    return list((await db.execute(query)).scalars().all())
+
+
+async def scan_once(batch_size: int, concurrency: int) -> int:
+    """One full pass over active users, resuming from the checkpoint; returns users scanned"""
+    start = time.perf_counter()
+    async with async_session() as db:
+        cursor = await load_checkpoint(db, CHECKPOINT)
+
+    scanned = 0
+    while True:
+        async with async_session() as db:
+            user_ids = await active_user_batch(db, cursor, batch_size)
+            if not user_ids:
+                await save_checkpoint(db, CHECKPOINT, None, completed=True)
+                await db.commit()
+                break
+        # The checkpoint commits together with the batch's nudges
+        cursor = user_ids[-1]
+        await refresh_whisperer_nudges(
+            user_ids, concurrency, on_write=lambda db: save_checkpoint(db, CHECKPOINT, cursor)
+        )
+        scanned += len(user_ids)
+
+    metrics.observe("whisperer.scan", time.perf_counter() - start)
+    return scanned
+
+
+async def run_forever(interval_seconds: float):
+    """Scheduler loop started by the API on startup"""
+    while True:
+        try:
+            await scan_once(settings.whisperer_scan_batch_size, settings.whisperer_scan_concurrency)
+        except Exception as e:
+            metrics.inc("whisperer.scan.errors")
+            print(f"Whisperer scan failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+async def run(batch_size: int, concurrency: int) -> int:
+    await create_tables()
+    scanned = await scan_once(batch_size, concurrency)
+    print(f"Scanned {scanned} active users")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh Garden Whisperer nudges for active users")
+    parser.add_argument("--batch-size", type=int, default=settings.whisperer_scan_batch_size)
+    parser.add_argument("--concurrency", type=int, default=settings.whisperer_scan_concurrency)
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args.batch_size, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import echo, consent, sessions, sensors, search_seeds, auth, activities, analytics, whisperer, patterns, weave, simulate, soundscape, alchemy
+from app.routers import echo, consent, sessions, sensors, search_seeds, auth, activities, analytics, whisperer, patterns, weave, simulate, soundscape, alchemy, metrics
 from app.core.config import settings
 from app.core.database import create_tables
+from app.core.concurrency import drain_background
+from app.core.sensor_ingest import sensor_ingest
+from app.core.llm_cache import llm_cache
+from app.jobs import whisperer_scan
+import asyncio
 
 app = FastAPI(title="EchoBloom Backend", version="1.0.0")
 
@@ -30,10 +35,27 @@ app.include_router(weave.router, tags=["weave"])
 app.include_router(simulate.router, tags=["simulate"])
 app.include_router(soundscape.router, tags=["soundscape"])
 app.include_router(alchemy.router, tags=["alchemy"])
+app.include_router(metrics.router, prefix="/api", tags=["metrics"])
 
 @app.on_event("startup")
 async def startup_event():
     await create_tables()
+    if settings.whisperer_scan_interval_seconds > 0:
+        app.state.whisperer_scan = asyncio.create_task(
+            whisperer_scan.run_forever(settings.whisperer_scan_interval_seconds)
+        )
+    if settings.llm_cache_hit_flush_seconds > 0:
+        app.state.llm_cache_flusher = asyncio.create_task(llm_cache.run_flusher())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for name in ("whisperer_scan", "llm_cache_flusher"):
+        task = getattr(app.state, name, None)
+        if task:
+            task.cancel()
+    await drain_background()
+    await sensor_ingest.drain()
+    await llm_cache.flush_hits()
 
 @app.get("/")
 async def root():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, Text
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, Text, Index
 from sqlalchemy.sql import func
 from app.models import Base
 
@@ -6,7 +6,7 @@ class BreathingSession(Base):
     __tablename__ = "breathing_sessions"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True, nullable=False)  # Clerk ID
+    user_id = Column(String, nullable=False)  # Clerk ID; leads the (user_id, completed_at) index
     
     # Session data
     cycles_completed = Column(Integer, default=0)
@@ -20,6 +20,10 @@ class BreathingSession(Base):
     
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_breathing_sessions_user_id_completed_at", user_id, completed_at.desc()),
+    )
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -38,7 +42,7 @@ class JournalEntry(Base):
     __tablename__ = "journal_entries"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True, nullable=False)  # Clerk ID
+    user_id = Column(String, nullable=False)  # Clerk ID; leads the (user_id, completed_at) index
     
     # Journal data
     category = Column(String, nullable=False)  # anxiety, emotions, self-discovery, etc.
@@ -52,6 +56,10 @@ class JournalEntry(Base):
     
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_journal_entries_user_id_completed_at", user_id, completed_at.desc()),
+    )
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -70,7 +78,7 @@ class GratitudeEntry(Base):
     __tablename__ = "gratitude_entries"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True, nullable=False)  # Clerk ID
+    user_id = Column(String, nullable=False)  # Clerk ID; leads the (user_id, completed_at) index
     
     # Gratitude data
     gratitudes = Column(JSON)  # List of {text, reason} objects
@@ -82,6 +90,10 @@ class GratitudeEntry(Base):
     
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_gratitude_entries_user_id_completed_at", user_id, completed_at.desc()),
+    )
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -98,7 +110,7 @@ class GroundingSession(Base):
     __tablename__ = "grounding_sessions"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True, nullable=False)  # Clerk ID
+    user_id = Column(String, nullable=False)  # Clerk ID; leads the (user_id, completed_at) index
     
     # Grounding data (5-4-3-2-1 technique)
     see_items = Column(JSON)  # 5 things seen
@@ -115,6 +127,10 @@ class GroundingSession(Base):
     
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_grounding_sessions_user_id_completed_at", user_id, completed_at.desc()),
+    )
+    
     def to_dict(self):
         return {
             "id": self.id,
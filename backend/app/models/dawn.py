@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.models import Base
+
+class DawnPrediction(Base):
+    """Stored day-of-week analysis behind Dawn Weaves; valid until the week rolls over or a new echo arrives"""
+    __tablename__ = "dawn_predictions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, unique=True, index=True, nullable=False)  # Clerk ID
+    echo_count = Column(Integer, default=0)  # echoes in the 60-day window
+    pattern_analysis = Column(JSON, nullable=True)  # analyze_day_of_week_patterns() output
+    is_stale = Column(Boolean, default=False)  # set by create_echo
+    last_echo_id = Column(Integer, nullable=True)  # newest echo the analysis read; older rows are not served
+    valid_until = Column(DateTime(timezone=True), nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "echo_count": self.echo_count,
+            "pattern_analysis": self.pattern_analysis,
+            "is_stale": self.is_stale,
+            "last_echo_id": self.last_echo_id,
+            "valid_until": self.valid_until.isoformat() if self.valid_until else None,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None
+        }
+
+class ShieldStory(Base):
+    """Generated shield story, at most one per user, weekday and ISO week of the predicted date"""
+    __tablename__ = "shield_stories"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, nullable=False)  # Clerk ID
+    day = Column(String, nullable=False)  # Monday, Tuesday, ...
+    week = Column(String, nullable=False)  # ISO week of next_date, e.g. "2026-W43"
+    story = Column(JSON, nullable=False)  # generate_shield_story() output
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", "week", name="uq_shield_stories_user_id_day_week"),
+    )
+    
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "day": self.day,
+            "week": self.week,
+            "story": self.story,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
@@ -1,12 +1,26 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, Index, Select, select
 from sqlalchemy.sql import func
 from app.models import Base
 
+
+@dataclass(slots=True)
+class EchoMood:
+    """The analysis columns of an echo, without the content / ai_response text"""
+    id: int
+    mood_score: Optional[float]
+    emotion_tags: List[str]
+    created_at: datetime
+
+
 class Echo(Base):
     __tablename__ = "echoes"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True, nullable=False)  # Clerk user ID
+    user_id = Column(String, nullable=False)  # Clerk user ID; leads the (user_id, created_at) index
     content = Column(Text, nullable=False)  # User's input
     ai_response = Column(Text, nullable=False)  # AI empathy response
     mood_score = Column(Float)  # -1 to 1 (negative to positive)
@@ -17,6 +31,21 @@ class Echo(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Per-user history queries filter on a time range and sort by time
+    __table_args__ = (
+        Index("ix_echoes_user_id_created_at", user_id, created_at.desc()),
+    )
+    
+    @classmethod
+    def select_moods(cls) -> Select:
+        """select() of just the EchoMood columns; add where / order_by / limit as usual"""
+        return select(cls.id, cls.mood_score, cls.emotion_tags, cls.created_at)
+    
+    @staticmethod
+    def moods(rows: Iterable) -> List[EchoMood]:
+        """EchoMood per row of a select_moods() result (NULL tags become [])"""
+        return [EchoMood(row.id, row.mood_score, row.emotion_tags or [], row.created_at) for row in rows]
+    
     def to_dict(self):
         return {
             "id": self.id,
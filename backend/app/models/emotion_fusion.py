@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.models import Base
+
+class EmotionFusion(Base):
+    """Pre-generated fusion for an unordered palette pair and mood-trend variant"""
+    __tablename__ = "emotion_fusions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    emotion_a = Column(String, nullable=False)  # alphabetically first of the pair
+    emotion_b = Column(String, nullable=False)
+    mood_trend = Column(String, nullable=False)  # positive | challenging | balanced | none
+    fusion = Column(JSON, nullable=False)
+    model = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint("emotion_a", "emotion_b", "mood_trend", name="uq_emotion_fusions_pair_trend"),
+    )
+    
+    def to_dict(self):
+        return {
+            "emotion_a": self.emotion_a,
+            "emotion_b": self.emotion_b,
+            "mood_trend": self.mood_trend,
+            "fusion": self.fusion,
+            "model": self.model,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
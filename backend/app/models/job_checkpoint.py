@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from app.models import Base
+
+class JobCheckpoint(Base):
+    """Resume point for batch jobs; cursor is cleared when a full pass completes"""
+    __tablename__ = "job_checkpoints"
+    
+    name = Column(String, primary_key=True)
+    cursor = Column(String, nullable=True)  # last key processed in the current pass
+    last_completed_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "cursor": self.cursor,
+            "last_completed_at": self.last_completed_at.isoformat() if self.last_completed_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from app.models import Base
+
+class LLMCacheEntry(Base):
+    """Stored completion for a deterministic prompt, keyed by model + normalized prompt hash"""
+    __tablename__ = "llm_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, nullable=False)  # sha256 hex
+    model = Column(String, nullable=False)
+    response = Column(Text, nullable=False)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+    hit_count = Column(Integer, default=0)
+    last_used_at = Column(DateTime(timezone=True), nullable=True)  # stored or last hit; LRU eviction order
+    
+    __table_args__ = (
+        Index("ix_llm_cache_expires_at", expires_at),
+        Index("ix_llm_cache_last_used_at", last_used_at),
+    )
+    
+    def to_dict(self):
+        return {
+            "cache_key": self.cache_key,
+            "model": self.model,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "last_hit_at": self.last_hit_at.isoformat() if self.last_hit_at else None,
+            "hit_count": self.hit_count
+        }
@@ -0,0 +1,45 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.models import Base
+
+class DailyUserRollup(Base):
+    """Per-user, per-day (UTC) summary maintained on every echo and activity write"""
+    __tablename__ = "daily_user_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, nullable=False)  # Clerk ID
+    day = Column(Date, nullable=False)
+    
+    # Echo mood stats
+    mood_sum = Column(Float, default=0.0)
+    mood_count = Column(Integer, default=0)
+    mood_min = Column(Float, nullable=True)
+    mood_max = Column(Float, nullable=True)
+    emotion_counts = Column(JSON, default=dict)  # {"joy": 3, "calm": 1}
+    
+    # Activity counts
+    breathing_count = Column(Integer, default=0)
+    journal_count = Column(Integer, default=0)
+    gratitude_count = Column(Integer, default=0)
+    grounding_count = Column(Integer, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_daily_user_rollups_user_id_day"),
+    )
+    
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "day": self.day.isoformat() if self.day else None,
+            "mood_sum": self.mood_sum,
+            "mood_count": self.mood_count,
+            "mood_min": self.mood_min,
+            "mood_max": self.mood_max,
+            "emotion_counts": self.emotion_counts or {},
+            "breathing_count": self.breathing_count,
+            "journal_count": self.journal_count,
+            "gratitude_count": self.gratitude_count,
+            "grounding_count": self.grounding_count
+        }
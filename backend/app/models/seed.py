@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, Text, DateTime
 from . import Base
+from .types import Vector
 from datetime import datetime
 
 class Seed(Base):
@@ -7,6 +8,14 @@ class Seed(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text)  # advice snippet
-    embedding = Column(String)  # JSON vector
+    embedding = Column(Vector())  # float32 bytes
     created_at = Column(DateTime, default=datetime.utcnow)
-    impact_count = Column(Integer, default=0)
\ No newline at end of file
+    impact_count = Column(Integer, default=0)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "content": self.content,
+            "impact_count": self.impact_count,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Date, DateTime, Float, Index, UniqueConstraint
+from app.models import Base
+
+# 64-bit ids on Postgres; SQLite only auto-increments INTEGER PRIMARY KEY
+SampleId = BigInteger().with_variant(Integer, "sqlite")
+
+class SensorSample(Base):
+    """Append-only raw passive-sensor readings, keyed (user_id, day) for pruning and partitioning"""
+    __tablename__ = "sensor_samples"
+    
+    id = Column(SampleId, primary_key=True)
+    user_id = Column(String, nullable=False)  # Clerk ID
+    day = Column(Date, nullable=False)  # UTC day of recorded_at
+    metric = Column(String, nullable=False)  # heart_rate, steps, sleep, screen_time
+    recorded_at = Column(DateTime, nullable=False)  # UTC
+    value = Column(Float, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_sensor_samples_user_id_day_metric", user_id, day, metric),
+    )
+
+class SensorRollup(Base):
+    """Minute and hour aggregates of sensor_samples, merged on every ingest flush"""
+    __tablename__ = "sensor_rollups"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, nullable=False)  # Clerk ID
+    metric = Column(String, nullable=False)
+    resolution = Column(String, nullable=False)  # "minute" or "hour"
+    bucket_start = Column(DateTime, nullable=False)  # UTC
+    sample_count = Column(Integer, nullable=False)
+    value_sum = Column(Float, nullable=False)
+    value_min = Column(Float, nullable=False)
+    value_max = Column(Float, nullable=False)
+    
+    __table_args__ = (
+        UniqueConstraint("user_id", "metric", "resolution", "bucket_start", name="uq_sensor_rollups_bucket"),
+    )
+    
+    def to_dict(self):
+        return {
+            "metric": self.metric,
+            "resolution": self.resolution,
+            "bucket_start": self.bucket_start.isoformat() if self.bucket_start else None,
+            "count": self.sample_count,
+            "sum": self.value_sum,
+            "avg": self.value_sum / self.sample_count if self.sample_count else None,
+            "min": self.value_min,
+            "max": self.value_max
+        }
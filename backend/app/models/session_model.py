@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from . import Base
+from .types import Vector
 from datetime import datetime
 
 class Session(Base):
@@ -10,6 +11,22 @@ class Session(Base):
     input_type = Column(String)  # text, voice, gesture
     input_content = Column(Text)  # encrypted
     ai_response = Column(Text)  # encrypted
-    embedding = Column(String)  # JSON string for vector
+    embedding = Column(Vector())  # float32 bytes
     created_at = Column(DateTime, default=datetime.utcnow)
-    mood_score = Column(Integer, nullable=True)  # 1-10
\ No newline at end of file
+    mood_score = Column(Integer, nullable=True)  # 1-10
+
+    __table_args__ = (
+        Index("ix_sessions_user_id_created_at", user_id, created_at.desc()),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "input_type": self.input_type,
+            "input_content": self.input_content,
+            "ai_response": self.ai_response,
+            "embedding": self.embedding.tolist() if self.embedding is not None else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "mood_score": self.mood_score
+        }
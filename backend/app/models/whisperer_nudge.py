@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON
+from app.models import Base
+
+class WhispererNudge(Base):
+    """Latest Garden Whisperer pattern (and nudge, if needed) per user, refreshed by the background scan"""
+    __tablename__ = "whisperer_nudges"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, unique=True, index=True, nullable=False)  # Clerk ID
+    needs_intervention = Column(Boolean, default=False)
+    pattern_type = Column(String)
+    severity = Column(Integer, default=0)
+    pattern = Column(JSON)  # analyze_mood_pattern() output
+    nudge = Column(JSON, nullable=True)  # only when needs_intervention
+    last_echo_at = Column(DateTime(timezone=True), nullable=True)  # newest echo in the window
+    last_echo_id = Column(Integer, nullable=True)  # same echo; timestamps can tie within a second
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+    
+    def to_dict(self):
+        return {
+            "user_id": self.user_id,
+            "needs_intervention": self.needs_intervention,
+            "pattern_type": self.pattern_type,
+            "severity": self.severity,
+            "pattern": self.pattern,
+            "nudge": self.nudge,
+            "last_echo_at": self.last_echo_at.isoformat() if self.last_echo_at else None,
+            "last_echo_id": self.last_echo_id,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None
+        }
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, func, literal, union_all
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime, timedelta
@@ -9,7 +9,10 @@ from app.models.activity import (
     BreathingSession, JournalEntry, GratitudeEntry, 
     GroundingSession, ActivityStreak
 )
-from app.models.user_profile import UserProfile
+from app.core.rollups import record_activity, count_activities
+from app.core.pagination import paginate
+from app.core.cache import response_cache
+from app.core.profile_stats import add_gratitude, schedule_achievements
 
 router = APIRouter(prefix="/api/activities", tags=["activities"])
 
@@ -74,7 +77,9 @@ async def create_breathing_session(
         db.add(breathing_session)
         await db.flush()
         await db.refresh(breathing_session)
+        await record_activity(db, breathing_session.user_id, "breathing", breathing_session.completed_at)
         await db.commit()
+        await response_cache.invalidate_user(breathing_session.user_id)
         
         return {
             "success": True,
@@ -90,28 +95,22 @@ async def create_breathing_session(
 async def get_breathing_sessions(
     user_id: str,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get user's breathing session history"""
-    result = await db.execute(
-        select(BreathingSession)
-        .where(BreathingSession.user_id == user_id)
-        .order_by(desc(BreathingSession.completed_at))
-        .limit(limit)
-    )
-    sessions = result.scalars().all()
-    
-    count_result = await db.execute(
-        select(func.count())
-        .select_from(BreathingSession)
-        .where(BreathingSession.user_id == user_id)
+    """Get user's breathing session history (newest first; pass next_cursor back for older ones)"""
+    page = await paginate(
+        db, select(BreathingSession).where(BreathingSession.user_id == user_id),
+        BreathingSession.completed_at, BreathingSession.id, limit, cursor
     )
-    total = count_result.scalar()
-    
-    return {
-        "sessions": [s.to_dict() for s in sessions],
-        "total_sessions": total or 0
+    response = {
+        "sessions": [s.to_dict() for s in page.items],
+        "next_cursor": page.next_cursor
     }
+    if include_total:
+        response["total_sessions"] = await count_activities(db, user_id, "breathing")
+    return response
 
 
 # ==================== JOURNAL ENDPOINTS ====================
@@ -136,7 +135,9 @@ async def create_journal_entry(
         db.add(journal_entry)
         await db.flush()
         await db.refresh(journal_entry)
+        await record_activity(db, journal_entry.user_id, "journal", journal_entry.completed_at)
         await db.commit()
+        await response_cache.invalidate_user(journal_entry.user_id)
         
         return {
             "success": True,
@@ -153,28 +154,25 @@ async def get_journal_entries(
     user_id: str,
     category: Optional[str] = None,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get user's journal entries"""
+    """Get user's journal entries (newest first; pass next_cursor back for older ones)"""
     query = select(JournalEntry).where(JournalEntry.user_id == user_id)
     
     if category:
         query = query.where(JournalEntry.category == category)
     
-    query = query.order_by(desc(JournalEntry.completed_at)).limit(limit)
-    result = await db.execute(query)
-    entries = result.scalars().all()
-    
-    count_query = select(func.count()).select_from(JournalEntry).where(JournalEntry.user_id == user_id)
-    if category:
-        count_query = count_query.where(JournalEntry.category == category)
-    count_result = await db.execute(count_query)
-    total = count_result.scalar()
-    
-    return {
-        "entries": [e.to_dict() for e in entries],
-        "total_entries": total or 0
+    page = await paginate(db, query, JournalEntry.completed_at, JournalEntry.id, limit, cursor)
+    response = {
+        "entries": [e.to_dict() for e in page.items],
+        "next_cursor": page.next_cursor
     }
+    if include_total:
+        # Counters are kept per activity, not per category
+        response["total_entries"] = None if category else await count_activities(db, user_id, "journal")
+    return response
 
 
 # ==================== GRATITUDE ENDPOINTS ====================
@@ -194,18 +192,14 @@ async def create_gratitude_entry(
         db.add(gratitude_entry)
         await db.flush()
         await db.refresh(gratitude_entry)
+        await record_activity(db, gratitude_entry.user_id, "gratitude", gratitude_entry.completed_at)
         
         # Update gratitude count in profile
-        profile_result = await db.execute(
-            select(UserProfile).where(UserProfile.user_id == entry_data.user_id)
-        )
-        profile = profile_result.scalars().first()
-        if profile:
-            # Increment gratitude count (type: ignore needed for SQLAlchemy Column type hint)
-            current_count = profile.gratitude_count if profile.gratitude_count else 0  # type: ignore
-            profile.gratitude_count = current_count + len(entry_data.gratitudes)  # type: ignore
+        await add_gratitude(db, entry_data.user_id, len(entry_data.gratitudes))
         
         await db.commit()
+        await response_cache.invalidate_user(gratitude_entry.user_id)
+        schedule_achievements(gratitude_entry.user_id)
         
         return {
             "success": True,
@@ -221,28 +215,22 @@ async def create_gratitude_entry(
 async def get_gratitude_entries(
     user_id: str,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get user's gratitude entries"""
-    result = await db.execute(
-        select(GratitudeEntry)
-        .where(GratitudeEntry.user_id == user_id)
-        .order_by(desc(GratitudeEntry.completed_at))
-        .limit(limit)
-    )
-    entries = result.scalars().all()
-    
-    count_result = await db.execute(
-        select(func.count())
-        .select_from(GratitudeEntry)
-        .where(GratitudeEntry.user_id == user_id)
+    """Get user's gratitude entries (newest first; pass next_cursor back for older ones)"""
+    page = await paginate(
+        db, select(GratitudeEntry).where(GratitudeEntry.user_id == user_id),
+        GratitudeEntry.completed_at, GratitudeEntry.id, limit, cursor
     )
-    total = count_result.scalar()
-    
-    return {
-        "entries": [e.to_dict() for e in entries],
-        "total_entries": total or 0
+    response = {
+        "entries": [e.to_dict() for e in page.items],
+        "next_cursor": page.next_cursor
     }
+    if include_total:
+        response["total_entries"] = await count_activities(db, user_id, "gratitude")
+    return response
 
 
 # ==================== GROUNDING ENDPOINTS ====================
@@ -269,7 +257,9 @@ async def create_grounding_session(
         db.add(grounding_session)
         await db.flush()
         await db.refresh(grounding_session)
+        await record_activity(db, grounding_session.user_id, "grounding", grounding_session.completed_at)
         await db.commit()
+        await response_cache.invalidate_user(grounding_session.user_id)
         
         return {
             "success": True,
@@ -285,28 +275,22 @@ async def create_grounding_session(
 async def get_grounding_sessions(
     user_id: str,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get user's grounding sessions"""
-    result = await db.execute(
-        select(GroundingSession)
-        .where(GroundingSession.user_id == user_id)
-        .order_by(desc(GroundingSession.completed_at))
-        .limit(limit)
-    )
-    sessions = result.scalars().all()
-    
-    count_result = await db.execute(
-        select(func.count())
-        .select_from(GroundingSession)
-        .where(GroundingSession.user_id == user_id)
+    """Get user's grounding sessions (newest first; pass next_cursor back for older ones)"""
+    page = await paginate(
+        db, select(GroundingSession).where(GroundingSession.user_id == user_id),
+        GroundingSession.completed_at, GroundingSession.id, limit, cursor
     )
-    total = count_result.scalar()
-    
-    return {
-        "sessions": [s.to_dict() for s in sessions],
-        "total_sessions": total or 0
+    response = {
+        "sessions": [s.to_dict() for s in page.items],
+        "next_cursor": page.next_cursor
     }
+    if include_total:
+        response["total_sessions"] = await count_activities(db, user_id, "grounding")
+    return response
 
 
 # ==================== STATS ENDPOINTS ====================
@@ -314,62 +298,41 @@ async def get_grounding_sessions(
 @router.get("/stats/{user_id}")
 async def get_activity_stats(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get comprehensive activity statistics"""
+    return await response_cache.get_or_compute("activities.stats", user_id, lambda: build_activity_stats(user_id, db))
+
+
+async def build_activity_stats(user_id: str, db: AsyncSession) -> dict:
+    """Compute activity statistics (uncached)"""
     
-    # Get counts for each activity type
-    breathing_result = await db.execute(
-        select(func.count()).select_from(BreathingSession).where(BreathingSession.user_id == user_id)
-    )
-    breathing_count = breathing_result.scalar() or 0
-    
-    journal_result = await db.execute(
-        select(func.count()).select_from(JournalEntry).where(JournalEntry.user_id == user_id)
-    )
-    journal_count = journal_result.scalar() or 0
-    
-    gratitude_result = await db.execute(
-        select(func.count()).select_from(GratitudeEntry).where(GratitudeEntry.user_id == user_id)
-    )
-    gratitude_count = gratitude_result.scalar() or 0
-    
-    grounding_result = await db.execute(
-        select(func.count()).select_from(GroundingSession).where(GroundingSession.user_id == user_id)
-    )
-    grounding_count = grounding_result.scalar() or 0
-    
-    # Get this week's activity
+    # All-time and this-week counts for every activity type in one round trip
     week_ago = datetime.utcnow() - timedelta(days=7)
     
-    week_breathing = await db.execute(
-        select(func.count()).select_from(BreathingSession).where(
-            BreathingSession.user_id == user_id,
-            BreathingSession.completed_at >= week_ago
-        )
-    )
-    week_journal = await db.execute(
-        select(func.count()).select_from(JournalEntry).where(
-            JournalEntry.user_id == user_id,
-            JournalEntry.completed_at >= week_ago
-        )
-    )
-    week_gratitude = await db.execute(
-        select(func.count()).select_from(GratitudeEntry).where(
-            GratitudeEntry.user_id == user_id,
-            GratitudeEntry.completed_at >= week_ago
+    def activity_counts(model, activity_type: str):
+        return (
+            select(
+                literal(activity_type).label("activity_type"),
+                func.count().label("total"),
+                func.count().filter(model.completed_at >= week_ago).label("this_week")
+            )
+            .select_from(model)
+            .where(model.user_id == user_id)
         )
-    )
-    week_grounding = await db.execute(
-        select(func.count()).select_from(GroundingSession).where(
-            GroundingSession.user_id == user_id,
-            GroundingSession.completed_at >= week_ago
+    
+    result = await db.execute(
+        union_all(
+            activity_counts(BreathingSession, "breathing"),
+            activity_counts(JournalEntry, "journal"),
+            activity_counts(GratitudeEntry, "gratitude"),
+            activity_counts(GroundingSession, "grounding")
         )
     )
+    counts = {row.activity_type: row for row in result.all()}
     
-    this_week_count = (
-        (week_breathing.scalar() or 0) +
-        (week_journal.scalar() or 0) +
-        (week_gratitude.scalar() or 0) +
-        (week_grounding.scalar() or 0)
-    )
+    breathing_count = counts["breathing"].total or 0
+    journal_count = counts["journal"].total or 0
+    gratitude_count = counts["gratitude"].total or 0
+    grounding_count = counts["grounding"].total or 0
+    this_week_count = sum(row.this_week or 0 for row in counts.values())
     
     return {
         "total_activities": breathing_count + journal_count + gratitude_count + grounding_count,
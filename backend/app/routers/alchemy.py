@@ -4,23 +4,22 @@ Creative emotion fusion system for exploring complex emotional states
 """
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc
+from sqlalchemy import desc
 from datetime import datetime
 from typing import List, Dict, Optional
 from pydantic import BaseModel
-import google.generativeai as genai
-import os
-import json
 
 from app.core.database import get_db
+from app.core.llm import llm
+from app.core.llm_cache import llm_cache, parse_json_response
+from app.core.fusion_matrix import fusion_matrix
+from app.core.metrics import metrics
+from app.core.cache import response_cache
 from app.models.echo import Echo
 from app.models.user_profile import UserProfile
 
 router = APIRouter(prefix="/api/alchemy", tags=["alchemy"])
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
 
 class FusionRequest(BaseModel):
     user_id: str
@@ -54,18 +53,24 @@ EMOTION_PALETTE = [
     {"name": "Confusion", "color": "from-purple-500 to-gray-500", "description": "Foggy, uncertain, swirling"}
 ]
 
+# Case-insensitive lookup of canonical palette names
+PALETTE_NAMES = {emotion["name"].lower(): emotion["name"] for emotion in EMOTION_PALETTE}
+
 
-async def generate_emotion_fusion(emotion1: str, emotion2: str, user_context: Optional[Dict] = None) -> Dict:
+async def generate_emotion_fusion(emotion1: str, emotion2: str, user_context: Optional[Dict] = None,
+                                  use_cache: bool = True) -> Dict:
     """
     Uses Gemini to generate creative, therapeutic fusion of two emotions.
     This is Gestalt psychology meets emotional alchemy - exploring how emotions combine
     to create new, complex emotional states.
+    use_cache=False always calls the model and leaves llm_cache untouched (the
+    fusion-matrix job stores its results in emotion_fusions instead).
     """
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
     context_text = ""
     if user_context:
-        context_text = f"\n\nUSER CONTEXT:\n- Recent mood trend: {user_context.get('mood_trend', 'neutral')}\n- Common emotions: {', '.join(user_context.get('common_emotions', []))}"
+        context_text = f"\n\nUSER CONTEXT:\n- Recent mood trend: {user_context.get('mood_trend', 'neutral')}"
+        if user_context.get('common_emotions'):
+            context_text += f"\n- Common emotions: {', '.join(user_context['common_emotions'])}"
     
     prompt = f"""You are an emotional alchemy guide in the EchoBloom app's "Gestalt Greenhouse" - an experimental lab for exploring complex emotional states.
 
@@ -107,16 +112,11 @@ FORMAT AS JSON:
 Make it poetic, therapeutic, and deeply validating of emotional complexity. This is about honoring the full spectrum of human feeling."""
     
     try:
-        response = model.generate_content(prompt)
-        
-        # Parse response
-        response_text = response.text.strip()
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-        
-        fusion_data = json.loads(response_text)
+        if use_cache:
+            # Same pair + context always yields the same prompt, so serve repeats from the cache
+            fusion_data = await llm_cache.generate_json(prompt)
+        else:
+            fusion_data = parse_json_response(await llm.generate(prompt))
         
         return {
             "success": True,
@@ -161,12 +161,12 @@ async def fuse_emotions(
         try:
             # Get user's recent emotional patterns
             result = await db.execute(
-                select(Echo)
+                Echo.select_moods()
                 .where(Echo.user_id == request.user_id)
                 .order_by(desc(Echo.created_at))
                 .limit(10)
             )
-            recent_echoes = result.scalars().all()
+            recent_echoes = Echo.moods(result)
             
             if recent_echoes:
                 all_emotions = []
@@ -189,7 +189,21 @@ async def fuse_emotions(
         except Exception as e:
             print(f"Could not fetch user context: {e}")
         
-        # Generate fusion
+        # Palette pairs come from the precomputed matrix (python -m app.jobs.fusion_matrix)
+        palette_pair = [PALETTE_NAMES.get(emotion.strip().lower()) for emotion in (request.emotion1, request.emotion2)]
+        if all(palette_pair) and palette_pair[0] != palette_pair[1]:
+            fusion = await fusion_matrix.get(db, *palette_pair, user_context["mood_trend"] if user_context else None)
+            if fusion:
+                metrics.inc("alchemy.fusion_matrix.hit")
+                return {
+                    "success": True,
+                    "fusion": fusion,
+                    "emotions_used": [request.emotion1, request.emotion2],
+                    "created_at": datetime.utcnow().isoformat()
+                }
+        metrics.inc("alchemy.fusion_matrix.miss")
+        
+        # Off-palette emotions or a pair the warm-up job hasn't reached yet
         fusion_response = await generate_emotion_fusion(
             request.emotion1,
             request.emotion2,
@@ -225,99 +239,105 @@ async def get_suggested_emotion_pairs(
     Helps users explore tensions they might be experiencing.
     """
     try:
-        # Get recent echoes
-        result = await db.execute(
-            select(Echo)
-            .where(Echo.user_id == user_id)
-            .order_by(desc(Echo.created_at))
-            .limit(15)
+        return await response_cache.get_or_compute(
+            "alchemy.suggested_pairs", user_id, lambda: build_suggested_pairs(user_id, db)
         )
-        recent_echoes = result.scalars().all()
-        
-        if not recent_echoes:
-            return {
-                "suggested_pairs": [],
-                "message": "Plant some echoes to get personalized suggestions"
-            }
-        
-        # Extract emotions
-        all_emotions = []
-        for echo in recent_echoes:
-            all_emotions.extend(echo.emotion_tags)
-        
-        # Find most common emotions
-        from collections import Counter
-        emotion_counts = Counter(all_emotions)
-        top_emotions = [emotion for emotion, _ in emotion_counts.most_common(4)]
-        
-        # Generate suggested pairs based on common tensions
-        suggestions = []
-        
-        # Common emotional tensions to explore
-        if "Joy" in top_emotions and "Sadness" in top_emotions:
-            suggestions.append({
-                "emotion1": "Joy",
-                "emotion2": "Sadness",
-                "reason": "You've been experiencing both - explore how they coexist"
-            })
-        
-        if "Anger" in top_emotions and ("Sadness" in top_emotions or "Fear" in top_emotions):
-            suggestions.append({
-                "emotion1": "Anger",
-                "emotion2": "Sadness" if "Sadness" in top_emotions else "Fear",
-                "reason": "Anger often masks other feelings - discover what's beneath"
-            })
-        
-        if "Anxiety" in top_emotions and "Excitement" in top_emotions:
-            suggestions.append({
-                "emotion1": "Anxiety",
-                "emotion2": "Excitement",
-                "reason": "These feel similar physically - explore their edge"
-            })
-        
-        if "Gratitude" in top_emotions and any(e in top_emotions for e in ["Sadness", "Loneliness", "Grief"]):
-            sad_emotion = next((e for e in ["Sadness", "Loneliness", "Grief"] if e in top_emotions), "Sadness")
-            suggestions.append({
-                "emotion1": "Gratitude",
-                "emotion2": sad_emotion,
-                "reason": "Bittersweet moments hold both - name what you're feeling"
-            })
-        
-        if "Shame" in top_emotions and "Pride" in top_emotions:
-            suggestions.append({
-                "emotion1": "Shame",
-                "emotion2": "Pride",
-                "reason": "You're holding contradictory self-views - explore the tension"
-            })
-        
-        # If no specific tensions found, suggest based on most common emotion
-        if not suggestions and top_emotions:
-            most_common = top_emotions[0]
-            # Suggest pairing with a complementary emotion
-            complements = {
-                "Joy": "Sadness",
-                "Anger": "Curiosity",
-                "Fear": "Excitement",
-                "Sadness": "Gratitude",
-                "Anxiety": "Calm",
-                "Shame": "Pride"
-            }
-            
-            complement = complements.get(most_common, "Curiosity")
-            suggestions.append({
-                "emotion1": most_common,
-                "emotion2": complement,
-                "reason": f"You've been feeling {most_common.lower()} often - explore it through a different lens"
-            })
-        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get suggestions: {str(e)}")
+
+
+async def build_suggested_pairs(user_id: str, db: Session) -> Dict:
+    """Compute suggested pairs from the last 15 echoes (uncached)"""
+    # Get recent echoes
+    result = await db.execute(
+        Echo.select_moods()
+        .where(Echo.user_id == user_id)
+        .order_by(desc(Echo.created_at))
+        .limit(15)
+    )
+    recent_echoes = Echo.moods(result)
+    
+    if not recent_echoes:
         return {
-            "suggested_pairs": suggestions[:3],  # Return top 3
-            "based_on_emotions": top_emotions,
-            "message": "These pairings might resonate with your recent experiences"
+            "suggested_pairs": [],
+            "message": "Plant some echoes to get personalized suggestions"
         }
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get suggestions: {str(e)}")
+    # Extract emotions
+    all_emotions = []
+    for echo in recent_echoes:
+        all_emotions.extend(echo.emotion_tags)
+    
+    # Find most common emotions
+    from collections import Counter
+    emotion_counts = Counter(all_emotions)
+    top_emotions = [emotion for emotion, _ in emotion_counts.most_common(4)]
+    
+    # Generate suggested pairs based on common tensions
+    suggestions = []
+    
+    # Common emotional tensions to explore
+    if "Joy" in top_emotions and "Sadness" in top_emotions:
+        suggestions.append({
+            "emotion1": "Joy",
+            "emotion2": "Sadness",
+            "reason": "You've been experiencing both - explore how they coexist"
+        })
+    
+    if "Anger" in top_emotions and ("Sadness" in top_emotions or "Fear" in top_emotions):
+        suggestions.append({
+            "emotion1": "Anger",
+            "emotion2": "Sadness" if "Sadness" in top_emotions else "Fear",
+            "reason": "Anger often masks other feelings - discover what's beneath"
+        })
+    
+    if "Anxiety" in top_emotions and "Excitement" in top_emotions:
+        suggestions.append({
+            "emotion1": "Anxiety",
+            "emotion2": "Excitement",
+            "reason": "These feel similar physically - explore their edge"
+        })
+    
+    if "Gratitude" in top_emotions and any(e in top_emotions for e in ["Sadness", "Loneliness", "Grief"]):
+        sad_emotion = next((e for e in ["Sadness", "Loneliness", "Grief"] if e in top_emotions), "Sadness")
+        suggestions.append({
+            "emotion1": "Gratitude",
+            "emotion2": sad_emotion,
+            "reason": "Bittersweet moments hold both - name what you're feeling"
+        })
+    
+    if "Shame" in top_emotions and "Pride" in top_emotions:
+        suggestions.append({
+            "emotion1": "Shame",
+            "emotion2": "Pride",
+            "reason": "You're holding contradictory self-views - explore the tension"
+        })
+    
+    # If no specific tensions found, suggest based on most common emotion
+    if not suggestions and top_emotions:
+        most_common = top_emotions[0]
+        # Suggest pairing with a complementary emotion
+        complements = {
+            "Joy": "Sadness",
+            "Anger": "Curiosity",
+            "Fear": "Excitement",
+            "Sadness": "Gratitude",
+            "Anxiety": "Calm",
+            "Shame": "Pride"
+        }
+        
+        complement = complements.get(most_common, "Curiosity")
+        suggestions.append({
+            "emotion1": most_common,
+            "emotion2": complement,
+            "reason": f"You've been feeling {most_common.lower()} often - explore it through a different lens"
+        })
+    
+    return {
+        "suggested_pairs": suggestions[:3],  # Return top 3
+        "based_on_emotions": top_emotions,
+        "message": "These pairings might resonate with your recent experiences"
+    }
 
 
 @router.get("/fusion-history/{user_id}")
@@ -1,15 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
+from sqlalchemy import select
 from datetime import datetime, timedelta
 from typing import Dict, List
 from collections import Counter
 from app.core.database import get_db
-from app.models.echo import Echo
 from app.models.user_profile import UserProfile
-from app.models.activity import (
-    BreathingSession, JournalEntry, GratitudeEntry, GroundingSession
-)
+from app.core.rollups import get_rollups
+from app.core.cache import response_cache
+from app.core.mood_series import MoodSeries
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
@@ -24,6 +23,11 @@ async def get_user_analytics(user_id: str, db: AsyncSession = Depends(get_db)):
     - Wellness trajectory
     - AI-generated insights
     """
+    return await response_cache.get_or_compute("analytics", user_id, lambda: build_user_analytics(user_id, db))
+
+
+async def build_user_analytics(user_id: str, db: AsyncSession) -> Dict:
+    """Compute the analytics payload (uncached)"""
     
     # Get user profile
     profile_result = await db.execute(
@@ -41,30 +45,21 @@ async def get_user_analytics(user_id: str, db: AsyncSession = Depends(get_db)):
     
     # ==================== MOOD TRENDS ====================
     
-    # Get echoes for 30 days (for charts)
-    echoes_result = await db.execute(
-        select(Echo)
-        .where(Echo.user_id == user_id, Echo.created_at >= thirty_days_ago)
-        .order_by(Echo.created_at)
-    )
-    echoes = echoes_result.scalars().all()
-    
-    # Build daily mood data for charts
-    mood_by_day = {}
-    for echo in echoes:
-        day_key = echo.created_at.strftime('%Y-%m-%d')
-        if day_key not in mood_by_day:
-            mood_by_day[day_key] = []
-        mood_by_day[day_key].append(echo.mood_score)
+    # One read of the maintained daily rollups covers moods, emotions and activities
+    rollups = await get_rollups(db, user_id, thirty_days_ago.date())
+    daily_buckets = [
+        (rollup.day.isoformat(), rollup.mood_sum, rollup.mood_count)
+        for rollup in rollups if rollup.mood_count
+    ]
     
     # Calculate average mood per day
     mood_trend_30_days = [
         {
-            "date": day,
-            "mood_score": sum(scores) / len(scores),
-            "echo_count": len(scores)
+            "date": day_key,
+            "mood_score": mood_sum / count,
+            "echo_count": count
         }
-        for day, scores in sorted(mood_by_day.items())
+        for day_key, mood_sum, count in daily_buckets
     ]
     
     # Get 7-day trend
@@ -75,13 +70,10 @@ async def get_user_analytics(user_id: str, db: AsyncSession = Depends(get_db)):
     
     # ==================== EMOTION DISTRIBUTION ====================
     
-    # Collect all emotion tags from echoes
-    all_emotions = []
-    for echo in echoes:
-        if echo.emotion_tags is not None:  # type: ignore
-            all_emotions.extend(echo.emotion_tags)  # type: ignore
-    
-    emotion_counts = Counter(all_emotions)
+    # Merged in day order, so ties keep first-seen order as before
+    emotion_counts = Counter()
+    for rollup in rollups:
+        emotion_counts.update(rollup.emotion_counts or {})
     total_emotions = sum(emotion_counts.values())
     
     emotion_distribution = [
@@ -95,34 +87,10 @@ async def get_user_analytics(user_id: str, db: AsyncSession = Depends(get_db)):
     
     # ==================== ACTIVITY STATISTICS ====================
     
-    # Get activity counts
-    breathing_result = await db.execute(
-        select(func.count())
-        .select_from(BreathingSession)
-        .where(BreathingSession.user_id == user_id, BreathingSession.completed_at >= thirty_days_ago)
-    )
-    breathing_count = breathing_result.scalar() or 0
-    
-    journal_result = await db.execute(
-        select(func.count())
-        .select_from(JournalEntry)
-        .where(JournalEntry.user_id == user_id, JournalEntry.completed_at >= thirty_days_ago)
-    )
-    journal_count = journal_result.scalar() or 0
-    
-    gratitude_result = await db.execute(
-        select(func.count())
-        .select_from(GratitudeEntry)
-        .where(GratitudeEntry.user_id == user_id, GratitudeEntry.completed_at >= thirty_days_ago)
-    )
-    gratitude_count = gratitude_result.scalar() or 0
-    
-    grounding_result = await db.execute(
-        select(func.count())
-        .select_from(GroundingSession)
-        .where(GroundingSession.user_id == user_id, GroundingSession.completed_at >= thirty_days_ago)
-    )
-    grounding_count = grounding_result.scalar() or 0
+    breathing_count = sum(rollup.breathing_count or 0 for rollup in rollups)
+    journal_count = sum(rollup.journal_count or 0 for rollup in rollups)
+    gratitude_count = sum(rollup.gratitude_count or 0 for rollup in rollups)
+    grounding_count = sum(rollup.grounding_count or 0 for rollup in rollups)
     
     activity_stats = {
         "breathing": breathing_count,
@@ -134,21 +102,19 @@ async def get_user_analytics(user_id: str, db: AsyncSession = Depends(get_db)):
     
     # ==================== WELLNESS TRAJECTORY ====================
     
-    # Calculate weekly wellness scores
+    # Fold daily buckets into weeks: mean of (mood_score + 1) * 50 over the week's echoes
     wellness_by_week = {}
-    for echo in echoes:
-        week_key = echo.created_at.strftime('%Y-W%W')
-        if week_key not in wellness_by_week:
-            wellness_by_week[week_key] = []
-        # Simple wellness calculation: (mood_score + 1) * 50 to get 0-100 scale
-        wellness_by_week[week_key].append((echo.mood_score + 1) * 50)
+    for day_key, mood_sum, count in daily_buckets:
+        week_key = datetime.strptime(day_key, '%Y-%m-%d').strftime('%Y-W%W')
+        week_sum, week_count = wellness_by_week.get(week_key, (0.0, 0))
+        wellness_by_week[week_key] = (week_sum + (mood_sum + count) * 50, week_count + count)
     
     wellness_trajectory = [
         {
             "week": week,
-            "wellness_score": round(sum(scores) / len(scores), 1)
+            "wellness_score": round(week_sum / week_count, 1)
         }
-        for week, scores in sorted(wellness_by_week.items())
+        for week, (week_sum, week_count) in sorted(wellness_by_week.items())
     ]
     
     # ==================== AI-GENERATED INSIGHTS ====================
@@ -168,8 +134,9 @@ async def get_user_analytics(user_id: str, db: AsyncSession = Depends(get_db)):
     
     # Insight 3: Mood trend
     if len(mood_trend_7_days) >= 2:
-        recent_avg = sum(d["mood_score"] for d in mood_trend_7_days[-3:]) / 3
-        earlier_avg = sum(d["mood_score"] for d in mood_trend_7_days[:3]) / min(3, len(mood_trend_7_days))
+        daily_moods = MoodSeries.from_columns(d["mood_score"] for d in mood_trend_7_days)
+        recent_avg = daily_moods.slice_mean(-3)
+        earlier_avg = daily_moods.slice_mean(0, 3)
         if recent_avg > earlier_avg + 0.2:
             insights.append("Your mood has been improving over the past week - keep up the great work! 🌟")
         elif recent_avg < earlier_avg - 0.2:
@@ -183,7 +150,7 @@ async def get_user_analytics(user_id: str, db: AsyncSession = Depends(get_db)):
         insights.append(f"You're building momentum with a {current_streak}-day streak! Keep going!")
     
     # Insight 5: Echo count
-    echo_count = len(echoes)
+    echo_count = sum(count for _, _, count in daily_buckets)
     if echo_count >= 30:
         insights.append(f"You've created {echo_count} echoes this month - your garden is flourishing! 🌸")
     elif echo_count == 0:
@@ -7,13 +7,13 @@ from app.models.user_profile import UserProfile
 from pydantic import BaseModel
 import jwt
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.cache import response_cache
+from app.core.passwords import auth_admission, hash_password, verify_password
 from typing import Dict, Any
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = settings.secret_key
 
 class UserCreate(BaseModel):
@@ -36,7 +36,10 @@ def create_access_token(data: dict):
 
 @router.post("/register")
 async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
-    hashed_password = pwd_context.hash(user.password)
+    # Hand the pooled connection back while queueing for bcrypt; the session reconnects on use
+    await db.close()
+    async with auth_admission.slot():
+        hashed_password = await hash_password(user.password)
     new_user = User(email=user.email, password_hash=hashed_password)
     db.add(new_user)
     await db.commit()
@@ -46,7 +49,12 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
     result = await db.execute(User.__table__.select().where(User.email == user.email))
     db_user = result.fetchone()
-    if not db_user or not pwd_context.verify(user.password, db_user.password_hash):
+    if not db_user:
+        raise HTTPException(status_code=400, detail="Invalid credentials")
+    await db.close()  # don't hold a pooled connection while queueing for bcrypt
+    async with auth_admission.slot():
+        valid = await verify_password(user.password, db_user.password_hash)
+    if not valid:
         raise HTTPException(status_code=400, detail="Invalid credentials")
     access_token = create_access_token({"sub": str(db_user.id)})
     return {"access_token": access_token}
@@ -71,6 +79,7 @@ async def save_preferences(data: PreferencesUpdate, db: AsyncSession = Depends(g
             profile.ritual_preferences = data.preferences
         
         await db.commit()
+        await response_cache.invalidate_user(data.user_id)
         await db.refresh(profile)
         
         return {"message": "Preferences saved", "profile": profile.to_dict()}
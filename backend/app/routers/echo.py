@@ -1,23 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, desc
-from app.core.database import get_db
-from app.core.config import settings
+from sqlalchemy import select, func
+from app.core.database import get_db, async_session
 from app.models.echo import Echo
 from app.models.user_profile import UserProfile
-import google.generativeai as genai
+from app.core.llm import llm
+from app.core.keyword_matcher import KeywordMatcher
+from app.core.rollups import record_echo
+from app.core.cache import response_cache
+from app.core.dawn_predictions import mark_prediction_stale
+from app.core.concurrency import spawn
+from app.core.profile_stats import record_echo_stats, schedule_achievements, count_echoes
+from app.core.pagination import paginate
+from app.core.mood_state import mood_state
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime, timedelta
+import asyncio
 import random
 import json
 import re
 
 router = APIRouter()
 
-genai.configure(api_key=settings.gemini_api_key)
-model = genai.GenerativeModel('gemini-2.0-flash')
-
 class EchoRequest(BaseModel):
     input: str
     userId: Optional[str] = None
@@ -52,15 +58,27 @@ SEED_TYPES = {
     "growth": ["trying", "learning", "working", "practicing"]
 }
 
+# One compiled matcher covers both tables, so each echo is scanned once
+MOOD_MATCHER = KeywordMatcher({
+    **{("emotion", emotion): keywords for emotion, keywords in EMOTION_KEYWORDS.items()},
+    **{("seed", stype): keywords for stype, keywords in SEED_TYPES.items()}
+})
+
 def analyze_mood(text: str) -> tuple[float, List[str], str]:
     """Psychological mood analysis using NLP techniques"""
-    text_lower = text.lower()
+    return score_mood_hits(MOOD_MATCHER.find(text))
+
+def analyze_moods(texts: List[str]) -> List[tuple[float, List[str], str]]:
+    """Batch variant of analyze_mood for scoring many texts in one pass"""
+    return [score_mood_hits(hits) for hits in MOOD_MATCHER.find_many(texts)]
+
+def score_mood_hits(hits: set) -> tuple[float, List[str], str]:
     detected_emotions = []
     mood_score = 0.0
     
     # Detect emotions
-    for emotion, keywords in EMOTION_KEYWORDS.items():
-        if any(keyword in text_lower for keyword in keywords):
+    for emotion in EMOTION_KEYWORDS:
+        if ("emotion", emotion) in hits:
             detected_emotions.append(emotion)
             # Positive emotions increase score
             if emotion in ["joy", "calm", "hope", "gratitude"]:
@@ -71,8 +89,8 @@ def analyze_mood(text: str) -> tuple[float, List[str], str]:
     
     # Detect seed type
     seed_type = "reflection"  # default
-    for stype, keywords in SEED_TYPES.items():
-        if any(keyword in text_lower for keyword in keywords):
+    for stype in SEED_TYPES:
+        if ("seed", stype) in hits:
             seed_type = stype
             break
     
@@ -86,21 +104,12 @@ def analyze_mood(text: str) -> tuple[float, List[str], str]:
     
     return mood_score, detected_emotions[:3], seed_type  # Limit to 3 emotions
 
-@router.post("/echo", response_model=EchoResponse)
-async def create_echo(request: EchoRequest, db: AsyncSession = Depends(get_db)):
-    """Create new echo with AI response, mood analysis, and database persistence"""
-    
-    if not request.userId:
-        raise HTTPException(status_code=400, detail="User ID required")
-    
-    # Analyze mood using psychological framework
-    mood_score, emotion_tags, seed_type = analyze_mood(request.input)
-    
-    # Generate AI empathy response with psychological framing
-    prompt = f"""As an empathetic mental wellness guide trained in Cognitive Behavioral Therapy and positive psychology, 
+def build_echo_prompt(text: str, mood_score: float, emotion_tags: List[str]) -> str:
+    """Empathy prompt with psychological framing"""
+    return f"""As an empathetic mental wellness guide trained in Cognitive Behavioral Therapy and positive psychology, 
 respond to this reflection with deep empathy and validation. 
 
-User's reflection: "{request.input}"
+User's reflection: "{text}"
 Detected emotions: {', '.join(emotion_tags)}
 Mood context: {'positive' if mood_score > 0 else 'challenging' if mood_score < 0 else 'neutral'}
 
@@ -111,34 +120,132 @@ Provide a nurturing, validating response that:
 4. Keep it concise (2-3 sentences) and warm
 
 Response:"""
-    
-    try:
-        ai_response_obj = model.generate_content(prompt)
-        ai_response = ai_response_obj.text
-    except Exception as e:
-        print(f"Gemini API error: {e}")
-        # Psychologically-informed fallback responses
-        fallback_map = {
-            "anxiety": "I hear the worry in your words. Remember: anxiety is your mind trying to protect you, even if it feels overwhelming. You're safe in this moment. 🌱",
-            "joy": "Your joy is contagious and beautiful! Savor this moment—positive emotions are seeds for resilience. You deserve this happiness. ✨",
-            "depression": "I see you in your pain, and your feelings are completely valid. Even in darkness, you're showing courage by reaching out. One small step at a time. 💙",
-            "gratitude": "Gratitude is a powerful practice for the mind. By noticing the good, you're rewiring your brain for wellbeing. Beautiful work. 🌸",
-            "default": "Thank you for trusting me with these words. Your experience matters, and you're not alone in this garden. 🌿"
-        }
-        primary_emotion = emotion_tags[0] if emotion_tags else "default"
-        ai_response = fallback_map.get(primary_emotion, fallback_map["default"])
-    
-    # Determine growth stage based on mood and user activity
+
+def fallback_echo_response(emotion_tags: List[str]) -> str:
+    """Psychologically-informed fallback responses"""
+    fallback_map = {
+        "anxiety": "I hear the worry in your words. Remember: anxiety is your mind trying to protect you, even if it feels overwhelming. You're safe in this moment. 🌱",
+        "joy": "Your joy is contagious and beautiful! Savor this moment—positive emotions are seeds for resilience. You deserve this happiness. ✨",
+        "depression": "I see you in your pain, and your feelings are completely valid. Even in darkness, you're showing courage by reaching out. One small step at a time. 💙",
+        "gratitude": "Gratitude is a powerful practice for the mind. By noticing the good, you're rewiring your brain for wellbeing. Beautiful work. 🌸",
+        "default": "Thank you for trusting me with these words. Your experience matters, and you're not alone in this garden. 🌿"
+    }
+    primary_emotion = emotion_tags[0] if emotion_tags else "default"
+    return fallback_map.get(primary_emotion, fallback_map["default"])
+
+def growth_stage_for(mood_score: float) -> int:
+    """Determine growth stage based on mood"""
     growth_stage = 1  # seed
     if mood_score > 0.3:
         growth_stage = 3  # bloom (positive mood)
     elif mood_score > 0:
         growth_stage = 2  # sprout (neutral-positive)
+    return growth_stage
+
+@router.post("/echo", response_model=EchoResponse)
+async def create_echo(request: EchoRequest, db: AsyncSession = Depends(get_db)):
+    """Create new echo with AI response, mood analysis, and database persistence"""
+    
+    if not request.userId:
+        raise HTTPException(status_code=400, detail="User ID required")
+    
+    # Analyze mood using psychological framework
+    mood_score, emotion_tags, seed_type = analyze_mood(request.input)
+    
+    # Generate AI empathy response with psychological framing
+    try:
+        ai_response = await llm.generate(build_echo_prompt(request.input, mood_score, emotion_tags))
+    except Exception as e:
+        print(f"Gemini API error: {e}")
+        ai_response = fallback_echo_response(emotion_tags)
+    
+    return await save_echo(
+        db, request.userId, request.input, ai_response,
+        mood_score, emotion_tags, seed_type, growth_stage_for(mood_score)
+    )
+
+@router.post("/echo/stream")
+async def stream_echo(request: EchoRequest):
+    """
+    Streaming variant of /echo, as NDJSON lines:
+    {"type": "analysis", ...} straight away, {"type": "token", "text": ...} as the
+    response is generated, then {"type": "done", ...} with the saved echo
+    (same fields as /echo) or {"type": "error", "detail": ...}.
+    """
+    if not request.userId:
+        raise HTTPException(status_code=400, detail="User ID required")
+    
+    mood_score, emotion_tags, seed_type = analyze_mood(request.input)
+    return StreamingResponse(
+        echo_events(request.userId, request.input, mood_score, emotion_tags, seed_type),
+        media_type="application/x-ndjson"
+    )
+
+def ndjson_line(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
+
+async def echo_events(user_id: str, text: str, mood_score: float, emotion_tags: List[str], seed_type: str):
+    growth_stage = growth_stage_for(mood_score)
+    yield ndjson_line({
+        "type": "analysis",
+        "mood_score": mood_score,
+        "emotion_tags": emotion_tags,
+        "seed_type": seed_type,
+        "growth_stage": growth_stage
+    })
+    
+    chunks: List[str] = []
+    save_task = None
+    try:
+        try:
+            async for chunk in llm.stream(build_echo_prompt(text, mood_score, emotion_tags)):
+                chunks.append(chunk)
+                yield ndjson_line({"type": "token", "text": chunk})
+        except Exception as e:
+            print(f"Gemini API error: {e}")
+            if not chunks:
+                chunks.append(fallback_echo_response(emotion_tags))
+                yield ndjson_line({"type": "token", "text": chunks[0]})
+        
+        # Shielded so the echo is still saved if the client goes away meanwhile
+        save_task = save_echo_in_background(user_id, text, "".join(chunks), mood_score, emotion_tags, seed_type, growth_stage)
+        try:
+            saved = await asyncio.shield(save_task)
+        except Exception as e:
+            yield ndjson_line({"type": "error", "detail": f"Echo creation failed: {str(e)}"})
+            return
+        yield ndjson_line({"type": "done", **saved.model_dump()})
+    finally:
+        if save_task is None:
+            # Client disconnected mid-generation: keep what was written so far
+            save_echo_in_background(
+                user_id, text, "".join(chunks) or fallback_echo_response(emotion_tags),
+                mood_score, emotion_tags, seed_type, growth_stage
+            )
+
+def save_echo_in_background(*args) -> asyncio.Task:
+    """save_echo on its own session, outliving the request that started it"""
+    async def run():
+        async with async_session() as db:
+            return await save_echo(db, *args)
     
+    return spawn(run())
+
+async def save_echo(
+    db: AsyncSession,
+    user_id: str,
+    text: str,
+    ai_response: str,
+    mood_score: float,
+    emotion_tags: List[str],
+    seed_type: str,
+    growth_stage: int
+) -> EchoResponse:
+    """Persist the echo and profile stats, commit, and build the response"""
     # Save to database
     echo = Echo(
-        user_id=request.userId,
-        content=request.input,
+        user_id=user_id,
+        content=text,
         ai_response=ai_response,
         mood_score=mood_score,
         emotion_tags=emotion_tags,
@@ -146,60 +253,29 @@ Response:"""
         growth_stage=growth_stage
     )
     db.add(echo)
+    await db.flush()
+    await db.refresh(echo, ["created_at"])
     
-    # Update user profile stats
-    profile_result = await db.execute(
-        select(UserProfile).where(UserProfile.user_id == request.userId)
-    )
-    profile = profile_result.scalar_one_or_none()
+    # Keep the per-day rollup in step with the raw echo; Dawn Weave predictions need a recompute
+    await record_echo(db, user_id, echo.created_at, mood_score, emotion_tags)
+    await mark_prediction_stale(db, user_id)
     
-    if not profile:
-        # Create new profile
-        profile = UserProfile(
-            user_id=request.userId,
-            total_echoes=1,
-            current_streak=1,
-            longest_streak=1,
-            mood_average=mood_score,
-            wellness_score=50 + int(mood_score * 20)
-        )
-        db.add(profile)
-    else:
-        # Update existing profile
-        profile.total_echoes += 1
-        profile.monthly_reflections += 1
-        if seed_type == "gratitude":
-            profile.gratitude_count += 1
-        
-        # Update mood average (running average)
-        profile.mood_average = (profile.mood_average * (profile.total_echoes - 1) + mood_score) / profile.total_echoes
-        
-        # Update wellness score (0-100 scale)
-        profile.wellness_score = max(0, min(100, 50 + int(profile.mood_average * 30) + profile.current_streak * 2))
-        
-        # Check for achievements
-        new_achievements = []
-        if profile.total_echoes == 1 and "first_bloom" not in (profile.achievements or []):
-            new_achievements.append("first_bloom")
-        if profile.total_echoes == 7 and "week_warrior" not in (profile.achievements or []):
-            new_achievements.append("week_warrior")
-        if profile.gratitude_count >= 5 and "gratitude_guru" not in (profile.achievements or []):
-            new_achievements.append("gratitude_guru")
-        
-        if new_achievements:
-            profile.achievements = (profile.achievements or []) + new_achievements
+    # Atomic counter updates; achievements are awarded after the commit
+    stats = await record_echo_stats(db, user_id, mood_score, seed_type)
     
     await db.commit()
+    await response_cache.invalidate_user(user_id)
+    await mood_state.record(user_id, echo.id, mood_score, emotion_tags, echo.created_at)
+    schedule_achievements(user_id)
     await db.refresh(echo)
-    await db.refresh(profile)
     
     # Generate wellness insights
     wellness_insights = {
         "mood_trend": "improving" if mood_score > 0 else "needs_attention" if mood_score < -0.3 else "stable",
         "dominant_emotion": emotion_tags[0] if emotion_tags else "neutral",
-        "wellness_score": profile.wellness_score,
-        "streak": profile.current_streak,
-        "total_reflections": profile.total_echoes,
+        "wellness_score": stats["wellness_score"],
+        "streak": stats["current_streak"],
+        "total_reflections": stats["total_echoes"],
         "suggestion": generate_wellness_suggestion(emotion_tags, mood_score)
     }
     
@@ -282,20 +358,27 @@ def generate_wellness_suggestion(emotions: List[str], mood_score: float) -> str:
         return suggestions[hash(str(emotions)) % len(suggestions)]
 
 @router.get("/echoes/{user_id}")
-async def get_user_echoes(user_id: str, db: AsyncSession = Depends(get_db), limit: int = 20):
-    """Get user's echo history with psychological insights"""
-    result = await db.execute(
-        select(Echo)
-        .where(Echo.user_id == user_id)
-        .order_by(desc(Echo.created_at))
-        .limit(limit)
-    )
-    echoes = result.scalars().all()
-    return {"echoes": [echo.to_dict() for echo in echoes]}
+async def get_user_echoes(
+    user_id: str,
+    db: AsyncSession = Depends(get_db),
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+):
+    """Get user's echo history with psychological insights (newest first; pass next_cursor back for older echoes)"""
+    page = await paginate(db, select(Echo).where(Echo.user_id == user_id), Echo.created_at, Echo.id, limit, cursor)
+    response = {"echoes": [echo.to_dict() for echo in page.items], "next_cursor": page.next_cursor}
+    if include_total:
+        response["total_echoes"] = await count_echoes(db, user_id)
+    return response
 
 @router.get("/profile/{user_id}")
 async def get_user_profile(user_id: str, db: AsyncSession = Depends(get_db)):
     """Get comprehensive user wellness profile"""
+    return await response_cache.get_or_compute("profile", user_id, lambda: build_user_profile(user_id, db))
+
+async def build_user_profile(user_id: str, db: AsyncSession) -> dict:
+    """Compute the profile payload (uncached)"""
     result = await db.execute(
         select(UserProfile).where(UserProfile.user_id == user_id)
     )
@@ -312,16 +395,19 @@ async def get_user_profile(user_id: str, db: AsyncSession = Depends(get_db)):
             "message": "Start planting your first echo to begin your wellness journey!"
         }
     
-    # Get mood trend (last 7 days)
+    # Get mood trend (last 7 days), from the in-memory window unless the week outgrew it
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
-    recent_echoes_result = await db.execute(
-        select(Echo)
-        .where(Echo.user_id == user_id, Echo.created_at >= seven_days_ago)
-        .order_by(Echo.created_at)
-    )
-    recent_echoes = recent_echoes_result.scalars().all()
-    
-    mood_trend = [echo.mood_score for echo in recent_echoes]
+    window = await mood_state.window(db, user_id)
+    recent_points = window.since(seven_days_ago)
+    if recent_points is not None:
+        mood_trend = [point.mood_score for point in recent_points]
+    else:
+        recent_echoes_result = await db.execute(
+            select(Echo.mood_score)
+            .where(Echo.user_id == user_id, Echo.created_at >= seven_days_ago)
+            .order_by(Echo.created_at, Echo.id)
+        )
+        mood_trend = list(recent_echoes_result.scalars().all())
     
     return {
         **profile.to_dict(),
@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """Latency percentiles, in-flight gauges and counters for this worker"""
+    return metrics.snapshot()
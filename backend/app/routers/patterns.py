@@ -2,43 +2,40 @@
 Dawn Weaves - Predictive mood alerts with AI-generated shield stories
 Analyzes historical patterns to forecast challenging days and provides proactive support
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from collections import defaultdict
-import google.generativeai as genai
-import os
+from typing import List, Dict, Optional, Tuple
+from functools import partial
 
-from app.core.database import get_db
+from app.core.concurrency import Branch, fan_out
+from app.core.config import settings
+from app.core.database import async_session, get_db
+from app.core.dawn_predictions import (
+    load_prediction, save_prediction, load_shield_stories, save_shield_story, iso_week, PATTERN_WINDOW_DAYS
+)
+from app.core.llm import llm
+from app.core.metrics import metrics
+from app.core.mood_series import MoodSeries, naive_utc
 from app.models.echo import Echo
 from app.models.user_profile import UserProfile
 
 router = APIRouter(prefix="/api/patterns", tags=["patterns"])
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
-def analyze_day_of_week_patterns(echoes: List[Echo]) -> Dict:
+def analyze_day_of_week_patterns(series: MoodSeries) -> Dict:
     """Analyze historical mood patterns by day of week"""
-    # Group echoes by day of week
-    day_moods = defaultdict(list)
-    
-    for echo in echoes:
-        day_name = echo.created_at.strftime('%A')  # Monday, Tuesday, etc.
-        day_moods[day_name].append(echo.mood_score)
-    
-    # Calculate average mood for each day
-    day_averages = {}
-    for day, scores in day_moods.items():
-        if len(scores) >= 2:  # Need at least 2 data points
-            day_averages[day] = {
-                'avg_mood': sum(scores) / len(scores),
-                'count': len(scores),
-                'min_mood': min(scores),
-                'max_mood': max(scores)
-            }
+    # Average mood for each day (Monday, Tuesday, etc.)
+    day_averages = {
+        day: {
+            'avg_mood': stats.mean,
+            'count': stats.count,
+            'min_mood': stats.min,
+            'max_mood': stats.max
+        }
+        for day, stats in series.weekday_stats().items()
+        if stats.count >= 2  # Need at least 2 data points
+    }
     
     # Find days with consistently low mood (avg < -0.1)
     challenging_days = []
@@ -75,10 +72,44 @@ def get_next_occurrence(day_name: str) -> datetime:
     next_date = today + timedelta(days=days_ahead)
     return next_date
 
+def fallback_shield_story(day: str, mood_context: Dict, error: BaseException) -> Dict:
+    """Fallback shield story when Gemini fails or times out"""
+    confidence = mood_context.get('confidence', 0)
+    next_date = get_next_occurrence(day)
+    
+    return {
+        "success": False,
+        "shield_story": {
+            "title": f"Dawn Weave for {day}",
+            "story": f"I've noticed {day}s tend to be heavier for you. That's not a weakness—it's wisdom your body is sharing. This {day}, you have permission to move slower, rest deeper, and ask for what you need. Your garden doesn't judge the clouds; it knows every season has purpose.",
+            "micro_rituals": [
+                {
+                    "time": "morning",
+                    "action": "Start your day 10 minutes earlier for gentle stretching",
+                    "why": "Eases tension before the day begins"
+                },
+                {
+                    "time": "afternoon",
+                    "action": "Step outside for 3 deep breaths of fresh air",
+                    "why": "Resets your nervous system mid-day"
+                },
+                {
+                    "time": "evening",
+                    "action": "Write down one thing that didn't go wrong",
+                    "why": "Shifts focus to resilience over struggle"
+                }
+            ],
+            "affirmation": f"I am allowed to have hard {day}s, and I'm learning to hold myself through them.",
+            "metaphor": "Even the dawn takes time to unfold—first a whisper of light, then a full bloom of sky."
+        },
+        "predicted_day": day,
+        "next_date": next_date.isoformat(),
+        "confidence": confidence,
+        "error": str(error)
+    }
+
 async def generate_shield_story(day: str, mood_context: Dict, user_profile: UserProfile) -> Dict:
     """Generate empowering shield story using Gemini"""
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
     avg_mood = mood_context.get('avg_mood', 0)
     confidence = mood_context.get('confidence', 0)
     next_date = get_next_occurrence(day)
@@ -120,11 +151,11 @@ FORMAT AS JSON:
 Keep it brief, actionable, and deeply empathetic."""
     
     try:
-        response = model.generate_content(prompt)
+        response_text = await llm.generate(prompt)
         
         # Parse response
         import json
-        response_text = response.text.strip()
+        response_text = response_text.strip()
         if "```json" in response_text:
             response_text = response_text.split("```json")[1].split("```")[0].strip()
         elif "```" in response_text:
@@ -141,78 +172,103 @@ Keep it brief, actionable, and deeply empathetic."""
         }
     
     except Exception as e:
-        # Fallback shield story
-        return {
-            "success": False,
-            "shield_story": {
-                "title": f"Dawn Weave for {day}",
-                "story": f"I've noticed {day}s tend to be heavier for you. That's not a weakness—it's wisdom your body is sharing. This {day}, you have permission to move slower, rest deeper, and ask for what you need. Your garden doesn't judge the clouds; it knows every season has purpose.",
-                "micro_rituals": [
-                    {
-                        "time": "morning",
-                        "action": "Start your day 10 minutes earlier for gentle stretching",
-                        "why": "Eases tension before the day begins"
-                    },
-                    {
-                        "time": "afternoon",
-                        "action": "Step outside for 3 deep breaths of fresh air",
-                        "why": "Resets your nervous system mid-day"
-                    },
-                    {
-                        "time": "evening",
-                        "action": "Write down one thing that didn't go wrong",
-                        "why": "Shifts focus to resilience over struggle"
-                    }
-                ],
-                "affirmation": f"I am allowed to have hard {day}s, and I'm learning to hold myself through them.",
-                "metaphor": "Even the dawn takes time to unfold—first a whisper of light, then a full bloom of sky."
-            },
-            "predicted_day": day,
-            "next_date": next_date.isoformat(),
-            "confidence": confidence,
-            "error": str(e)
+        return fallback_shield_story(day, mood_context, e)
+
+async def load_pattern_analysis(db: Session, user_id: str) -> Tuple[int, Optional[Dict]]:
+    """
+    (echo_count, pattern_analysis) from the stored prediction; the 60-day
+    scan only reruns after a new echo or when the week rolls over.
+    """
+    stored = await load_prediction(db, user_id)
+    if stored:
+        metrics.inc("dawn.prediction.hit")
+        return stored.echo_count, stored.pattern_analysis
+    metrics.inc("dawn.prediction.miss")
+    
+    # Fetch historical echoes (last 60 days minimum for pattern detection)
+    sixty_days_ago = datetime.utcnow() - timedelta(days=PATTERN_WINDOW_DAYS)
+    
+    # Only the columns the analysis reads, straight into arrays (plus ids to date the result)
+    result = await db.execute(
+        select(Echo.id, Echo.mood_score, Echo.created_at)
+        .where(and_(
+            Echo.user_id == user_id,
+            Echo.created_at >= sixty_days_ago
+        ))
+    )
+    echoes = result.all()
+    
+    # Need at least 14 echoes for meaningful patterns
+    pattern_analysis = analyze_day_of_week_patterns(MoodSeries.from_echoes(echoes)) if len(echoes) >= 14 else None
+    newest = max(echoes, key=lambda echo: (naive_utc(echo.created_at), echo.id), default=None)
+    await save_prediction(db, user_id, len(echoes), pattern_analysis, newest.id if newest else None)
+    await db.commit()
+    return len(echoes), pattern_analysis
+
+async def get_shield_stories(db: Session, user_id: str, challenging_days: List[Dict], request: Optional[Request] = None) -> List[Dict]:
+    """
+    Shield stories for the given days; only those not stored for that week are
+    generated, concurrently. Closes db before the model calls and stores the
+    new stories in a short session of its own.
+    """
+    keys = [(day['day'], iso_week(get_next_occurrence(day['day']))) for day in challenging_days]
+    stories = await load_shield_stories(db, user_id, keys)
+    missing = [(day, key) for day, key in zip(challenging_days, keys) if key not in stories]
+    
+    if missing:
+        profile_result = await db.execute(
+            select(UserProfile).where(UserProfile.user_id == user_id)
+        )
+        profile = profile_result.scalar_one_or_none()
+        
+        if not profile:
+            raise HTTPException(status_code=404, detail="User profile not found")
+        await db.close()  # don't hold a pooled connection across the Gemini calls
+        
+        generated = await fan_out(*(
+            Branch(
+                run=partial(generate_shield_story, day['day'], day, profile),
+                timeout=settings.llm_timeout_seconds,
+                fallback=partial(fallback_shield_story, day['day'], day)
+            )
+            for day, _ in missing
+        ), request=request)
+        async with async_session() as write_db:
+            for (_, key), story in zip(missing, generated):
+                if story["success"]:  # fallbacks are retried next time
+                    await save_shield_story(write_db, user_id, key[0], key[1], story)
+                stories[key] = story
+            await write_db.commit()
+    
+    # Dates and confidence always reflect today and the current analysis
+    return [
+        {
+            **stories[key],
+            "next_date": get_next_occurrence(day['day']).isoformat(),
+            "confidence": day['confidence']
         }
+        for day, key in zip(challenging_days, keys)
+    ]
 
 @router.post("/predict")
 async def predict_challenging_days(
     user_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Predict challenging days based on historical patterns"""
     try:
-        # Fetch historical echoes (last 60 days minimum for pattern detection)
-        sixty_days_ago = datetime.utcnow() - timedelta(days=60)
-        
-        result = await db.execute(
-            select(Echo)
-            .where(and_(
-                Echo.user_id == user_id,
-                Echo.created_at >= sixty_days_ago
-            ))
-        )
-        echoes = result.scalars().all()
+        echo_count, pattern_analysis = await load_pattern_analysis(db, user_id)
         
         # Need at least 14 echoes for meaningful patterns
-        if len(echoes) < 14:
+        if echo_count < 14:
             return {
                 "has_predictions": False,
                 "message": "Keep planting echoes! We need at least 2 weeks of data to detect patterns.",
-                "echoes_count": len(echoes),
+                "echoes_count": echo_count,
                 "min_required": 14
             }
         
-        # Fetch user profile
-        profile_result = await db.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
-        )
-        profile = profile_result.scalar_one_or_none()
-        
-        if not profile:
-            raise HTTPException(status_code=404, detail="User profile not found")
-        
-        # Analyze patterns
-        pattern_analysis = analyze_day_of_week_patterns(list(echoes))
-        
         if not pattern_analysis['has_patterns']:
             return {
                 "has_predictions": False,
@@ -220,15 +276,8 @@ async def predict_challenging_days(
                 "day_patterns": pattern_analysis['day_patterns']
             }
         
-        # Generate shield stories for top 2 challenging days
-        predictions = []
-        for challenging_day in pattern_analysis['challenging_days'][:2]:
-            story_response = await generate_shield_story(
-                challenging_day['day'],
-                challenging_day,
-                profile
-            )
-            predictions.append(story_response)
+        # Shield stories for top 2 challenging days
+        predictions = await get_shield_stories(db, user_id, pattern_analysis['challenging_days'][:2], request)
         
         return {
             "has_predictions": True,
@@ -243,12 +292,13 @@ async def predict_challenging_days(
 @router.get("/dawn-drawer/{user_id}")
 async def get_dawn_drawer_alerts(
     user_id: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """Get upcoming dawn weaves for the next 7 days"""
     try:
         # Get predictions
-        predictions_response = await predict_challenging_days(user_id, db)
+        predictions_response = await predict_challenging_days(user_id, request, db)
         
         if not predictions_response.get('has_predictions'):
             return {
@@ -1,12 +1,35 @@
-from fastapi import APIRouter
-from qdrant_client import QdrantClient
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.embeddings import embed_texts
+from app.core.vector_search import seed_search
+from app.models.seed import Seed
 
 router = APIRouter()
 
-client = QdrantClient("http://localhost:6333")
-
 @router.get("/search-seeds")
-async def search_seeds(query: str):
-    # Vector search in Qdrant
-    results = client.search("seeds", query_vector=[0.1]*384, limit=10)  # Placeholder
-    return results
\ No newline at end of file
+async def search_seeds(query: str, limit: int = 10, db: AsyncSession = Depends(get_db)):
+    """Seeds ranked by semantic similarity to the query"""
+    if not query.strip():
+        raise HTTPException(status_code=400, detail="Query required")
+    limit = max(1, min(limit, 50))
+    
+    try:
+        vectors = await embed_texts([query])
+        hits, source = await seed_search.search(db, vectors[0], limit)
+        
+        result = await db.execute(select(Seed).where(Seed.id.in_([seed_id for seed_id, _ in hits])))
+        seeds = {seed.id: seed for seed in result.scalars().all()}
+        
+        return {
+            "query": query,
+            "results": [
+                {**seeds[seed_id].to_dict(), "score": round(score, 4)}
+                for seed_id, score in hits
+                if seed_id in seeds  # index can briefly lag a deleted seed
+            ],
+            "source": source
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Seed search failed: {str(e)}")
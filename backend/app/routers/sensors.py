@@ -1,8 +1,62 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Literal
+from datetime import datetime, timedelta, timezone
+from app.core.config import settings
+from app.core.database import get_db
+from app.core.sensor_ingest import sensor_ingest
+from app.models.sensor import SensorRollup
 
 router = APIRouter()
 
-@router.post("/sensors")
-async def receive_sensor_data(data: dict):
-    # Process passive sensor data
-    return {"message": "Sensor data received"}
\ No newline at end of file
+SensorMetric = Literal["heart_rate", "steps", "sleep", "screen_time"]
+
+class SensorSampleIn(BaseModel):
+    metric: SensorMetric
+    recorded_at: datetime  # naive timestamps are taken as UTC
+    value: float = Field(ge=0)  # bpm, steps, minutes asleep, seconds of screen time
+
+class SensorBatch(BaseModel):
+    user_id: str
+    samples: List[SensorSampleIn] = Field(min_length=1, max_length=settings.sensor_max_batch_samples)
+
+def as_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+@router.post("/sensors", status_code=202)
+async def receive_sensor_data(batch: SensorBatch):
+    """Accept a batch of passive sensor samples; they are written asynchronously"""
+    rows = [(batch.user_id, sample.metric, as_utc(sample.recorded_at), sample.value) for sample in batch.samples]
+    if not sensor_ingest.submit(rows):
+        raise HTTPException(
+            status_code=429,
+            detail="Sensor ingestion is busy, retry later",
+            headers={"Retry-After": str(settings.sensor_retry_after_seconds)}
+        )
+    return {"message": "Sensor data received", "accepted": len(rows)}
+
+@router.get("/sensors/{user_id}/rollups")
+async def get_sensor_rollups(
+    user_id: str,
+    metric: SensorMetric,
+    resolution: Literal["minute", "hour"] = "hour",
+    hours: int = 24,
+    db: AsyncSession = Depends(get_db)
+):
+    """Downsampled sensor history for the last `hours` hours"""
+    since = datetime.utcnow() - timedelta(hours=max(1, min(hours, 24 * 31)))
+    result = await db.execute(
+        select(SensorRollup)
+        .where(
+            SensorRollup.user_id == user_id,
+            SensorRollup.metric == metric,
+            SensorRollup.resolution == resolution,
+            SensorRollup.bucket_start >= since
+        )
+        .order_by(SensorRollup.bucket_start)
+    )
+    return {"rollups": [rollup.to_dict() for rollup in result.scalars().all()]}
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from app.core.database import get_db
+from app.core.pagination import paginate
 from app.models.session_model import Session
 from pydantic import BaseModel
+from typing import Optional
 
 router = APIRouter()
 
@@ -20,6 +23,11 @@ async def create_session(session: SessionCreate, db: AsyncSession = Depends(get_
     return new_session
 
 @router.get("/sessions/{user_id}")
-async def get_sessions(user_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(Session.__table__.select().where(Session.user_id == user_id))
-    return result.fetchall()
\ No newline at end of file
+async def get_sessions(
+    user_id: int,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    page = await paginate(db, select(Session).where(Session.user_id == user_id), Session.created_at, Session.id, limit, cursor)
+    return {"sessions": [s.to_dict() for s in page.items], "next_cursor": page.next_cursor}
\ No newline at end of file
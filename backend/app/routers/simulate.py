@@ -2,31 +2,31 @@
 Foresight Florals - Future-Self Simulations
 What-if scenarios showing potential garden states based on user choices
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import select, desc
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from functools import partial
 from pydantic import BaseModel
-import google.generativeai as genai
-import os
 
+from app.core.concurrency import Branch, fan_out, fetch_all, fetch_one, fetch_rows
+from app.core.config import settings
 from app.core.database import get_db
-from app.models.echo import Echo
+from app.core.llm import llm
+from app.core.mood_series import MoodSeries
+from app.models.echo import Echo, EchoMood
 from app.models.user_profile import UserProfile
 from app.models.activity import BreathingSession, JournalEntry, GratitudeEntry, GroundingSession
 
 router = APIRouter(prefix="/api/simulate", tags=["simulate"])
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
 class SimulationRequest(BaseModel):
     user_id: str
     what_if_scenario: str  # e.g., "I start journaling daily", "I stop activities"
     timeframe_days: int = 30
 
-def calculate_current_trajectory(echoes: List[Echo], activities: List) -> Dict:
+def calculate_current_trajectory(echoes: List[EchoMood], activities: List) -> Dict:
     """Analyze current patterns to establish baseline trajectory"""
     if not echoes:
         return {
@@ -36,10 +36,13 @@ def calculate_current_trajectory(echoes: List[Echo], activities: List) -> Dict:
         }
     
     recent_echoes = echoes[:14]  # Last 2 weeks
-    older_echoes = echoes[14:28] if len(echoes) > 14 else []
     
-    recent_avg = sum(e.mood_score for e in recent_echoes) / len(recent_echoes)
-    older_avg = sum(e.mood_score for e in older_echoes) / len(older_echoes) if older_echoes else recent_avg
+    recent_avg = MoodSeries.from_echoes(recent_echoes).slice_mean()
+    if recent_avg is None:
+        recent_avg = 0.0
+    older_avg = MoodSeries.from_echoes(echoes[14:28]).slice_mean()
+    if older_avg is None:
+        older_avg = recent_avg
     
     trend = "improving" if recent_avg > older_avg + 0.1 else "declining" if recent_avg < older_avg - 0.1 else "stable"
     
@@ -54,14 +57,68 @@ def calculate_current_trajectory(echoes: List[Echo], activities: List) -> Dict:
         "consistency": len(recent_echoes) / 14  # Consistency score
     }
 
+def fallback_simulations(what_if: str, current_state: Dict, error: BaseException) -> Dict:
+    """Fallback simulations when Gemini fails or times out"""
+    return {
+        "success": False,
+        "simulations": {
+            "scenarios": [
+                {
+                    "type": "pessimistic",
+                    "title": "The Withering Garden",
+                    "garden_state": f"Your garden shows signs of neglect. Without following through on '{what_if}', familiar patterns return. Flowers that were budding close their petals. The soil grows harder, less receptive to new seeds.",
+                    "wellness_delta": -8,
+                    "mood_prediction": -0.15,
+                    "key_outcomes": [
+                        "Return to old coping patterns",
+                        "Decreased motivation over time",
+                        "Missed opportunity for growth"
+                    ],
+                    "emotional_tone": "resigned",
+                    "gentle_warning": "Not following through isn't failure—it's information about what you need to change."
+                },
+                {
+                    "type": "realistic",
+                    "title": "The Growing Garden",
+                    "garden_state": f"Your garden adapts to '{what_if}' with steady progress. Some days are easier than others. New flowers bloom alongside old ones. The garden learns your rhythm, growing at its own pace.",
+                    "wellness_delta": 7,
+                    "mood_prediction": 0.12,
+                    "key_outcomes": [
+                        "Gradual mood improvement",
+                        "Increased self-awareness",
+                        "Building sustainable habits"
+                    ],
+                    "emotional_tone": "hopeful",
+                    "encouragement": "Progress doesn't have to be perfect to be real."
+                },
+                {
+                    "type": "optimistic",
+                    "title": "The Thriving Garden",
+                    "garden_state": f"Your garden flourishes beyond expectation. '{what_if}' becomes second nature. Flowers bloom in colors you didn't know existed. The soil is rich, every seed finds purchase. Other gardeners stop to admire your growth.",
+                    "wellness_delta": 18,
+                    "mood_prediction": 0.28,
+                    "key_outcomes": [
+                        "Significant wellness improvement",
+                        "Positive habit momentum",
+                        "Inspiring your support network"
+                    ],
+                    "emotional_tone": "empowered",
+                    "inspiration": "This future is possible when you meet yourself with consistency and compassion."
+                }
+            ],
+            "suggested_first_step": f"Start with just 5 minutes today of '{what_if}' without judgment—small roots grow deep gardens."
+        },
+        "what_if_scenario": what_if,
+        "baseline_state": current_state,
+        "error": str(error)
+    }
+
 async def generate_scenario_simulations(
     what_if: str,
     current_state: Dict,
     profile: UserProfile
 ) -> Dict:
     """Generate 3 future scenarios using Gemini"""
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
     prompt = f"""You are a compassionate future-self simulator in EchoBloom wellness app.
 
 USER'S CURRENT STATE:
@@ -130,11 +187,11 @@ FORMAT AS JSON:
 Base predictions on behavioral science, not wishful thinking."""
     
     try:
-        response = model.generate_content(prompt)
+        response_text = await llm.generate(prompt)
         
         # Parse response
         import json
-        response_text = response.text.strip()
+        response_text = response_text.strip()
         if "```json" in response_text:
             response_text = response_text.split("```json")[1].split("```")[0].strip()
         elif "```" in response_text:
@@ -150,133 +207,64 @@ Base predictions on behavioral science, not wishful thinking."""
         }
     
     except Exception as e:
-        # Fallback simulations
-        return {
-            "success": False,
-            "simulations": {
-                "scenarios": [
-                    {
-                        "type": "pessimistic",
-                        "title": "The Withering Garden",
-                        "garden_state": f"Your garden shows signs of neglect. Without following through on '{what_if}', familiar patterns return. Flowers that were budding close their petals. The soil grows harder, less receptive to new seeds.",
-                        "wellness_delta": -8,
-                        "mood_prediction": -0.15,
-                        "key_outcomes": [
-                            "Return to old coping patterns",
-                            "Decreased motivation over time",
-                            "Missed opportunity for growth"
-                        ],
-                        "emotional_tone": "resigned",
-                        "gentle_warning": "Not following through isn't failure—it's information about what you need to change."
-                    },
-                    {
-                        "type": "realistic",
-                        "title": "The Growing Garden",
-                        "garden_state": f"Your garden adapts to '{what_if}' with steady progress. Some days are easier than others. New flowers bloom alongside old ones. The garden learns your rhythm, growing at its own pace.",
-                        "wellness_delta": 7,
-                        "mood_prediction": 0.12,
-                        "key_outcomes": [
-                            "Gradual mood improvement",
-                            "Increased self-awareness",
-                            "Building sustainable habits"
-                        ],
-                        "emotional_tone": "hopeful",
-                        "encouragement": "Progress doesn't have to be perfect to be real."
-                    },
-                    {
-                        "type": "optimistic",
-                        "title": "The Thriving Garden",
-                        "garden_state": f"Your garden flourishes beyond expectation. '{what_if}' becomes second nature. Flowers bloom in colors you didn't know existed. The soil is rich, every seed finds purchase. Other gardeners stop to admire your growth.",
-                        "wellness_delta": 18,
-                        "mood_prediction": 0.28,
-                        "key_outcomes": [
-                            "Significant wellness improvement",
-                            "Positive habit momentum",
-                            "Inspiring your support network"
-                        ],
-                        "emotional_tone": "empowered",
-                        "inspiration": "This future is possible when you meet yourself with consistency and compassion."
-                    }
-                ],
-                "suggested_first_step": f"Start with just 5 minutes today of '{what_if}' without judgment—small roots grow deep gardens."
-            },
-            "what_if_scenario": what_if,
-            "baseline_state": current_state,
-            "error": str(e)
-        }
+        return fallback_simulations(what_if, current_state, e)
 
 @router.post("/futures")
 async def simulate_futures(
     request: SimulationRequest,
-    db: Session = Depends(get_db)
+    http_request: Request
 ):
     """Generate future-self simulations based on what-if scenario"""
     try:
-        # Fetch user data
-        result = await db.execute(
-            select(Echo)
-            .where(Echo.user_id == request.user_id)
-            .order_by(desc(Echo.created_at))
-            .limit(30)
-        )
-        echoes = result.scalars().all()
-        
-        # Fetch all activity types
-        activities = []
-        
-        # Breathing sessions
-        breathing_result = await db.execute(
-            select(BreathingSession)
-            .where(BreathingSession.user_id == request.user_id)
-            .order_by(desc(BreathingSession.completed_at))
-            .limit(20)
-        )
-        activities.extend(breathing_result.scalars().all())
-        
-        # Journal entries
-        journal_result = db.execute(
-            select(JournalEntry)
-            .where(JournalEntry.user_id == request.user_id)
-            .order_by(desc(JournalEntry.completed_at))
-            .limit(20)
-        )
-        activities.extend(journal_result.scalars().all())
-        
-        # Gratitude entries
-        gratitude_result = db.execute(
-            select(GratitudeEntry)
-            .where(GratitudeEntry.user_id == request.user_id)
-            .order_by(desc(GratitudeEntry.completed_at))
-            .limit(20)
-        )
-        activities.extend(gratitude_result.scalars().all())
-        
-        # Grounding sessions
-        grounding_result = db.execute(
-            select(GroundingSession)
-            .where(GroundingSession.user_id == request.user_id)
-            .order_by(desc(GroundingSession.completed_at))
-            .limit(20)
-        )
-        activities.extend(grounding_result.scalars().all())
+        # Independent reads run concurrently, each on its own session
+        def recent_activities(model):
+            return Branch(
+                run=fetch_all(
+                    select(model)
+                    .where(model.user_id == request.user_id)
+                    .order_by(desc(model.completed_at))
+                    .limit(20)
+                ),
+                timeout=settings.db_read_timeout_seconds,
+                fallback=lambda e: []  # activities only refine the baseline
+            )
         
-        # Fetch profile
-        profile_result = db.execute(
-            select(UserProfile).where(UserProfile.user_id == request.user_id)
+        echoes, breathing, journal, gratitude, grounding, profile = await fan_out(
+            Branch(
+                run=fetch_rows(
+                    Echo.select_moods()
+                    .where(Echo.user_id == request.user_id)
+                    .order_by(desc(Echo.created_at))
+                    .limit(30)
+                ),
+                timeout=settings.db_read_timeout_seconds
+            ),
+            recent_activities(BreathingSession),
+            recent_activities(JournalEntry),
+            recent_activities(GratitudeEntry),
+            recent_activities(GroundingSession),
+            Branch(
+                run=fetch_one(select(UserProfile).where(UserProfile.user_id == request.user_id)),
+                timeout=settings.db_read_timeout_seconds
+            ),
+            request=http_request
         )
-        profile = profile_result.scalar_one_or_none()
+        activities = breathing + journal + gratitude + grounding
         
         if not profile:
             raise HTTPException(status_code=404, detail="User profile not found")
         
         # Calculate current trajectory
-        current_state = calculate_current_trajectory(list(echoes), list(activities))
+        current_state = calculate_current_trajectory(Echo.moods(echoes), list(activities))
         
-        # Generate simulations
-        simulation_response = await generate_scenario_simulations(
-            request.what_if_scenario,
-            current_state,
-            profile
+        # Generate simulations (cancelled if the client goes away)
+        [simulation_response] = await fan_out(
+            Branch(
+                run=partial(generate_scenario_simulations, request.what_if_scenario, current_state, profile),
+                timeout=settings.llm_timeout_seconds,
+                fallback=partial(fallback_simulations, request.what_if_scenario, current_state)
+            ),
+            request=http_request
         )
         
         return {
@@ -296,12 +284,12 @@ async def get_suggested_scenarios(
     try:
         # Fetch recent echoes
         result = await db.execute(
-            select(Echo)
+            Echo.select_moods()
             .where(Echo.user_id == user_id)
             .order_by(desc(Echo.created_at))
             .limit(10)
         )
-        echoes = result.scalars().all()
+        echoes = Echo.moods(result)
         
         if not echoes:
             return {
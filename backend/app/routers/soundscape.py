@@ -1,26 +1,21 @@
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import select, desc
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-import os
-from datetime import datetime, timedelta
-import google.generativeai as genai
-import json
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any
+from datetime import datetime
 
-from app.core.database import get_db
-from app.models.echo import Echo
+from app.core.database import get_db, get_lazy_db
+from app.core.garden_snapshot import load_garden_snapshot
+from app.core.soundscape_buckets import quantize_garden_state, personalize
+from app.core.llm_cache import llm_cache
+from app.core.mood_state import mood_state
+from app.core.mood_series import MoodSeries
 
 router = APIRouter(prefix="/api/soundscape")
 
-# Configure Gemini
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-
 class SoundscapeRequest(BaseModel):
     user_id: str
-    include_recent_echoes: int = 5  # How many recent echoes to analyze
+    include_recent_echoes: int = Field(5, ge=1, le=100)  # How many recent echoes to analyze
 
 
 def analyze_garden_mood(echoes: List[Dict], plants_by_type: Dict) -> Dict[str, Any]:
@@ -38,15 +33,8 @@ def analyze_garden_mood(echoes: List[Dict], plants_by_type: Dict) -> Dict[str, A
             "emotional_intensity": 0.0
         }
     
-    # Calculate mood metrics
-    mood_scores = [echo.get("mood_score", 0) for echo in echoes]
-    avg_mood = sum(mood_scores) / len(mood_scores) if mood_scores else 0
-    
-    # Calculate variance (emotional stability indicator)
-    if len(mood_scores) > 1:
-        mood_variance = sum((m - avg_mood) ** 2 for m in mood_scores) / len(mood_scores)
-    else:
-        mood_variance = 0
+    # Mood metrics; variance is the emotional stability indicator
+    stats = MoodSeries.from_columns(echo.get("mood_score", 0) for echo in echoes).stats()
     
     # Extract and count emotions
     emotion_counts = {}
@@ -62,27 +50,23 @@ def analyze_garden_mood(echoes: List[Dict], plants_by_type: Dict) -> Dict[str, A
     total_plants = sum(plants_by_type.values())
     plant_diversity = len(plants_by_type)
     
-    # Emotional intensity (based on absolute mood values)
-    emotional_intensity = sum(abs(m) for m in mood_scores) / len(mood_scores) if mood_scores else 0
-    
     return {
-        "overall_mood": round(avg_mood, 2),
-        "mood_variance": round(mood_variance, 3),
+        "overall_mood": round(stats.mean, 2),
+        "mood_variance": round(stats.variance, 3),
         "dominant_emotions": dominant_emotions,
         "garden_density": total_plants,
         "plant_diversity": plant_diversity,
-        "emotional_intensity": round(emotional_intensity, 2)
+        "emotional_intensity": round(stats.mean_abs, 2)  # based on absolute mood values
     }
 
 
-def generate_audio_layers_with_gemini(garden_state: Dict) -> Dict[str, Any]:
+async def generate_audio_layers_with_gemini(garden_state: Dict) -> Dict[str, Any]:
     """
     Uses Gemini to map garden mood to Web Audio API parameters.
     Returns configuration for oscillators, frequencies, and effects.
+    Pass a quantized state so similar gardens share one cached completion.
     """
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash')
-        
         prompt = f"""You are a therapeutic soundscape designer specializing in procedural audio generation.
 
 Based on this user's wellness garden state, generate Web Audio API parameters for a soothing ambient soundscape:
@@ -155,8 +139,7 @@ Important:
 - Lower frequencies for grounding, higher for uplift
 - Return ONLY valid JSON, no markdown, no explanation."""
 
-        response = model.generate_content(prompt)
-        audio_config = json.loads(response.text.strip())
+        audio_config = await llm_cache.generate_json(prompt)
         
         return audio_config
         
@@ -311,71 +294,39 @@ def generate_fallback_soundscape(mood: float) -> Dict[str, Any]:
 
 
 @router.post("/generate")
-async def generate_soundscape(request: SoundscapeRequest):
+async def generate_soundscape(
+    request: SoundscapeRequest,
+    db: AsyncSession = Depends(get_db)
+):
     """
     Generates a therapeutic soundscape based on the user's garden state.
     
     Returns Web Audio API parameters for real-time synthesis in the browser.
     """
-    from app.core.database import get_db_connection
-    
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        snapshot = await load_garden_snapshot(db, request.user_id, request.include_recent_echoes)
+        # The LLM call below can take seconds; don't hold a pooled connection through it
+        await db.close()
         
-        # Fetch recent echoes
-        cursor.execute("""
-            SELECT id, content, mood_score, emotion_tags, seed_type, created_at
-            FROM echoes
-            WHERE user_id = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (request.user_id, request.include_recent_echoes))
-        
-        echo_rows = cursor.fetchall()
-        echoes = [
-            {
-                "id": row[0],
-                "content": row[1],
-                "mood_score": row[2],
-                "emotion_tags": json.loads(row[3]) if row[3] else [],
-                "seed_type": row[4],
-                "created_at": row[5]
-            }
-            for row in echo_rows
-        ]
-        
-        if not echoes:
-            conn.close()
+        if not snapshot.echoes:
             raise HTTPException(
                 status_code=400,
                 detail="No echoes found. Plant your first echo to generate a soundscape."
             )
         
-        # Count plants by type
-        cursor.execute("""
-            SELECT seed_type, COUNT(*) as count
-            FROM echoes
-            WHERE user_id = ?
-            GROUP BY seed_type
-        """, (request.user_id,))
-        
-        plants_by_type = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        conn.close()
-        
         # Analyze garden mood
-        garden_state = analyze_garden_mood(echoes, plants_by_type)
+        garden_state = analyze_garden_mood(snapshot.echoes, snapshot.plants_by_type)
         
-        # Generate audio configuration with Gemini
-        audio_config = generate_audio_layers_with_gemini(garden_state)
+        # Generate (or reuse) the config for the garden's bucket, then make it the user's own
+        bucket = quantize_garden_state(garden_state)
+        audio_config = personalize(await generate_audio_layers_with_gemini(bucket), request.user_id)
         
         return {
             "success": True,
             "audio_config": audio_config,
             "garden_state": garden_state,
             "timestamp": datetime.now().isoformat(),
-            "message": f"Generated {audio_config.get('emotional_tone', 'therapeutic')} soundscape based on {len(echoes)} recent reflections"
+            "message": f"Generated {audio_config.get('emotional_tone', 'therapeutic')} soundscape based on {len(snapshot.echoes)} recent reflections"
         }
         
     except HTTPException:
@@ -441,21 +392,15 @@ async def get_soundscape_presets():
 @router.get("/current-mood/{user_id}")
 async def get_current_mood_for_sound(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_lazy_db)
 ):
     """
     Quick endpoint to get the user's current mood for immediate soundscape generation.
     Used by the frontend to show a "Play My Garden Sound" button.
     """
     try:
-        # Get most recent echo
-        result = await db.execute(
-            select(Echo)
-            .where(Echo.user_id == user_id)
-            .order_by(desc(Echo.created_at))
-            .limit(1)
-        )
-        echo = result.scalar_one_or_none()
+        # Most recent echo, from the in-memory mood window
+        echo = (await mood_state.window(db, user_id)).latest()
         
         if not echo:
             return {
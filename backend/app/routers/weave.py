@@ -2,24 +2,26 @@
 Whisper Weave - AI-Coauthored Tales
 Transforms weekly echoes into empathetic narrative therapy fables
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import select, desc, and_
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from functools import partial
 from pydantic import BaseModel
-import google.generativeai as genai
-import os
 
-from app.core.database import get_db
+from app.core.concurrency import Branch, fan_out, fetch_all, fetch_one
+from app.core.config import settings
+from app.core.database import get_db, get_lazy_db
+from app.core.llm import llm
+from app.core.cache import response_cache
+from app.core.mood_state import mood_state
+from app.core.mood_series import MoodSeries
 from app.models.echo import Echo
 from app.models.user_profile import UserProfile
 
 router = APIRouter(prefix="/api/weave", tags=["weave"])
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
 def aggregate_weekly_echoes(echoes: List[Echo]) -> Dict:
     """Aggregate echo data for narrative generation"""
     if not echoes:
@@ -34,7 +36,7 @@ def aggregate_weekly_echoes(echoes: List[Echo]) -> Dict:
     key_moments = []
     
     for echo in echoes:
-        all_emotions.extend(echo.emotion_tags)
+        all_emotions.extend(echo.emotion_tags or [])
         mood_journey.append({
             'date': echo.created_at.strftime('%A, %B %d'),
             'mood': echo.mood_score,
@@ -42,7 +44,7 @@ def aggregate_weekly_echoes(echoes: List[Echo]) -> Dict:
         })
         
         # Identify key moments (high/low mood, significant emotions)
-        if abs(echo.mood_score) > 0.3:
+        if echo.mood_score is not None and abs(echo.mood_score) > 0.3:
             key_moments.append({
                 'type': 'peak' if echo.mood_score > 0.3 else 'valley',
                 'emotions': echo.emotion_tags,
@@ -54,8 +56,10 @@ def aggregate_weekly_echoes(echoes: List[Echo]) -> Dict:
     emotion_counts = Counter(all_emotions)
     dominant_emotions = [emotion for emotion, _ in emotion_counts.most_common(3)]
     
-    avg_mood = sum(m['mood'] for m in mood_journey) / len(mood_journey)
-    mood_variance = max(m['mood'] for m in mood_journey) - min(m['mood'] for m in mood_journey)
+    series = MoodSeries.from_echoes(echoes)
+    stats = series.stats()
+    # Echoes arrive newest first; compare the oldest and newest by time
+    endpoints = series.endpoints()
     
     return {
         "has_data": True,
@@ -64,16 +68,42 @@ def aggregate_weekly_echoes(echoes: List[Echo]) -> Dict:
         "mood_journey": mood_journey,
         "key_moments": key_moments[:5],  # Top 5 key moments
         "narrative_arc": {
-            "avg_mood": avg_mood,
-            "emotional_range": mood_variance,
-            "journey_type": "growth" if mood_journey[-1]['mood'] > mood_journey[0]['mood'] else "challenge"
+            "avg_mood": stats.mean,
+            "emotional_range": stats.range,
+            "journey_type": "growth" if endpoints and endpoints[1] > endpoints[0] else "challenge"
         }
     }
 
+def fallback_fable(narrative_data: Dict, error: BaseException) -> Dict:
+    """Fallback fable when Gemini fails or times out"""
+    dominant_emotions = ', '.join(narrative_data['dominant_emotions'])
+    
+    return {
+        "success": False,
+        "tale": {
+            "title": "The Garden of Tender Seasons",
+            "fable": f"""Once, there was a gardener who tended a peculiar plot of land where emotions bloomed like flowers. This week, the garden had seen {narrative_data['echo_count']} new seeds planted, each one carrying a feeling: {dominant_emotions}.
+
+The gardener walked through rows of {dominant_emotions.split(',')[0] if dominant_emotions else 'mixed'} blooms, some petals bright and open, others curled tight against storms they'd weathered. The garden never apologized for its seasons. When clouds gathered, the garden didn't pretend to be sunny. When frost came, it didn't force spring.
+
+There were days the gardener knelt in the soil, hands deep in earth that held both joy and sorrow. They learned that trying to pull out the sad flowers only disturbed the roots of the happy ones—everything was connected, everything belonged.
+
+One evening, as twilight painted the garden in soft purples and golds, the gardener noticed something: even on the hardest days, they had kept showing up. Even when blooms wilted, new seeds were already forming. The garden taught them that growth isn't always upward—sometimes it's deeper, quieter, rooting down through dark soil to find nutrients the surface never knew existed.
+
+The gardener realized their week was not a problem to fix but a story to honor. Every emotion had earned its place in the garden. And in that acceptance, something shifted. The garden didn't change, but the gardener's relationship to it softened.
+
+As stars emerged, the gardener whispered to their garden: "Thank you for teaching me that I don't have to bloom in every season to still be growing." """,
+            "moral": "A garden's worth is not in constant blooming, but in honest seasons.",
+            "garden_metaphor": f"Your week's garden held {narrative_data['echo_count']} diverse seeds, creating a landscape of {dominant_emotions}. It was neither perfectly sunny nor endlessly stormy—it was truthfully, beautifully yours.",
+            "reflection_prompt": "What would change if you saw your emotions as seasons your garden is meant to experience, rather than problems to solve?"
+        },
+        "narrative_data": narrative_data,
+        "created_at": datetime.utcnow().isoformat(),
+        "error": str(error)
+    }
+
 async def generate_fable(narrative_data: Dict, user_profile: UserProfile) -> Dict:
     """Generate empathetic fable using Gemini"""
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
     dominant_emotions = ', '.join(narrative_data['dominant_emotions'])
     arc = narrative_data['narrative_arc']
     key_moments = narrative_data['key_moments']
@@ -126,11 +156,11 @@ FORMAT AS JSON:
 Make it deeply personal to their journey, not generic. This is narrative therapy."""
     
     try:
-        response = model.generate_content(prompt)
+        response_text = await llm.generate(prompt)
         
         # Parse response
         import json
-        response_text = response.text.strip()
+        response_text = response_text.strip()
         if "```json" in response_text:
             response_text = response_text.split("```json")[1].split("```")[0].strip()
         elif "```" in response_text:
@@ -146,51 +176,37 @@ Make it deeply personal to their journey, not generic. This is narrative therapy
         }
     
     except Exception as e:
-        # Fallback fable
-        return {
-            "success": False,
-            "tale": {
-                "title": "The Garden of Tender Seasons",
-                "fable": f"""Once, there was a gardener who tended a peculiar plot of land where emotions bloomed like flowers. This week, the garden had seen {narrative_data['echo_count']} new seeds planted, each one carrying a feeling: {dominant_emotions}.
-
-The gardener walked through rows of {dominant_emotions.split(',')[0] if dominant_emotions else 'mixed'} blooms, some petals bright and open, others curled tight against storms they'd weathered. The garden never apologized for its seasons. When clouds gathered, the garden didn't pretend to be sunny. When frost came, it didn't force spring.
-
-There were days the gardener knelt in the soil, hands deep in earth that held both joy and sorrow. They learned that trying to pull out the sad flowers only disturbed the roots of the happy ones—everything was connected, everything belonged.
-
-One evening, as twilight painted the garden in soft purples and golds, the gardener noticed something: even on the hardest days, they had kept showing up. Even when blooms wilted, new seeds were already forming. The garden taught them that growth isn't always upward—sometimes it's deeper, quieter, rooting down through dark soil to find nutrients the surface never knew existed.
-
-The gardener realized their week was not a problem to fix but a story to honor. Every emotion had earned its place in the garden. And in that acceptance, something shifted. The garden didn't change, but the gardener's relationship to it softened.
-
-As stars emerged, the gardener whispered to their garden: "Thank you for teaching me that I don't have to bloom in every season to still be growing." """,
-                "moral": "A garden's worth is not in constant blooming, but in honest seasons.",
-                "garden_metaphor": f"Your week's garden held {narrative_data['echo_count']} diverse seeds, creating a landscape of {dominant_emotions}. It was neither perfectly sunny nor endlessly stormy—it was truthfully, beautifully yours.",
-                "reflection_prompt": "What would change if you saw your emotions as seasons your garden is meant to experience, rather than problems to solve?"
-            },
-            "narrative_data": narrative_data,
-            "created_at": datetime.utcnow().isoformat(),
-            "error": str(e)
-        }
+        return fallback_fable(narrative_data, e)
 
 @router.post("/create-tale")
 async def create_tale(
     user_id: str,
-    days: int = 7,
-    db: Session = Depends(get_db)
+    request: Request,
+    days: int = 7
 ):
     """Generate AI-coauthored tale from recent echoes"""
     try:
-        # Fetch echoes from specified time period
+        # Fetch echoes from specified time period and the profile concurrently
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        result = await db.execute(
-            select(Echo)
-            .where(and_(
-                Echo.user_id == user_id,
-                Echo.created_at >= start_date
-            ))
-            .order_by(desc(Echo.created_at))
+        echoes, profile = await fan_out(
+            Branch(
+                run=fetch_all(
+                    select(Echo)
+                    .where(and_(
+                        Echo.user_id == user_id,
+                        Echo.created_at >= start_date
+                    ))
+                    .order_by(desc(Echo.created_at))
+                ),
+                timeout=settings.db_read_timeout_seconds
+            ),
+            Branch(
+                run=fetch_one(select(UserProfile).where(UserProfile.user_id == user_id)),
+                timeout=settings.db_read_timeout_seconds
+            ),
+            request=request
         )
-        echoes = result.scalars().all()
         
         if len(echoes) < 3:
             return {
@@ -199,12 +215,6 @@ async def create_tale(
                 "suggestion": "Keep planting echoes this week, and return for your story!"
             }
         
-        # Fetch user profile
-        profile_result = db.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
-        )
-        profile = profile_result.scalar_one_or_none()
-        
         if not profile:
             raise HTTPException(status_code=404, detail="User profile not found")
         
@@ -217,8 +227,15 @@ async def create_tale(
                 "message": narrative_data['message']
             }
         
-        # Generate fable
-        tale_response = await generate_fable(narrative_data, profile)
+        # Generate fable (cancelled if the client goes away)
+        [tale_response] = await fan_out(
+            Branch(
+                run=partial(generate_fable, narrative_data, profile),
+                timeout=settings.llm_timeout_seconds,
+                fallback=partial(fallback_fable, narrative_data)
+            ),
+            request=request
+        )
         
         return tale_response
     
@@ -248,30 +265,36 @@ async def preview_narrative_data(
 ):
     """Preview what narrative data exists for tale generation"""
     try:
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        result = await db.execute(
-            select(Echo)
-            .where(and_(
-                Echo.user_id == user_id,
-                Echo.created_at >= start_date
-            ))
-            .order_by(desc(Echo.created_at))
+        return await response_cache.get_or_compute(
+            f"weave.preview_data:{days}", user_id, lambda: build_narrative_preview(user_id, days, db)
         )
-        echoes = result.scalars().all()
-        
-        narrative_data = aggregate_weekly_echoes(list(echoes))
-        
-        return {
-            "ready_for_tale": len(echoes) >= 3,
-            "echo_count": len(echoes),
-            "narrative_preview": narrative_data if narrative_data['has_data'] else None
-        }
-    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
 
 
+async def build_narrative_preview(user_id: str, days: int, db: Session) -> Dict:
+    """Compute the narrative preview (uncached)"""
+    start_date = datetime.utcnow() - timedelta(days=days)
+    
+    result = await db.execute(
+        select(Echo)
+        .where(and_(
+            Echo.user_id == user_id,
+            Echo.created_at >= start_date
+        ))
+        .order_by(desc(Echo.created_at))
+    )
+    echoes = result.scalars().all()
+    
+    narrative_data = aggregate_weekly_echoes(list(echoes))
+    
+    return {
+        "ready_for_tale": len(echoes) >= 3,
+        "echo_count": len(echoes),
+        "narrative_preview": narrative_data if narrative_data['has_data'] else None
+    }
+
+
 # ==================== AFFIRMATION WEAVINGS ====================
 
 class AffirmationRequest(BaseModel):
@@ -287,8 +310,6 @@ async def generate_affirmation(echo_data: Dict, user_profile: UserProfile) -> Di
     Transmutes negative/difficult echoes into resilience mantras using Gemini.
     This is therapeutic alchemy - validating pain while offering transformative reframes.
     """
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
     vent_text = echo_data['content']
     mood = echo_data['mood_score']
     emotions = ', '.join(echo_data['emotions'])
@@ -335,11 +356,11 @@ FORMAT AS JSON:
 Remember: This is not about denying pain. It's about honoring it while offering a thread of resilience to hold onto."""
     
     try:
-        response = model.generate_content(prompt)
+        response_text = await llm.generate(prompt)
         
         # Parse response
         import json
-        response_text = response.text.strip()
+        response_text = response_text.strip()
         if "```json" in response_text:
             response_text = response_text.split("```json")[1].split("```")[0].strip()
         elif "```" in response_text:
@@ -397,7 +418,7 @@ async def create_affirmation(
     """
     try:
         # Fetch user profile
-        profile_result = db.execute(
+        profile_result = await db.execute(
             select(UserProfile).where(UserProfile.user_id == request.user_id)
         )
         profile = profile_result.scalar_one_or_none()
@@ -449,21 +470,15 @@ async def get_affirmation_vault(
 @router.get("/check-for-affirmation/{user_id}")
 async def check_if_needs_affirmation(
     user_id: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_lazy_db)
 ):
     """
     Check if the user's most recent echo qualifies for an affirmation weaving.
     Used by frontend to auto-trigger affirmation modal.
     """
     try:
-        # Get most recent echo
-        result = await db.execute(
-            select(Echo)
-            .where(Echo.user_id == user_id)
-            .order_by(desc(Echo.created_at))
-            .limit(1)
-        )
-        echo = result.scalar_one_or_none()
+        # Most recent echo, from the in-memory mood window
+        echo = (await mood_state.window(db, user_id)).latest()
         
         if not echo:
             return {
@@ -476,7 +491,7 @@ async def check_if_needs_affirmation(
         
         return {
             "needs_affirmation": needs_affirmation,
-            "echo_id": echo.id,
+            "echo_id": echo.echo_id,
             "mood_score": echo.mood_score,
             "emotion_tags": echo.emotion_tags,
             "message": "This moment deserves gentle support" if needs_affirmation else "No affirmation needed right now"
@@ -4,38 +4,33 @@ Detects patterns of low mood and provides personalized support
 """
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import select, desc, and_
+from sqlalchemy import select, desc, func, case
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import google.generativeai as genai
-import os
+from typing import Awaitable, Callable, List, Dict, Optional
+import asyncio
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import async_session, get_db, dialect_insert
+from app.core.llm import llm
+from app.core.llm_cache import llm_cache
+from app.core.metrics import metrics
+from app.core.mood_series import MoodSeries
+from app.core.mood_state import mood_state
 from app.models.echo import Echo
 from app.models.user_profile import UserProfile
+from app.models.whisperer_nudge import WhispererNudge
 
 router = APIRouter(prefix="/api/whisperer", tags=["whisperer"])
 
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-
-def analyze_mood_pattern(echoes: List[Echo]) -> Dict:
-    """Analyze recent echoes for concerning patterns"""
-    if len(echoes) < 3:
+def classify_mood_window(echo_count: int, low_mood_days: int, avg_mood: float, recent_avg: float) -> Dict:
+    """Pattern rules over the (up to) 7 most recent echoes of the last 7 days"""
+    if echo_count < 3:
         return {
             "needs_intervention": False,
             "pattern_type": "insufficient_data",
             "severity": 0
         }
     
-    # Get last 7 days of echoes
-    recent_echoes = echoes[:7]
-    mood_scores = [echo.mood_score for echo in recent_echoes]
-    
-    # Count low mood days (mood_score < -0.2)
-    low_mood_days = sum(1 for score in mood_scores if score < -0.2)
-    avg_mood = sum(mood_scores) / len(mood_scores)
-    
     # Detect patterns
     needs_intervention = False
     pattern_type = "stable"
@@ -49,27 +44,36 @@ def analyze_mood_pattern(echoes: List[Echo]) -> Dict:
         needs_intervention = True
         pattern_type = "persistent_low"
         severity = 3
-    elif len(recent_echoes) >= 3:
-        # Check for sudden drop
-        recent_avg = sum(mood_scores[:3]) / 3
-        if recent_avg < -0.2 and recent_avg < avg_mood - 0.3:
-            needs_intervention = True
-            pattern_type = "sudden_drop"
-            severity = 4
+    elif recent_avg < -0.2 and recent_avg < avg_mood - 0.3:
+        # Sudden drop across the 3 newest echoes
+        needs_intervention = True
+        pattern_type = "sudden_drop"
+        severity = 4
     
     return {
         "needs_intervention": needs_intervention,
         "pattern_type": pattern_type,
         "severity": severity,
         "low_mood_days": low_mood_days,
-        "avg_mood": avg_mood,
+        "avg_mood": avg_mood
+    }
+
+def analyze_mood_pattern(echoes: List[Echo]) -> Dict:
+    """Analyze recent echoes for concerning patterns"""
+    # Get last 7 days of echoes
+    recent_echoes = echoes[:7]
+    series = MoodSeries.from_echoes(recent_echoes)
+    if len(series) < 3:
+        return classify_mood_window(len(series), 0, 0.0, 0.0)
+    
+    # Low mood days are mood_score < -0.2; the recent average covers the 3 newest
+    return {
+        **classify_mood_window(len(series), series.count_below(-0.2), series.stats().mean, series.slice_mean(0, 3)),
         "recent_emotions": [echo.emotion_tags for echo in recent_echoes[:3]]
     }
 
 async def generate_whisperer_nudge(pattern: Dict, user_profile: UserProfile) -> Dict:
     """Generate personalized nudge using Gemini"""
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
     # Extract context
     severity = pattern.get('severity', 3)
     pattern_type = pattern.get('pattern_type', 'unknown')
@@ -111,11 +115,11 @@ FORMAT YOUR RESPONSE AS JSON:
 Keep it brief, actionable, and hopeful."""
     
     try:
-        response = model.generate_content(prompt)
+        response_text = await llm.generate(prompt)
         
         # Parse Gemini response
         import json
-        response_text = response.text.strip()
+        response_text = response_text.strip()
         
         # Extract JSON from markdown code blocks if present
         if "```json" in response_text:
@@ -160,55 +164,194 @@ Keep it brief, actionable, and hopeful."""
             "error": str(e)
         }
 
+# ==================== BATCH SCAN ====================
+
+async def compute_mood_patterns(db: Session, user_ids: List[str]) -> Dict[str, Dict]:
+    """
+    analyze_mood_pattern() for many users in one set-based pass: a window over
+    each user's last 7 days of echoes, aggregated in SQL. Returns user_id ->
+    {"pattern", "last_echo_at", "last_echo_id"}; users without recent echoes get
+    insufficient_data. Like MoodSeries, echoes without a mood score stay in the
+    7-echo window but are left out of the counts and averages, and the recent
+    average covers the 3 newest scored echoes.
+    """
+    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    ranked = (
+        select(
+            Echo.id,
+            Echo.user_id,
+            Echo.mood_score,
+            Echo.emotion_tags,
+            Echo.created_at,
+            func.row_number().over(
+                partition_by=Echo.user_id,
+                order_by=(desc(Echo.created_at), desc(Echo.id))
+            ).label("rn"),
+            # Position among the user's scored (or unscored) echoes; only used for scored rows
+            func.row_number().over(
+                partition_by=(Echo.user_id, Echo.mood_score.is_(None)),
+                order_by=(desc(Echo.created_at), desc(Echo.id))
+            ).label("scored_rn")
+        )
+        .where(Echo.user_id.in_(user_ids), Echo.created_at >= seven_days_ago)
+        .subquery()
+    )
+    window = select(
+        ranked.c.user_id,
+        func.count(ranked.c.mood_score).label("echo_count"),
+        func.sum(case((ranked.c.mood_score < -0.2, 1), else_=0)).label("low_mood_days"),
+        func.avg(ranked.c.mood_score).label("avg_mood"),
+        func.avg(ranked.c.mood_score).filter(ranked.c.scored_rn <= 3).label("recent_avg"),
+        func.max(ranked.c.created_at).label("last_echo_at"),
+        func.max(ranked.c.id).filter(ranked.c.rn == 1).label("last_echo_id")
+    ).where(ranked.c.rn <= 7).group_by(ranked.c.user_id)
+    
+    patterns = {
+        user_id: {"pattern": classify_mood_window(0, 0, 0.0, 0.0), "last_echo_at": None, "last_echo_id": None}
+        for user_id in user_ids
+    }
+    for row in (await db.execute(window)).all():
+        patterns[row.user_id] = {
+            "pattern": classify_mood_window(row.echo_count, row.low_mood_days or 0, row.avg_mood or 0.0, row.recent_avg or 0.0),
+            "last_echo_at": row.last_echo_at,
+            "last_echo_id": row.last_echo_id
+        }
+    
+    # Emotions of the 3 newest echoes, only for users that reached a verdict
+    analyzed = [user_id for user_id, item in patterns.items() if item["pattern"]["pattern_type"] != "insufficient_data"]
+    if analyzed:
+        recent = await db.execute(
+            select(ranked.c.user_id, ranked.c.emotion_tags)
+            .where(ranked.c.rn <= 3, ranked.c.user_id.in_(analyzed))
+            .order_by(ranked.c.user_id, ranked.c.rn)
+        )
+        for user_id in analyzed:
+            patterns[user_id]["pattern"]["recent_emotions"] = []
+        for user_id, emotion_tags in recent.all():
+            patterns[user_id]["pattern"]["recent_emotions"].append(emotion_tags)
+    return patterns
+
+async def refresh_whisperer_nudges(
+    user_ids: List[str],
+    concurrency: int = 4,
+    on_write: Optional[Callable[[Session], Awaitable]] = None
+) -> Dict[str, Dict]:
+    """
+    Recompute patterns for a batch of users and upsert whisperer_nudges. A
+    stored nudge is reused while the pattern and newest echo are unchanged, so
+    only users whose situation moved trigger a Gemini call. Users without a
+    profile are skipped.
+    
+    Reads and writes each use their own short session, so no connection (or
+    Postgres transaction) is held while Gemini runs. `on_write(db)` runs in the
+    write transaction before it commits (the scan saves its checkpoint there).
+    """
+    async with async_session() as db:
+        patterns = await compute_mood_patterns(db, user_ids)
+        profiles_result = await db.execute(select(UserProfile).where(UserProfile.user_id.in_(user_ids)))
+        profiles = {profile.user_id: profile for profile in profiles_result.scalars().all()}
+        existing_result = await db.execute(select(WhispererNudge).where(WhispererNudge.user_id.in_(user_ids)))
+        existing = {row.user_id: row for row in existing_result.scalars().all()}
+    
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def nudge_for(user_id: str, pattern: Dict, last_echo_id: Optional[int]) -> Optional[Dict]:
+        if not pattern["needs_intervention"]:
+            return None
+        previous = existing.get(user_id)
+        if (previous is not None and previous.nudge and previous.needs_intervention
+                and previous.pattern_type == pattern["pattern_type"]
+                and previous.severity == pattern["severity"]
+                and previous.last_echo_id == last_echo_id):
+            metrics.inc("whisperer.nudges.reused")
+            return previous.nudge
+        async with semaphore:
+            nudge_response = await generate_whisperer_nudge(pattern, profiles[user_id])
+        metrics.inc("whisperer.nudges.generated")
+        return nudge_response["nudge"]
+    
+    scanned = [user_id for user_id in user_ids if user_id in profiles]
+    nudges = await asyncio.gather(*(
+        nudge_for(user_id, patterns[user_id]["pattern"], patterns[user_id]["last_echo_id"])
+        for user_id in scanned
+    ))
+    
+    computed_at = datetime.utcnow()
+    rows = {}
+    async with async_session() as db:
+        for user_id, nudge in zip(scanned, nudges):
+            pattern = patterns[user_id]["pattern"]
+            values = {
+                "needs_intervention": pattern["needs_intervention"],
+                "pattern_type": pattern["pattern_type"],
+                "severity": pattern["severity"],
+                "pattern": pattern,
+                "nudge": nudge,
+                "last_echo_at": patterns[user_id]["last_echo_at"],
+                "last_echo_id": patterns[user_id]["last_echo_id"],
+                "computed_at": computed_at
+            }
+            await db.execute(
+                dialect_insert(db, WhispererNudge)
+                .values(user_id=user_id, **values)
+                .on_conflict_do_update(index_elements=["user_id"], set_=values)
+            )
+            rows[user_id] = values
+        if on_write is not None:
+            await on_write(db)
+        await db.commit()
+    metrics.inc("whisperer.scan.users", len(scanned))
+    return rows
+
+async def nudge_is_current(db: Session, stored: WhispererNudge) -> bool:
+    """The stored row already saw the user's newest echo of the last 7 days"""
+    latest = (await mood_state.window(db, stored.user_id)).latest()
+    seven_days_ago = datetime.utcnow() - timedelta(days=7)
+    newest = latest.echo_id if latest is not None and latest.created_at >= seven_days_ago else None
+    return stored.last_echo_id == newest
+
 @router.post("/check-patterns")
 async def check_patterns(
     user_id: str,
     db: Session = Depends(get_db)
 ):
-    """Check if user needs Garden Whisperer intervention"""
+    """Check if user needs Garden Whisperer intervention (served from the background scan)"""
     try:
-        # Fetch recent echoes (last 7 days)
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        
+        fresh_since = datetime.utcnow() - timedelta(seconds=settings.whisperer_nudge_max_age_seconds)
         result = await db.execute(
-            select(Echo)
-            .where(and_(
-                Echo.user_id == user_id,
-                Echo.created_at >= seven_days_ago
-            ))
-            .order_by(desc(Echo.created_at))
+            select(WhispererNudge)
+            .where(WhispererNudge.user_id == user_id, WhispererNudge.computed_at >= fresh_since)
         )
-        echoes = result.scalars().all()
-        
-        # Fetch user profile
-        profile_result = await db.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
-        )
-        profile = profile_result.scalar_one_or_none()
-        
-        if not profile:
-            raise HTTPException(status_code=404, detail="User profile not found")
+        stored = result.scalar_one_or_none()
+        if stored and not await nudge_is_current(db, stored):
+            metrics.inc("whisperer.nudges.stale")
+            stored = None  # echoes posted (or aged out of the window) since the scan
         
-        # Analyze pattern
-        pattern = analyze_mood_pattern(list(echoes))
+        if stored:
+            row = stored.to_dict()
+            timestamp = row["computed_at"]
+        else:
+            # Not scanned yet (new user, scanner disabled or behind): compute just this user
+            await db.close()  # the refresh opens its own short sessions around the Gemini call
+            row = (await refresh_whisperer_nudges([user_id])).get(user_id)
+            if not row:
+                raise HTTPException(status_code=404, detail="User profile not found")
+            timestamp = row["computed_at"].isoformat()
         
-        # Generate nudge if intervention needed
-        if pattern["needs_intervention"]:
-            nudge_response = await generate_whisperer_nudge(pattern, profile)
-            
+        if row["needs_intervention"]:
             return {
                 "needs_intervention": True,
-                "pattern": pattern,
-                "nudge": nudge_response["nudge"],
-                "severity": pattern["severity"],
-                "timestamp": datetime.utcnow().isoformat()
+                "pattern": row["pattern"],
+                "nudge": row["nudge"],
+                "severity": row["severity"],
+                "timestamp": timestamp
             }
         else:
             return {
                 "needs_intervention": False,
-                "pattern": pattern,
+                "pattern": row["pattern"],
                 "message": "Your garden is thriving! Keep nurturing those seeds. 🌸",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": timestamp
             }
     
     except Exception as e:
@@ -220,17 +363,15 @@ async def get_mood_food_basket(
     db: Session = Depends(get_db)
 ):
     """Generate personalized mood-food nutrition recommendations"""
-    model = genai.GenerativeModel('gemini-2.0-flash')
-    
     try:
         # Fetch recent echoes for context
-        result = db.execute(
-            select(Echo)
+        result = await db.execute(
+            Echo.select_moods()
             .where(Echo.user_id == user_id)
             .order_by(desc(Echo.created_at))
             .limit(5)
         )
-        echoes = result.scalars().all()
+        echoes = Echo.moods(result)
         
         # Extract dominant emotions
         all_emotions = []
@@ -264,17 +405,8 @@ FORMAT AS JSON:
 
 Focus on accessible, comforting foods. Be warm and encouraging."""
         
-        response = model.generate_content(prompt)
-        
-        # Parse response
-        import json
-        response_text = response.text.strip()
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-        
-        basket_data = json.loads(response_text)
+        # The prompt only depends on the top emotions, so baskets are shared across users
+        basket_data = await llm_cache.generate_json(prompt)
         
         return {
             "success": True,
@@ -0,0 +1,69 @@
+"""
+Alembic environment
+Tables are still bootstrapped by create_tables() on startup; migrations evolve
+databases that already exist (indexes, new tables, column changes).
+Run from backend/: `alembic upgrade head`
+"""
+import asyncio
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+from alembic import context
+
+from app.core.database import database_url
+from app.models import Base
+import app.models.echo  # noqa: F401 - register tables on Base.metadata
+import app.models.activity  # noqa: F401
+import app.models.user_profile  # noqa: F401
+import app.models.rollup  # noqa: F401
+import app.models.llm_cache  # noqa: F401
+import app.models.emotion_fusion  # noqa: F401
+import app.models.whisperer_nudge  # noqa: F401
+import app.models.job_checkpoint  # noqa: F401
+import app.models.dawn  # noqa: F401
+import app.models.sensor  # noqa: F401
+import app.models.user  # noqa: F401
+import app.models.session_model  # noqa: F401
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=database_url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    connectable = create_async_engine(database_url, poolclass=pool.NullPool)
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_async_migrations())
@@ -0,0 +1,44 @@
+"""Composite (user_id, timestamp DESC) indexes for time-series tables
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, timestamp column)
+TIME_SERIES_INDEXES = [
+    ("ix_echoes_user_id_created_at", "echoes", "created_at"),
+    ("ix_breathing_sessions_user_id_completed_at", "breathing_sessions", "completed_at"),
+    ("ix_journal_entries_user_id_completed_at", "journal_entries", "completed_at"),
+    ("ix_gratitude_entries_user_id_completed_at", "gratitude_entries", "completed_at"),
+    ("ix_grounding_sessions_user_id_completed_at", "grounding_sessions", "completed_at"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index_name, table_name, time_column in TIME_SERIES_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            ["user_id", sa.text(f"{time_column} DESC")],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name, table_name, _ in TIME_SERIES_INDEXES:
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
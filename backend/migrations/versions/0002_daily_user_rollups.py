@@ -0,0 +1,48 @@
+"""Daily per-user rollup table
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Populate existing data afterwards with `python -m app.jobs.rollups backfill`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "daily_user_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("mood_sum", sa.Float()),
+        sa.Column("mood_count", sa.Integer()),
+        sa.Column("mood_min", sa.Float(), nullable=True),
+        sa.Column("mood_max", sa.Float(), nullable=True),
+        sa.Column("emotion_counts", sa.JSON()),
+        sa.Column("breathing_count", sa.Integer()),
+        sa.Column("journal_count", sa.Integer()),
+        sa.Column("gratitude_count", sa.Integer()),
+        sa.Column("grounding_count", sa.Integer()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("user_id", "day", name="uq_daily_user_rollups_user_id_day"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_daily_user_rollups_id", "daily_user_rollups", ["id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_daily_user_rollups_id", table_name="daily_user_rollups", if_exists=True)
+    op.drop_table("daily_user_rollups", if_exists=True)
@@ -0,0 +1,43 @@
+"""Persistent LLM result cache
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "llm_cache",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("cache_key", sa.String(length=64), nullable=False, unique=True),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("response", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_hit_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("hit_count", sa.Integer()),
+        if_not_exists=True,
+    )
+    op.create_index("ix_llm_cache_id", "llm_cache", ["id"], if_not_exists=True)
+    op.create_index("ix_llm_cache_expires_at", "llm_cache", ["expires_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_llm_cache_expires_at", table_name="llm_cache", if_exists=True)
+    op.drop_index("ix_llm_cache_id", table_name="llm_cache", if_exists=True)
+    op.drop_table("llm_cache", if_exists=True)
@@ -0,0 +1,42 @@
+"""Precomputed emotion-fusion matrix
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Populate with `python -m app.jobs.fusion_matrix`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "emotion_fusions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("emotion_a", sa.String(), nullable=False),
+        sa.Column("emotion_b", sa.String(), nullable=False),
+        sa.Column("mood_trend", sa.String(), nullable=False),
+        sa.Column("fusion", sa.JSON(), nullable=False),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("emotion_a", "emotion_b", "mood_trend", name="uq_emotion_fusions_pair_trend"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_emotion_fusions_id", "emotion_fusions", ["id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_emotion_fusions_id", table_name="emotion_fusions", if_exists=True)
+    op.drop_table("emotion_fusions", if_exists=True)
@@ -0,0 +1,53 @@
+"""Precomputed Garden Whisperer nudges and batch job checkpoints
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "whisperer_nudges",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("needs_intervention", sa.Boolean()),
+        sa.Column("pattern_type", sa.String()),
+        sa.Column("severity", sa.Integer()),
+        sa.Column("pattern", sa.JSON()),
+        sa.Column("nudge", sa.JSON(), nullable=True),
+        sa.Column("last_echo_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_whisperer_nudges_id", "whisperer_nudges", ["id"], if_not_exists=True)
+    op.create_index("ix_whisperer_nudges_user_id", "whisperer_nudges", ["user_id"], unique=True, if_not_exists=True)
+    op.create_table(
+        "job_checkpoints",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("cursor", sa.String(), nullable=True),
+        sa.Column("last_completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("job_checkpoints", if_exists=True)
+    op.drop_index("ix_whisperer_nudges_user_id", table_name="whisperer_nudges", if_exists=True)
+    op.drop_index("ix_whisperer_nudges_id", table_name="whisperer_nudges", if_exists=True)
+    op.drop_table("whisperer_nudges", if_exists=True)
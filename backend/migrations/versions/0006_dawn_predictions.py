@@ -0,0 +1,56 @@
+"""Stored Dawn Weave predictions and shield stories
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "dawn_predictions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("echo_count", sa.Integer()),
+        sa.Column("pattern_analysis", sa.JSON(), nullable=True),
+        sa.Column("is_stale", sa.Boolean()),
+        sa.Column("valid_until", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        if_not_exists=True,
+    )
+    op.create_index("ix_dawn_predictions_id", "dawn_predictions", ["id"], if_not_exists=True)
+    op.create_index("ix_dawn_predictions_user_id", "dawn_predictions", ["user_id"], unique=True, if_not_exists=True)
+    op.create_table(
+        "shield_stories",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("day", sa.String(), nullable=False),
+        sa.Column("week", sa.String(), nullable=False),
+        sa.Column("story", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint("user_id", "day", "week", name="uq_shield_stories_user_id_day_week"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_shield_stories_id", "shield_stories", ["id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_shield_stories_id", table_name="shield_stories", if_exists=True)
+    op.drop_table("shield_stories", if_exists=True)
+    op.drop_index("ix_dawn_predictions_user_id", table_name="dawn_predictions", if_exists=True)
+    op.drop_index("ix_dawn_predictions_id", table_name="dawn_predictions", if_exists=True)
+    op.drop_table("dawn_predictions", if_exists=True)
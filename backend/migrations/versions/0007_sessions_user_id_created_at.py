@@ -0,0 +1,33 @@
+"""(user_id, created_at DESC) index for paging sessions
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_sessions_user_id_created_at",
+        "sessions",
+        ["user_id", sa.text("created_at DESC")],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sessions_user_id_created_at", table_name="sessions", if_exists=True)
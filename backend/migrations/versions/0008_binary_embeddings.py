@@ -0,0 +1,95 @@
+"""Store seed and session embeddings as float32 bytes instead of JSON text
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["seeds", "sessions"]
+BATCH_SIZE = 1000
+
+
+def _json_to_bytes(value):
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value)  # already binary
+    try:
+        return np.asarray(json.loads(value), dtype="<f4").ravel().tobytes()
+    except (TypeError, ValueError):
+        return None  # unparseable placeholder; re-embed to fill it
+
+
+def _bytes_to_json(value):
+    if isinstance(value, str):
+        return value  # already JSON text
+    return json.dumps(np.frombuffer(value, dtype="<f4").tolist())
+
+
+def _convert(table_name: str, old_type, new_type, convert):
+    """Rewrite embedding through a temporary column: add, copy in batches, swap"""
+    conn = op.get_bind()
+    with op.batch_alter_table(table_name) as batch_op:
+        batch_op.add_column(sa.Column("embedding_new", new_type, nullable=True))
+
+    table = sa.table(
+        table_name,
+        sa.column("id", sa.Integer()),
+        sa.column("embedding", old_type),
+        sa.column("embedding_new", new_type),
+    )
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(table.c.id, table.c.embedding)
+            .where(table.c.id > last_id, table.c.embedding.isnot(None))
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            table.update().where(table.c.id == sa.bindparam("row_id")).values(embedding_new=sa.bindparam("value")),
+            [{"row_id": row_id, "value": convert(value)} for row_id, value in rows],
+        )
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table(table_name) as batch_op:
+        batch_op.drop_column("embedding")
+        batch_op.alter_column("embedding_new", new_column_name="embedding")
+
+
+def _embedding_is_binary(inspector, table_name: str) -> bool:
+    column = next(column for column in inspector.get_columns(table_name) if column["name"] == "embedding")
+    return isinstance(column["type"], sa.LargeBinary)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    for table_name in TABLES:
+        # Tables created by create_tables() at this revision are binary already
+        if table_name in existing and not _embedding_is_binary(inspector, table_name):
+            _convert(table_name, sa.String(), sa.LargeBinary(), _json_to_bytes)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    for table_name in TABLES:
+        if table_name in existing and _embedding_is_binary(inspector, table_name):
+            _convert(table_name, sa.LargeBinary(), sa.String(), _bytes_to_json)
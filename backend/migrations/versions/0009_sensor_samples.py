@@ -0,0 +1,58 @@
+"""Passive sensor samples and their minute/hour rollups
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "sensor_samples",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("metric", sa.String(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(), nullable=False),
+        sa.Column("value", sa.Float(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_sensor_samples_user_id_day_metric", "sensor_samples", ["user_id", "day", "metric"], if_not_exists=True
+    )
+    op.create_table(
+        "sensor_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("metric", sa.String(), nullable=False),
+        sa.Column("resolution", sa.String(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("value_sum", sa.Float(), nullable=False),
+        sa.Column("value_min", sa.Float(), nullable=False),
+        sa.Column("value_max", sa.Float(), nullable=False),
+        sa.UniqueConstraint("user_id", "metric", "resolution", "bucket_start", name="uq_sensor_rollups_bucket"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_sensor_rollups_id", "sensor_rollups", ["id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_sensor_rollups_id", table_name="sensor_rollups", if_exists=True)
+    op.drop_table("sensor_rollups", if_exists=True)
+    op.drop_index("ix_sensor_samples_user_id_day_metric", table_name="sensor_samples", if_exists=True)
+    op.drop_table("sensor_samples", if_exists=True)
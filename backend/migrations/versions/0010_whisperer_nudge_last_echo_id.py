@@ -0,0 +1,40 @@
+"""Remember which echo a stored Garden Whisperer nudge last saw
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table_name: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    if table_name not in inspector.get_table_names():
+        return set()
+    return {column["name"] for column in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = _columns("whisperer_nudges")
+    # Tables created by create_tables() at this revision already have it
+    if columns and "last_echo_id" not in columns:
+        op.add_column("whisperer_nudges", sa.Column("last_echo_id", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if "last_echo_id" in _columns("whisperer_nudges"):
+        with op.batch_alter_table("whisperer_nudges") as batch_op:
+            batch_op.drop_column("last_echo_id")
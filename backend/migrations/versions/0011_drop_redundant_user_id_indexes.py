@@ -0,0 +1,38 @@
+"""Drop the single-column user_id indexes the (user_id, time) indexes cover
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, Sequence[str], None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (redundant index, table); each table keeps ix_<table>_user_id_<time column>
+REDUNDANT_INDEXES = [
+    ("ix_echoes_user_id", "echoes"),
+    ("ix_breathing_sessions_user_id", "breathing_sessions"),
+    ("ix_journal_entries_user_id", "journal_entries"),
+    ("ix_gratitude_entries_user_id", "gratitude_entries"),
+    ("ix_grounding_sessions_user_id", "grounding_sessions"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index_name, table_name in REDUNDANT_INDEXES:
+        op.drop_index(index_name, table_name=table_name, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name, table_name in REDUNDANT_INDEXES:
+        op.create_index(index_name, table_name, ["user_id"], if_not_exists=True)
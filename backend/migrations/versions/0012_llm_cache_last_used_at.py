@@ -0,0 +1,45 @@
+"""Indexed LRU column for LLM cache eviction
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, Sequence[str], None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _columns(table_name: str) -> set:
+    inspector = sa.inspect(op.get_bind())
+    if table_name not in inspector.get_table_names():
+        return set()
+    return {column["name"] for column in inspector.get_columns(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = _columns("llm_cache")
+    if not columns:
+        return
+    # Tables created by create_tables() at this revision already have it
+    if "last_used_at" not in columns:
+        op.add_column("llm_cache", sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=True))
+    op.execute("UPDATE llm_cache SET last_used_at = COALESCE(last_hit_at, created_at) WHERE last_used_at IS NULL")
+    op.create_index("ix_llm_cache_last_used_at", "llm_cache", ["last_used_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_llm_cache_last_used_at", table_name="llm_cache", if_exists=True)
+    if "last_used_at" in _columns("llm_cache"):
+        with op.batch_alter_table("llm_cache") as batch_op:
+            batch_op.drop_column("last_used_at")
@@ -0,0 +1,15 @@
+"""
+Test settings
+Every test run gets a throwaway SQLite database and the fake LLM backend. The
+environment is set here, before any test imports the app, because the engine
+and settings are built at import time.
+"""
+import os
+import tempfile
+
+_database_dir = tempfile.mkdtemp(prefix="echobloom-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_database_dir}/test.db"
+os.environ["LLM_BACKEND"] = "fake"
+os.environ["LLM_FAKE_LATENCY_SECONDS"] = "0"
+os.environ["WHISPERER_SCAN_INTERVAL_SECONDS"] = "0"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
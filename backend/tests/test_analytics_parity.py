@@ -0,0 +1,204 @@
+"""
+Analytics parity with the pre-rollup aggregation
+Seeds echoes and activities, rebuilds the daily rollups the way the backfill
+job does, and checks GET /api/analytics/{user_id} against the aggregation the
+endpoint used to run in Python over every raw row of the last 30 days.
+"""
+import asyncio
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select, func
+
+from app.core.database import create_tables, async_session
+from app.core.rollups import backfill_rollups
+from app.main import app
+from app.models.activity import BreathingSession, JournalEntry, GratitudeEntry, GroundingSession
+from app.models.echo import Echo
+from app.models.user_profile import UserProfile
+
+USERS = {"parity-busy": 400, "parity-quiet": 12, "parity-empty": 0}
+EMOTIONS = ["joy", "calm", "anxiety", "hope", "sadness", "gratitude"]
+
+
+async def legacy_user_analytics(user_id: str, db) -> dict:
+    """The analytics aggregation as it was before daily rollups (a19a679^)"""
+    profile = (await db.execute(select(UserProfile).where(UserProfile.user_id == user_id))).scalars().first()
+    now = datetime.utcnow()
+    seven_days_ago = now - timedelta(days=7)
+    thirty_days_ago = now - timedelta(days=30)
+
+    echoes = (await db.execute(
+        select(Echo).where(Echo.user_id == user_id, Echo.created_at >= thirty_days_ago).order_by(Echo.created_at)
+    )).scalars().all()
+
+    mood_by_day = {}
+    for echo in echoes:
+        mood_by_day.setdefault(echo.created_at.strftime('%Y-%m-%d'), []).append(echo.mood_score)
+    mood_trend_30_days = [
+        {"date": day, "mood_score": sum(scores) / len(scores), "echo_count": len(scores)}
+        for day, scores in sorted(mood_by_day.items())
+    ]
+    mood_trend_7_days = [
+        entry for entry in mood_trend_30_days
+        if datetime.strptime(entry["date"], '%Y-%m-%d') >= seven_days_ago
+    ]
+
+    all_emotions = []
+    for echo in echoes:
+        if echo.emotion_tags is not None:
+            all_emotions.extend(echo.emotion_tags)
+    emotion_counts = Counter(all_emotions)
+    total_emotions = sum(emotion_counts.values())
+    emotion_distribution = [
+        {"emotion": emotion, "count": count,
+         "percentage": round((count / total_emotions) * 100, 1) if total_emotions > 0 else 0}
+        for emotion, count in emotion_counts.most_common(10)
+    ]
+
+    activity_stats = {}
+    for name, model in [("breathing", BreathingSession), ("journal", JournalEntry),
+                        ("gratitude", GratitudeEntry), ("grounding", GroundingSession)]:
+        activity_stats[name] = (await db.execute(
+            select(func.count()).select_from(model)
+            .where(model.user_id == user_id, model.completed_at >= thirty_days_ago)
+        )).scalar() or 0
+    activity_stats["total"] = sum(activity_stats.values())
+
+    wellness_by_week = {}
+    for echo in echoes:
+        wellness_by_week.setdefault(echo.created_at.strftime('%Y-W%W'), []).append((echo.mood_score + 1) * 50)
+    wellness_trajectory = [
+        {"week": week, "wellness_score": round(sum(scores) / len(scores), 1)}
+        for week, scores in sorted(wellness_by_week.items())
+    ]
+
+    insights = []
+    if emotion_distribution:
+        top_emotion = emotion_distribution[0]["emotion"]
+        insights.append(f"Your most frequent emotion this month is '{top_emotion}' ({emotion_distribution[0]['percentage']}% of the time)")
+    if activity_stats["total"] > 0:
+        most_used = max(activity_stats.items(), key=lambda x: x[1] if x[0] != "total" else 0)
+        if most_used[0] != "total" and most_used[1] > 0:
+            insights.append(f"You've been most engaged with {most_used[0]} exercises ({most_used[1]} sessions)")
+    if len(mood_trend_7_days) >= 2:
+        recent_avg = sum(d["mood_score"] for d in mood_trend_7_days[-3:]) / 3
+        earlier_avg = sum(d["mood_score"] for d in mood_trend_7_days[:3]) / min(3, len(mood_trend_7_days))
+        if recent_avg > earlier_avg + 0.2:
+            insights.append("Your mood has been improving over the past week - keep up the great work! 🌟")
+        elif recent_avg < earlier_avg - 0.2:
+            insights.append("Your mood has dipped recently. Consider trying a breathing or grounding exercise.")
+    current_streak = int(profile.current_streak) if profile.current_streak else 0
+    if current_streak >= 7:
+        insights.append(f"Amazing! You're on a {current_streak}-day streak! 🔥")
+    elif current_streak >= 3:
+        insights.append(f"You're building momentum with a {current_streak}-day streak! Keep going!")
+    if len(echoes) >= 30:
+        insights.append(f"You've created {len(echoes)} echoes this month - your garden is flourishing! 🌸")
+    elif len(echoes) == 0:
+        insights.append("Start your wellness journey by creating your first echo today!")
+
+    return {
+        "user_id": user_id,
+        "profile": {
+            "wellness_score": profile.wellness_score,
+            "current_streak": profile.current_streak,
+            "longest_streak": profile.longest_streak,
+            "total_echoes": profile.total_echoes,
+            "gratitude_count": profile.gratitude_count,
+            "achievements": profile.achievements
+        },
+        "mood_trends": {
+            "seven_days": mood_trend_7_days,
+            "thirty_days": mood_trend_30_days,
+            "current_average": round(sum(d["mood_score"] for d in mood_trend_7_days) / len(mood_trend_7_days), 2) if mood_trend_7_days else 0
+        },
+        "emotion_distribution": emotion_distribution,
+        "activity_stats": activity_stats,
+        "wellness_trajectory": wellness_trajectory,
+        "insights": insights,
+    }
+
+
+def random_moment(rng: random.Random, now: datetime) -> datetime:
+    # Rollups are whole days, so keep clear of the partial day 30 days back;
+    # a few rows fall well outside the window to check they are left out
+    days = rng.uniform(0, 29) if rng.random() < 0.9 else rng.uniform(32, 45)
+    return now - timedelta(days=days)
+
+
+async def seed_analytics_history():
+    await create_tables()
+    rng = random.Random(4)
+    now = datetime.utcnow()
+    async with async_session() as db:
+        for user_id, echo_count in USERS.items():
+            db.add(UserProfile(user_id=user_id, current_streak=rng.choice([0, 4, 9]), achievements=["first_echo"]))
+            for _ in range(echo_count):
+                db.add(Echo(user_id=user_id, content="x", ai_response="y", seed_type="reflection",
+                            mood_score=round(rng.uniform(-1, 1), 2),
+                            emotion_tags=rng.sample(EMOTIONS, rng.randint(0, 3)) or None,
+                            created_at=random_moment(rng, now)))
+            for model in (BreathingSession, JournalEntry, GratitudeEntry, GroundingSession):
+                for _ in range(rng.randint(0, echo_count // 10)):
+                    extra = {"category": "emotions"} if model is JournalEntry else {}
+                    db.add(model(user_id=user_id, completed_at=random_moment(rng, now), **extra))
+        await db.commit()
+        for user_id in USERS:
+            await backfill_rollups(db, user_id)
+
+
+async def legacy_payloads() -> dict:
+    payloads = {}
+    async with async_session() as db:
+        for user_id in USERS:
+            payloads[user_id] = await legacy_user_analytics(user_id, db)
+    return payloads
+
+
+@pytest.fixture(scope="module")
+def analytics_payloads():
+    with TestClient(app) as client:
+        asyncio.run(seed_analytics_history())
+        expected = asyncio.run(legacy_payloads())
+        actual = {}
+        for user_id in USERS:
+            response = client.get(f"/api/analytics/{user_id}")
+            assert response.status_code == 200, response.text
+            actual[user_id] = response.json()
+    return expected, actual
+
+
+def assert_same(expected, actual, path="payload"):
+    """Equal structure and values; averages may differ in the last float bits (SQL vs Python sums)"""
+    if isinstance(expected, dict):
+        assert isinstance(actual, dict) and expected.keys() <= actual.keys(), path
+        for key in expected:
+            assert_same(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert isinstance(actual, list) and len(expected) == len(actual), path
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            assert_same(a, b, f"{path}[{i}]")
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, abs=1e-9), path
+    else:
+        assert expected == actual, path
+
+
+@pytest.mark.parametrize("user_id", list(USERS))
+def test_analytics_matches_legacy_aggregation(analytics_payloads, user_id):
+    expected, actual = analytics_payloads
+    assert_same(expected[user_id], actual[user_id])
+
+
+def test_seeded_history_exercises_every_section(analytics_payloads):
+    expected, _ = analytics_payloads
+    busy = expected["parity-busy"]
+    assert len(busy["mood_trends"]["thirty_days"]) >= 25
+    assert len(busy["mood_trends"]["seven_days"]) >= 3
+    assert busy["emotion_distribution"] and busy["activity_stats"]["total"] > 0
+    assert len(busy["insights"]) >= 3
+    assert expected["parity-empty"]["insights"] == ["Start your wellness journey by creating your first echo today!"]
@@ -0,0 +1,79 @@
+"""
+Dawn Weave predictions are not served once a newer echo exists
+An echo saved between the analysis reading the echoes and storing its result
+must not leave that result looking current. Shield stories are generated
+without holding the request's session open.
+"""
+import asyncio
+
+from app.core.database import async_session, create_tables
+from app.core.dawn_predictions import load_prediction, load_shield_stories
+from app.models.user_profile import UserProfile
+from app.routers import patterns
+from app.routers.echo import save_echo
+
+USER_ID = "dawn-race-user"
+
+
+async def post_echo(mood_score: float):
+    async with async_session() as db:
+        await save_echo(db, USER_ID, "a quiet evening", "ok", mood_score, ["calm"], "reflection", 1)
+
+
+def test_echo_saved_during_analysis_invalidates_the_stored_prediction(monkeypatch):
+    real_save_prediction = patterns.save_prediction
+
+    async def save_after_concurrent_echo(db, *args):
+        # The analysis has read its echoes; another request saves one before it stores the result
+        await post_echo(-0.8)
+        await real_save_prediction(db, *args)
+
+    async def scenario():
+        await create_tables()
+        for i in range(20):
+            await post_echo((i % 5 - 2) / 4)
+
+        monkeypatch.setattr(patterns, "save_prediction", save_after_concurrent_echo)
+        async with async_session() as db:
+            echo_count, _ = await patterns.load_pattern_analysis(db, USER_ID)
+        assert echo_count == 20
+        monkeypatch.setattr(patterns, "save_prediction", real_save_prediction)
+
+        async with async_session() as db:
+            assert await load_prediction(db, USER_ID) is None
+
+        async with async_session() as db:
+            echo_count, _ = await patterns.load_pattern_analysis(db, USER_ID)
+        assert echo_count == 21
+        async with async_session() as db:
+            stored = await load_prediction(db, USER_ID)
+        assert stored is not None and stored.echo_count == 21
+
+    asyncio.run(scenario())
+
+
+def test_shield_stories_are_generated_with_the_request_session_closed(monkeypatch):
+    days = [{"day": "Monday", "avg_mood": -0.4, "confidence": 0.8}, {"day": "Friday", "avg_mood": -0.3, "confidence": 0.6}]
+    open_during_generation = []
+
+    async def scenario():
+        await create_tables()
+        async with async_session() as db:
+            db.add(UserProfile(user_id="shield-user"))
+            await db.commit()
+
+        async with async_session() as db:
+            async def generate(day, mood_context, profile):
+                open_during_generation.append(db.in_transaction())
+                return {"success": True, "shield_story": {"title": day}, "predicted_day": day}
+
+            monkeypatch.setattr(patterns, "generate_shield_story", generate)
+            stories = await patterns.get_shield_stories(db, "shield-user", days)
+        assert [story["shield_story"]["title"] for story in stories] == ["Monday", "Friday"]
+        assert open_during_generation == [False, False]
+
+        keys = [(day["day"], patterns.iso_week(patterns.get_next_occurrence(day["day"]))) for day in days]
+        async with async_session() as db:
+            assert len(await load_shield_stories(db, "shield-user", keys)) == 2
+
+    asyncio.run(scenario())
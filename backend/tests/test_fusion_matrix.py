@@ -0,0 +1,48 @@
+"""
+Fusion-matrix warm-up job
+Every generation is a fresh model call stored only in emotion_fusions, so
+--force regenerates instead of replaying cached completions.
+"""
+import asyncio
+import json
+
+from sqlalchemy import func, select
+
+from app.core.database import async_session
+from app.core.llm import llm
+from app.jobs import fusion_matrix as job
+from app.models.emotion_fusion import EmotionFusion
+from app.models.llm_cache import LLMCacheEntry
+
+
+async def cache_rows() -> int:
+    async with async_session() as db:
+        return (await db.execute(select(func.count()).select_from(LLMCacheEntry))).scalar_one()
+
+
+def test_force_calls_the_model_again_and_skips_the_llm_cache(monkeypatch):
+    calls = []
+
+    async def generate(prompt, model=None, timeout=None):
+        calls.append(prompt)
+        return json.dumps({"fusion_name": f"Fusion {len(calls)}"})
+
+    async def scenario():
+        monkeypatch.setattr(llm, "generate", generate)
+        assert await job.run(rate=0, concurrency=1, limit=2) == 0
+        cached = await cache_rows()
+
+        assert await job.run(rate=0, concurrency=1, limit=2, force=True) == 0
+        assert len(calls) == 4 and calls[:2] == calls[2:]
+        assert await cache_rows() == cached
+
+        emotion_a, emotion_b, trend = next(job.all_keys())
+        async with async_session() as db:
+            fusion = (await db.execute(
+                select(EmotionFusion.fusion)
+                .where(EmotionFusion.emotion_a == emotion_a, EmotionFusion.emotion_b == emotion_b,
+                       EmotionFusion.mood_trend == trend)
+            )).scalar_one()
+        assert fusion["fusion_name"] in ("Fusion 3", "Fusion 4")
+
+    asyncio.run(scenario())
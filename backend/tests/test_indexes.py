@@ -0,0 +1,125 @@
+"""
+Per-user history reads use the (user_id, time) indexes
+Seeds one user, calls every user-scoped endpoint that reads history, records
+the SQL each request runs and feeds it to SQLite's EXPLAIN QUERY PLAN: every
+echoes / activity / sessions table a statement touches must be searched
+through its ix_<table>_user_id_* composite index, never scanned.
+"""
+import asyncio
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.database import create_tables, async_session, engine
+from app.main import app
+from app.models.activity import BreathingSession, JournalEntry, GratitudeEntry, GroundingSession
+from app.models.echo import Echo
+from app.models.session_model import Session
+from app.models.user_profile import UserProfile
+
+USER_ID = "index-user"
+INDEXED_TABLES = (
+    "echoes", "breathing_sessions", "journal_entries", "gratitude_entries", "grounding_sessions", "sessions"
+)
+
+READ_REQUESTS = [
+    ("GET", f"/api/echoes/{USER_ID}", None),
+    ("GET", f"/api/profile/{USER_ID}", None),
+    ("GET", f"/api/sessions/1", None),
+    ("GET", f"/api/activities/breathing/{USER_ID}", None),
+    ("GET", f"/api/activities/journal/{USER_ID}", None),
+    ("GET", f"/api/activities/gratitude/{USER_ID}", None),
+    ("GET", f"/api/activities/grounding/{USER_ID}", None),
+    ("GET", f"/api/activities/stats/{USER_ID}", None),
+    ("GET", f"/api/analytics/{USER_ID}", None),
+    ("POST", f"/api/whisperer/check-patterns?user_id={USER_ID}", None),
+    ("GET", f"/api/whisperer/mood-food-basket/{USER_ID}", None),
+    ("POST", f"/api/patterns/predict?user_id={USER_ID}", None),
+    ("GET", f"/api/weave/preview-data/{USER_ID}", None),
+    ("GET", f"/api/weave/check-for-affirmation/{USER_ID}", None),
+    ("POST", f"/api/weave/create-tale?user_id={USER_ID}", None),
+    ("POST", "/api/simulate/futures", {"user_id": USER_ID, "what_if_scenario": "I journal every morning"}),
+    ("GET", f"/api/simulate/suggested-scenarios/{USER_ID}", None),
+    ("GET", f"/api/soundscape/current-mood/{USER_ID}", None),
+    ("POST", "/api/soundscape/generate", {"user_id": USER_ID}),
+    ("GET", f"/api/alchemy/suggested-pairs/{USER_ID}", None),
+    ("POST", "/api/alchemy/fuse", {"user_id": USER_ID, "emotion1": "Joy", "emotion2": "Fear"}),
+]
+
+
+async def seed_history():
+    await create_tables()
+    now = datetime.utcnow()
+    async with async_session() as db:
+        db.add(UserProfile(user_id=USER_ID))
+        for i in range(60):
+            at = now - timedelta(hours=9 * i)
+            db.add(Echo(user_id=USER_ID, content="I feel calm", ai_response="ok", mood_score=(i % 7 - 3) / 4,
+                        emotion_tags=["calm"], seed_type="reflection", created_at=at))
+            db.add(BreathingSession(user_id=USER_ID, cycles_completed=4, duration_seconds=60, completed_at=at))
+            db.add(JournalEntry(user_id=USER_ID, category="emotions", prompts=[], responses={}, completed_at=at))
+            db.add(GratitudeEntry(user_id=USER_ID, gratitudes=[], completed_at=at))
+            db.add(GroundingSession(user_id=USER_ID, see_items=[], touch_items=[], hear_items=[], smell_items=[],
+                                    taste_items=[], duration_seconds=60, completed_at=at))
+            db.add(Session(user_id=1, input_type="text", input_content="x", ai_response="y", created_at=at))
+            # Other users, so a scan would have to skip rows
+            db.add(Echo(user_id=f"other-{i}", content="x", ai_response="y", mood_score=0.0, emotion_tags=[],
+                        seed_type="reflection", created_at=at))
+        await db.commit()
+
+
+def record_history_reads() -> list:
+    """(statement, parameters) of every SELECT over an indexed table run by READ_REQUESTS"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")) and re.search(
+            r"\b(" + "|".join(INDEXED_TABLES) + r")\b", statement
+        ):
+            statements.append((statement, parameters))
+
+    with TestClient(app) as client:
+        asyncio.run(seed_history())
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            for method, path, body in READ_REQUESTS:
+                response = client.request(method, path, json=body)
+                assert response.status_code == 200, (path, response.text)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+@pytest.fixture(scope="module")
+def history_reads():
+    return record_history_reads()
+
+
+def query_plan(statement: str, parameters) -> list:
+    connection = sqlite3.connect(engine.url.database)
+    try:
+        return [row[3] for row in connection.execute("EXPLAIN QUERY PLAN " + statement, parameters)]
+    finally:
+        connection.close()
+
+
+def test_history_reads_were_recorded(history_reads):
+    tables = {table for statement, _ in history_reads for table in INDEXED_TABLES if re.search(rf"\b{table}\b", statement)}
+    assert tables == set(INDEXED_TABLES)
+
+
+def test_history_reads_search_composite_indexes(history_reads):
+    failures = []
+    for statement, parameters in history_reads:
+        for step in query_plan(statement, parameters):
+            match = re.match(r"(SCAN|SEARCH) (\w+)", step)
+            if not match or match.group(2) not in INDEXED_TABLES:
+                continue
+            table = match.group(2)
+            if not re.match(rf"SEARCH {table} USING (COVERING )?INDEX ix_{table}_user_id_\w+ \(user_id=", step):
+                failures.append(f"{step}\n    in: {' '.join(statement.split())}")
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,126 @@
+"""
+LLM result cache bookkeeping
+Hits are answered without writing; their counts reach llm_cache in batches,
+at the latest after hit_flush_seconds. Eviction runs every few stores and
+keeps the most recently used entries, including hits still buffered.
+"""
+import asyncio
+
+from sqlalchemy import select, delete
+
+from app.core.database import async_session, create_tables
+from app.core.llm_cache import LLMResultCache, cache_key
+from app.models.llm_cache import LLMCacheEntry
+
+
+class CountingClient:
+    model = "test-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt: str, model=None) -> str:
+        self.calls += 1
+        return f"answer to {prompt}"
+
+
+def make_cache(**overrides) -> LLMResultCache:
+    options = {"ttl_seconds": 3600, "max_entries": 100, "hit_flush_seconds": 3600, "hit_flush_keys": 100,
+               "evict_every_stores": 100}
+    options.update(overrides)
+    return LLMResultCache(client=CountingClient(), **options)
+
+
+async def stored_prompts(prompts) -> set:
+    keys = {cache_key("test-model", prompt): prompt for prompt in prompts}
+    async with async_session() as db:
+        result = await db.execute(select(LLMCacheEntry.cache_key).where(LLMCacheEntry.cache_key.in_(keys)))
+        return {keys[key] for key in result.scalars()}
+
+
+async def stored_entry(prompt: str) -> LLMCacheEntry:
+    async with async_session() as db:
+        result = await db.execute(select(LLMCacheEntry).where(LLMCacheEntry.cache_key == cache_key("test-model", prompt)))
+        return result.scalar_one()
+
+
+def test_hits_are_buffered_until_flushed():
+    async def scenario():
+        await create_tables()
+        cache = make_cache()
+        for _ in range(4):
+            assert await cache.generate("buffered prompt") == "answer to buffered prompt"
+        assert cache.client.calls == 1
+
+        entry = await stored_entry("buffered prompt")
+        assert (entry.hit_count or 0) == 0 and entry.last_hit_at is None
+
+        await cache.flush_hits()
+        entry = await stored_entry("buffered prompt")
+        assert entry.hit_count == 3 and entry.last_hit_at is not None
+
+    asyncio.run(scenario())
+
+
+def test_flush_starts_once_enough_keys_are_waiting():
+    async def scenario():
+        await create_tables()
+        cache = make_cache(hit_flush_keys=2)
+        for prompt in ("first prompt", "second prompt"):
+            await cache.generate(prompt)
+            await cache.generate(prompt)
+        await cache._flushing
+        assert [(await stored_entry(prompt)).hit_count for prompt in ("first prompt", "second prompt")] == [1, 1]
+
+    asyncio.run(scenario())
+
+
+def test_flusher_writes_hits_without_further_traffic():
+    async def scenario():
+        await create_tables()
+        cache = make_cache(hit_flush_seconds=0.05)
+        await cache.generate("quiet prompt")
+        await cache.generate("quiet prompt")
+        flusher = asyncio.create_task(cache.run_flusher())
+        await asyncio.sleep(0.3)
+        flusher.cancel()
+        assert (await stored_entry("quiet prompt")).hit_count == 1
+
+    asyncio.run(scenario())
+
+
+def test_eviction_counts_hits_that_are_still_buffered():
+    async def scenario():
+        await create_tables()
+        async with async_session() as db:
+            await db.execute(delete(LLMCacheEntry))
+            await db.commit()
+        cache = make_cache(max_entries=2, evict_every_stores=3)
+        await cache.generate("hot prompt")
+        await cache.generate("cold prompt")
+        await cache.generate("hot prompt")  # buffered only
+        await cache.generate("newest prompt")
+        assert await stored_prompts(["hot prompt", "cold prompt", "newest prompt"]) == {"hot prompt", "newest prompt"}
+
+    asyncio.run(scenario())
+
+
+def test_eviction_runs_every_few_stores_and_keeps_recently_used():
+    async def scenario():
+        await create_tables()
+        async with async_session() as db:
+            await db.execute(delete(LLMCacheEntry))
+            await db.commit()
+        cache = make_cache(max_entries=2, evict_every_stores=3)
+        prompts = ["old prompt", "unused prompt", "new prompt"]
+
+        await cache.generate(prompts[0])
+        await cache.generate(prompts[1])
+        await cache.generate(prompts[0])  # hit: now more recently used than the second prompt
+        await cache.flush_hits()
+        assert await stored_prompts(prompts) == set(prompts[:2])
+
+        await cache.generate(prompts[2])  # third store trims to max_entries
+        assert await stored_prompts(prompts) == {"old prompt", "new prompt"}
+
+    asyncio.run(scenario())
@@ -0,0 +1,234 @@
+"""
+MoodSeries callers against the loops they replaced
+Seeded random mood histories (empty, constant, tied timestamps, coarse and
+fine scores) go through each router helper that moved onto MoodSeries and
+through a copy of its previous pure-Python implementation. Results must match,
+except where a mean lands on a +-0.1 trend/challenge threshold: NumPy's
+pairwise summation and Python's left-to-right sum can differ by one ulp there,
+which may flip the comparison either way.
+"""
+import math
+import random
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.mood_series import MoodSeries
+from app.routers import patterns, simulate, soundscape, weave, whisperer
+
+CASES = 1000
+FLOAT_TOLERANCE = 1e-9  # relative and absolute, for means and variances
+BOUNDARY_TOLERANCE = 1e-9  # how close a mean may sit to a +-0.1 threshold before a flipped decision is accepted
+EMOTIONS = ["joy", "calm", "anxiety", "hope", "depression", "gratitude", "anger", "loneliness", "overwhelm"]
+
+
+# ---- previous implementations (before f4b23e6) ----
+
+def legacy_day_of_week_patterns(echoes) -> dict:
+    day_moods = defaultdict(list)
+    for echo in echoes:
+        day_moods[echo.created_at.strftime('%A')].append(echo.mood_score)
+    day_averages = {}
+    for day, scores in day_moods.items():
+        if len(scores) >= 2:
+            day_averages[day] = {
+                'avg_mood': sum(scores) / len(scores),
+                'count': len(scores),
+                'min_mood': min(scores),
+                'max_mood': max(scores)
+            }
+    challenging_days = [
+        {'day': day, 'avg_mood': stats['avg_mood'], 'confidence': min(stats['count'] / 5, 1.0),
+         'sample_size': stats['count']}
+        for day, stats in day_averages.items() if stats['avg_mood'] < -0.1 and stats['count'] >= 2
+    ]
+    challenging_days.sort(key=lambda x: x['avg_mood'])
+    return {'day_patterns': day_averages, 'challenging_days': challenging_days, 'has_patterns': len(challenging_days) > 0}
+
+
+def legacy_current_trajectory(echoes) -> dict:
+    if not echoes:
+        return {"baseline_mood": 0, "trend": "neutral", "activity_frequency": 0}
+    recent_echoes = echoes[:14]
+    older_echoes = echoes[14:28] if len(echoes) > 14 else []
+    recent_avg = sum(e.mood_score for e in recent_echoes) / len(recent_echoes)
+    older_avg = sum(e.mood_score for e in older_echoes) / len(older_echoes) if older_echoes else recent_avg
+    trend = "improving" if recent_avg > older_avg + 0.1 else "declining" if recent_avg < older_avg - 0.1 else "stable"
+    return {"baseline_mood": recent_avg, "trend": trend, "activity_frequency": 0, "echo_count": len(echoes),
+            "consistency": len(recent_echoes) / 14}
+
+
+def legacy_garden_mood(echoes, plants_by_type) -> dict:
+    if not echoes:
+        return {"overall_mood": 0.0, "mood_variance": 0.0, "dominant_emotions": [], "garden_density": 0,
+                "plant_diversity": 0, "emotional_intensity": 0.0}
+    mood_scores = [echo.get("mood_score", 0) for echo in echoes]
+    avg_mood = sum(mood_scores) / len(mood_scores)
+    mood_variance = sum((m - avg_mood) ** 2 for m in mood_scores) / len(mood_scores) if len(mood_scores) > 1 else 0
+    emotion_counts = {}
+    for echo in echoes:
+        for emotion in echo.get("emotion_tags", []):
+            emotion_counts[emotion] = emotion_counts.get(emotion, 0) + 1
+    dominant_emotions = [emotion for emotion, _ in sorted(emotion_counts.items(), key=lambda x: x[1], reverse=True)[:3]]
+    return {
+        "overall_mood": round(avg_mood, 2),
+        "mood_variance": round(mood_variance, 3),
+        "dominant_emotions": dominant_emotions,
+        "garden_density": sum(plants_by_type.values()),
+        "plant_diversity": len(plants_by_type),
+        "emotional_intensity": round(sum(abs(m) for m in mood_scores) / len(mood_scores), 2)
+    }
+
+
+def legacy_mood_pattern(echoes) -> dict:
+    recent_echoes = echoes[:7]
+    mood_scores = [echo.mood_score for echo in recent_echoes]
+    if len(mood_scores) < 3:
+        return whisperer.classify_mood_window(len(mood_scores), 0, 0.0, 0.0)
+    low_mood_days = sum(1 for score in mood_scores if score < -0.2)
+    avg_mood = sum(mood_scores) / len(mood_scores)
+    recent_avg = sum(mood_scores[:3]) / 3
+    return {
+        **whisperer.classify_mood_window(len(mood_scores), low_mood_days, avg_mood, recent_avg),
+        "recent_emotions": [echo.emotion_tags for echo in recent_echoes[:3]]
+    }
+
+
+def legacy_weekly_arc(echoes) -> dict:
+    """Weave's narrative arc without journey_type, which used to compare newest against oldest"""
+    moods = [echo.mood_score for echo in echoes]
+    dominant_emotions = [emotion for emotion, _ in Counter(e for echo in echoes for e in echo.emotion_tags).most_common(3)]
+    return {"dominant_emotions": dominant_emotions, "avg_mood": sum(moods) / len(moods),
+            "emotional_range": max(moods) - min(moods)}
+
+
+# ---- helpers ----
+
+def mood_history(rng: random.Random, size: int) -> list:
+    """Echo-like rows, newest first like the router queries"""
+    now = datetime(2026, 10, 18, 12)
+    kind = rng.choice(["random", "constant", "ties", "coarse"])
+    echoes = []
+    for i in range(size):
+        if kind == "constant":
+            score = 0.25
+        elif kind == "coarse":
+            score = rng.choice([-0.5, -0.2, 0.0, 0.35, 0.5])
+        else:
+            score = round(rng.uniform(-1, 1), rng.choice([2, 6]))
+        hours = (i // 2 if kind == "ties" else i) * rng.choice([1, 7, 13])
+        echoes.append(SimpleNamespace(id=i, mood_score=score, created_at=now - timedelta(hours=hours),
+                                      emotion_tags=rng.sample(EMOTIONS, rng.randint(0, 3)),
+                                      content="x" * rng.randint(0, 150)))
+    echoes.sort(key=lambda echo: echo.created_at, reverse=True)
+    return echoes
+
+
+def histories(seed: int):
+    rng = random.Random(seed)
+    for _ in range(CASES):
+        yield rng, mood_history(rng, rng.choice([0, 1, 2, 3, 5, 7, 14, 15, 28, 40, rng.randint(0, 120)]))
+
+
+def assert_close(expected, actual, path="result"):
+    if isinstance(expected, float) or isinstance(actual, float):
+        assert math.isclose(expected, actual, rel_tol=FLOAT_TOLERANCE, abs_tol=FLOAT_TOLERANCE), (path, expected, actual)
+    elif isinstance(expected, dict):
+        assert isinstance(actual, dict) and expected.keys() == actual.keys(), (path, expected, actual)
+        for key in expected:
+            assert_close(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, list):
+        assert isinstance(actual, list) and len(expected) == len(actual), (path, expected, actual)
+        for i, (a, b) in enumerate(zip(expected, actual)):
+            assert_close(a, b, f"{path}[{i}]")
+    else:
+        assert expected == actual, (path, expected, actual)
+
+
+def on_threshold(value: float, threshold: float) -> bool:
+    return abs(value - threshold) <= BOUNDARY_TOLERANCE
+
+
+# ---- properties ----
+
+def test_day_of_week_patterns_match_legacy():
+    for _, echoes in histories(1):
+        expected = legacy_day_of_week_patterns(echoes)
+        actual = patterns.analyze_day_of_week_patterns(MoodSeries.from_echoes(echoes))
+        assert_close(expected["day_patterns"], actual["day_patterns"])
+
+        # Weekdays now come out Monday first rather than first seen; compare by day
+        expected_days = {day["day"]: day for day in expected["challenging_days"]}
+        actual_days = {day["day"]: day for day in actual["challenging_days"]}
+        for day in expected_days.keys() ^ actual_days.keys():
+            assert on_threshold(expected["day_patterns"][day]["avg_mood"], -0.1), (day, expected, actual)
+        for day in expected_days.keys() & actual_days.keys():
+            assert_close(expected_days[day], actual_days[day], day)
+        assert [day["avg_mood"] for day in actual["challenging_days"]] == sorted(day["avg_mood"] for day in actual["challenging_days"])
+
+
+def test_current_trajectory_matches_legacy():
+    for _, echoes in histories(2):
+        expected = legacy_current_trajectory(echoes)
+        actual = simulate.calculate_current_trajectory(echoes, [])
+        if expected["trend"] != actual["trend"]:
+            older = echoes[14:28] or echoes[:14]
+            difference = expected["baseline_mood"] - sum(e.mood_score for e in older) / len(older)
+            assert on_threshold(difference, 0.1) or on_threshold(difference, -0.1), (expected, actual)
+            expected["trend"] = actual["trend"]
+        assert_close(expected, actual)
+
+
+def test_garden_mood_matches_legacy():
+    for rng, echoes in histories(3):
+        recent = [{"mood_score": echo.mood_score, "emotion_tags": echo.emotion_tags} for echo in echoes[:5]]
+        plants = {"joy": rng.randint(0, 9), "concern": rng.randint(0, 9)}
+        assert_close(legacy_garden_mood(recent, plants), soundscape.analyze_garden_mood(recent, plants))
+
+
+def test_mood_pattern_matches_legacy():
+    for _, echoes in histories(4):
+        assert_close(legacy_mood_pattern(echoes), whisperer.analyze_mood_pattern(echoes))
+
+
+def test_weekly_arc_matches_legacy_and_is_chronological():
+    for _, echoes in histories(5):
+        if not echoes:
+            continue
+        expected = legacy_weekly_arc(echoes)
+        actual = weave.aggregate_weekly_echoes(echoes)
+        arc = actual["narrative_arc"]
+        assert_close(expected, {"dominant_emotions": actual["dominant_emotions"], "avg_mood": arc["avg_mood"],
+                                "emotional_range": arc["emotional_range"]})
+        oldest, newest = min(echoes, key=lambda e: e.created_at), max(echoes, key=lambda e: e.created_at)
+        if len({echo.created_at for echo in echoes}) == len(echoes):
+            assert arc["journey_type"] == ("growth" if newest.mood_score > oldest.mood_score else "challenge")
+
+
+def test_slice_means_match_python_slices():
+    rng = random.Random(6)
+    for _ in range(CASES):
+        daily = [round(rng.uniform(-1, 1), 2) for _ in range(rng.randint(0, 7))]
+        series = MoodSeries.from_columns(daily)
+        for start, stop in [(-3, None), (0, 3), (0, None)]:
+            window = daily[start:stop]
+            expected = sum(window) / len(window) if window else None
+            actual = series.slice_mean(start, stop)
+            if expected is None:
+                assert actual is None
+            else:
+                assert_close(expected, actual)
+
+
+@pytest.mark.parametrize("helper", [
+    lambda echoes: whisperer.analyze_mood_pattern(echoes),
+    lambda echoes: weave.aggregate_weekly_echoes(echoes),
+    lambda echoes: simulate.calculate_current_trajectory(echoes, []),
+    lambda echoes: patterns.analyze_day_of_week_patterns(MoodSeries.from_echoes(echoes)),
+])
+def test_missing_mood_scores_and_tags_are_skipped(helper):
+    echoes = mood_history(random.Random(7), 5)
+    echoes.append(SimpleNamespace(id=99, mood_score=None, created_at=datetime(2026, 10, 1), emotion_tags=None, content="x"))
+    helper(echoes)
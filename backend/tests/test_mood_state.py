@@ -0,0 +1,46 @@
+"""
+In-memory mood windows
+A window loaded after save_echo commits but before it bumps the user's
+version already holds the new echo; recording it must not append it again.
+"""
+import asyncio
+
+from app.core.cache import response_cache
+from app.core.database import async_session, create_tables
+from app.core.mood_state import mood_state
+from app.routers.echo import save_echo
+
+USER_ID = "mood-state-race-user"
+
+
+async def post_echo(mood_score: float):
+    async with async_session() as db:
+        await save_echo(db, USER_ID, "a steady afternoon", "ok", mood_score, ["calm"], "reflection", 1)
+
+
+def test_window_loaded_before_the_version_bump_holds_the_echo_once(monkeypatch):
+    real_invalidate_user = response_cache.invalidate_user
+
+    async def load_then_invalidate(user_id: str):
+        # A concurrent read reloads the window after the commit, at the old version
+        async with async_session() as db:
+            await mood_state.window(db, user_id)
+        await real_invalidate_user(user_id)
+
+    async def scenario():
+        await create_tables()
+        for score in (0.1, 0.2):
+            await post_echo(score)
+
+        monkeypatch.setattr(response_cache, "invalidate_user", load_then_invalidate)
+        await post_echo(-0.5)
+        monkeypatch.setattr(response_cache, "invalidate_user", real_invalidate_user)
+
+        async with async_session() as db:
+            window = await mood_state.window(db, USER_ID)
+        ids = [point.echo_id for point in window.points]
+        assert len(ids) == len(set(ids)) == 3
+        assert window.latest().mood_score == -0.5
+        assert window.version == await response_cache.user_version(USER_ID)
+
+    asyncio.run(scenario())
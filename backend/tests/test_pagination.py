@@ -0,0 +1,64 @@
+"""
+Keyset pagination over echo history
+Walking the pages with next_cursor returns every timestamped echo exactly once,
+newest first, including across timestamp ties and rows without a timestamp.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app.core.database import async_session, create_tables
+from app.main import app
+from app.models.echo import Echo
+
+USER_ID = "pagination-user"
+
+
+async def seed_echoes() -> list:
+    """Ids of the timestamped echoes, newest first"""
+    await create_tables()
+    start = datetime(2026, 10, 1, 12)
+    rows = [{"created_at": start + timedelta(minutes=i // 2)} for i in range(11)]  # pairs share a timestamp
+    rows += [{"created_at": None}, {"created_at": None}]
+    async with async_session() as db:
+        ids = []
+        for row in rows:
+            # Core insert so an explicit NULL isn't replaced by the server default
+            result = await db.execute(
+                insert(Echo).values(user_id=USER_ID, content="x", ai_response="y", mood_score=0.0,
+                                    emotion_tags=[], seed_type="reflection", **row)
+            )
+            if row["created_at"] is not None:
+                ids.append((row["created_at"], result.inserted_primary_key[0]))
+        await db.commit()
+    return [echo_id for _, echo_id in sorted(ids, reverse=True)]
+
+
+def walk_pages(client: TestClient, limit: int) -> list:
+    served, cursor = [], None
+    for _ in range(20):
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/api/echoes/{USER_ID}", params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        served += [echo["id"] for echo in body["echoes"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return served
+    raise AssertionError("pagination did not finish")
+
+
+def test_pages_cover_every_timestamped_echo_once():
+    with TestClient(app) as client:
+        expected = asyncio.run(seed_echoes())
+        # 12 per page: the first page would end on a NULL timestamp if those rows were served
+        for limit in (3, 12):
+            assert walk_pages(client, limit) == expected
+
+
+def test_malformed_cursor_is_rejected():
+    with TestClient(app) as client:
+        response = client.get(f"/api/echoes/{USER_ID}", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
@@ -0,0 +1,43 @@
+"""
+Profile counters and background achievement checks
+"""
+import asyncio
+
+from sqlalchemy import insert, select
+
+from app.core import profile_stats
+from app.core.concurrency import drain_background
+from app.core.database import async_session, create_tables
+from app.core.metrics import metrics
+from app.models.user_profile import UserProfile
+
+
+def test_echo_counts_start_from_null_counters():
+    async def scenario():
+        await create_tables()
+        async with async_session() as db:
+            # Core insert: the ORM would swap the NULLs for column defaults
+            await db.execute(insert(UserProfile).values(user_id="null-counters", total_echoes=None, monthly_reflections=None,
+                                                        gratitude_count=None, mood_average=None))
+            await db.commit()
+            stats = await profile_stats.record_echo_stats(db, "null-counters", 0.5, "gratitude")
+            await db.commit()
+            profile = (await db.execute(select(UserProfile).where(UserProfile.user_id == "null-counters"))).scalar_one()
+        assert stats["total_echoes"] == 1 and stats["mood_average"] == 0.5
+        assert (profile.total_echoes, profile.monthly_reflections, profile.gratitude_count) == (1, 1, 1)
+
+    asyncio.run(scenario())
+
+
+def test_failed_achievement_check_is_counted(monkeypatch):
+    async def failing_award(user_id: str):
+        raise RuntimeError("database unavailable")
+
+    async def scenario():
+        monkeypatch.setattr(profile_stats, "award_achievements", failing_award)
+        before = metrics.counters.get("profile.achievement_errors", 0)
+        profile_stats.schedule_achievements("unlucky-user")
+        await drain_background()
+        assert metrics.counters.get("profile.achievement_errors", 0) == before + 1
+
+    asyncio.run(scenario())
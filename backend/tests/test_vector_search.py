@@ -0,0 +1,59 @@
+"""
+Seed embeddings of the wrong dimension
+Rows left from another model or EMBEDDING_DIM must not break the NumPy
+fallback, and `seed_embeddings embed` refreshes them without --force.
+"""
+import asyncio
+
+import numpy as np
+from sqlalchemy import delete, select
+
+from app.core.database import async_session, create_tables
+from app.core.embeddings import embed_texts, get_embedder
+from app.core.metrics import metrics
+from app.core.vector_search import SeedSearch
+from app.jobs import seed_embeddings
+from app.models.seed import Seed
+
+
+async def seed_rows(dims) -> list:
+    async with async_session() as db:
+        await db.execute(delete(Seed))
+        seeds = [Seed(content=f"seed {i} about rest and calm", embedding=np.ones(dim, dtype=np.float32) / np.sqrt(dim))
+                 for i, dim in enumerate(dims)]
+        db.add_all(seeds)
+        await db.commit()
+        return [seed.id for seed in seeds]
+
+
+def test_fallback_skips_vectors_of_another_dimension():
+    dim = get_embedder().dim
+
+    async def scenario():
+        await create_tables()
+        ids = await seed_rows([dim, dim + 16, dim, 8])
+        search = SeedSearch(qdrant=None)
+        before = metrics.counters.get("seeds.search.dim_mismatch", 0)
+        async with async_session() as db:
+            query = (await embed_texts(["rest and calm"]))[0]
+            hits, source = await search.search(db, query, 10)
+        assert source == "numpy"
+        assert sorted(seed_id for seed_id, _ in hits) == [ids[0], ids[2]]
+        assert metrics.counters.get("seeds.search.dim_mismatch", 0) == before + 2
+
+    asyncio.run(scenario())
+
+
+def test_embed_refreshes_vectors_of_another_dimension(monkeypatch):
+    dim = get_embedder().dim
+    monkeypatch.setattr(seed_embeddings.seed_search, "qdrant", None)
+
+    async def scenario():
+        await create_tables()
+        await seed_rows([dim, dim + 16, 8])
+        assert await seed_embeddings.embed(batch_size=2) == 0
+        async with async_session() as db:
+            lengths = [len(embedding) for (embedding,) in (await db.execute(select(Seed.embedding).order_by(Seed.id))).all()]
+        assert lengths == [dim, dim, dim]
+
+    asyncio.run(scenario())
@@ -0,0 +1,52 @@
+"""
+Whisperer batch scan against the per-user analysis
+compute_mood_patterns() must classify a user exactly as analyze_mood_pattern()
+does on their recent echoes, including echoes without a mood score.
+"""
+import asyncio
+import math
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import desc, select
+
+from app.core.database import async_session, create_tables
+from app.models.echo import Echo
+from app.routers.whisperer import analyze_mood_pattern, compute_mood_patterns
+
+USERS = 40
+
+
+def test_scan_matches_per_user_analysis_with_unscored_echoes():
+    rng = random.Random(11)
+    user_ids = [f"scan-parity-{i}" for i in range(USERS)]
+    now = datetime.utcnow()
+
+    async def scenario():
+        await create_tables()
+        async with async_session() as db:
+            for user_id in user_ids:
+                for i in range(rng.randint(0, 12)):
+                    score = None if rng.random() < 0.3 else rng.choice([-0.6, -0.3, -0.1, 0.0, 0.2, 0.5])
+                    db.add(Echo(user_id=user_id, content="x", ai_response="ok", seed_type="reflection",
+                                mood_score=score, emotion_tags=[f"tag{i}"],
+                                created_at=now - timedelta(hours=i * rng.choice([1, 5, 11]) + 1)))
+            await db.commit()
+
+        async with async_session() as db:
+            scanned = await compute_mood_patterns(db, user_ids)
+            for user_id in user_ids:
+                echoes = (await db.execute(
+                    select(Echo)
+                    .where(Echo.user_id == user_id, Echo.created_at >= now - timedelta(days=7))
+                    .order_by(desc(Echo.created_at), desc(Echo.id))
+                )).scalars().all()
+                expected, actual = analyze_mood_pattern(echoes), scanned[user_id]["pattern"]
+                assert expected.keys() == actual.keys(), (user_id, expected, actual)
+                for key, value in expected.items():
+                    if isinstance(value, float):
+                        assert math.isclose(value, actual[key], abs_tol=1e-9), (user_id, key, expected, actual)
+                    else:
+                        assert value == actual[key], (user_id, key, expected, actual)
+
+    asyncio.run(scenario())